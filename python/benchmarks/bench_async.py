@@ -0,0 +1,57 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Conditions calling I/O-bound functions: calling them synchronously one rule at a time,
+# against awaiting them concurrently with evaluate_many_async(). Also shows the overhead of
+# evaluate_async() when nothing needs awaiting.
+# Usage: python benchmarks/bench_async.py
+
+import asyncio
+import random
+import time
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.async_eval import evaluate_many_async
+from expression_parser.parser import Parser
+
+LATENCY = 0.002
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    expressions = [parser.parse(make_rule(rng)) for _ in range(200)]
+    calls = sum(expression.write().count("spell_power(") for expression in expressions)
+    print(f"{len(expressions)} rules, up to {calls} calls of {LATENCY * 1000:.0f} ms")
+
+    def blocking_spell_power(name: str) -> int:
+        time.sleep(LATENCY)
+        return len(name) * 3
+
+    async def async_spell_power(name: str) -> int:
+        await asyncio.sleep(LATENCY)
+        return len(name) * 3
+
+    context = make_context(rng)
+    context["spell_power"] = blocking_spell_power
+    report("evaluate, blocking calls", measure(lambda: [e.evaluate(context) for e in expressions], repeat=1), len(expressions), "evals")
+
+    async_context = dict(context, spell_power=async_spell_power)
+    report("evaluate_many_async", measure(lambda: asyncio.run(evaluate_many_async(expressions, async_context)), repeat=3), len(expressions), "evals")
+
+    # No I/O at all: the cost of going through the event loop.
+    cpu_context = dict(context, spell_power=lambda name: len(name) * 3)
+    count = len(expressions) * 50
+
+    async def run_async() -> None:
+        for _ in range(50):
+            for expression in expressions:
+                await expression.evaluate_async(cpu_context)
+
+    report("evaluate, no I/O", measure(lambda: [e.evaluate(cpu_context) for _ in range(50) for e in expressions], repeat=3), count, "evals")
+    report("evaluate_async, no I/O", measure(lambda: asyncio.run(run_async()), repeat=3), count, "evals")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Per-row evaluate() against evaluate_batch() over NumPy columns.
+# Usage: python benchmarks/bench_batch.py [rows]
+
+import sys
+
+import numpy as np
+
+from common import measure, report
+
+from expression_parser.parser import Parser
+
+EXPRESSION = "spell_power>12 and location==\"spain\" or (level * 2 >= 30 and not is_day_time)"
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = np.random.default_rng(1234)
+
+    columns = {
+        "spell_power": rng.integers(0, 25, rows),
+        "location": rng.choice(np.array(["spain", "france", "italy"]), rows),
+        "level": rng.integers(0, 30, rows),
+        "is_day_time": rng.random(rows) > 0.5,
+    }
+    contexts = [dict(zip(columns.keys(), values)) for values in zip(*(column.tolist() for column in columns.values()))]
+
+    expression = Parser().parse(EXPRESSION)
+    compiled = expression.compile()
+
+    print(f"{EXPRESSION}\n{rows:,} rows")
+    report("evaluate per row", measure(lambda: [expression.evaluate(context) for context in contexts], repeat=1), rows, "rows")
+    report("compile() per row", measure(lambda: [compiled(context) for context in contexts], repeat=1), rows, "rows")
+    report("evaluate_batch", measure(lambda: expression.evaluate_batch(columns)), rows, "rows")
+
+
+if __name__ == "__main__":
+    main()
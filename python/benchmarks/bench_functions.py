@@ -0,0 +1,40 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Evaluation of call-heavy expressions, where checking each function's arguments used to
+# cost more than the call itself.
+# Usage: python benchmarks/bench_functions.py
+
+from common import measure, report
+
+from expression_parser.parser import Parser
+
+EXPRESSIONS = [
+    "spell_power(\"jamie\")>12 and relationships_stats(\"orcs\")>1",
+    "get_name()==\"fred\" or whisky(\"test\", 7)==\"7whisky_test\"",
+    "add(add(1, 2), add(3, add(4, 5))) > sub(20, 5)",
+]
+
+
+def main() -> None:
+    parser = Parser()
+    context = {
+        "spell_power": lambda name: len(name) * 3,
+        "relationships_stats": lambda group: 2,
+        "get_name": lambda: "jim",
+        "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+        "add": lambda a, b: a + b,
+        "sub": lambda a, b: a - b,
+    }
+    count = 20000
+
+    for source in EXPRESSIONS:
+        expression = parser.parse(source)
+        print(source)
+        report("  evaluate", measure(lambda: [expression.evaluate(context) for _ in range(count)], repeat=3), count, "evals")
+        compiled = expression.compile()
+        report("  compile()", measure(lambda: [compiled(context) for _ in range(count)], repeat=3), count, "evals")
+
+
+if __name__ == "__main__":
+    main()
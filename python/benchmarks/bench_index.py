@@ -0,0 +1,42 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# RuleIndex lookups against a linear scan of compiled rules, at 1k, 10k and 100k rules.
+# Usage: python benchmarks/bench_index.py
+
+import random
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.expression import _make_bool
+from expression_parser.index import RuleIndex
+from expression_parser.parser import Parser
+
+
+def main() -> None:
+    rng = random.Random(1234)
+    parser = Parser()
+    contexts = [make_context(rng) for _ in range(20)]
+
+    for count in (1000, 10000, 100000):
+        rules = [(parser.parse(make_rule(rng)), index) for index in range(count)]
+        index = RuleIndex(rules)
+        compiled = [(expression.compile(), payload) for expression, payload in rules]
+
+        def linear() -> None:
+            for context in contexts:
+                [payload for run, payload in compiled if _make_bool(run(context))]
+
+        def indexed() -> None:
+            for context in contexts:
+                index.match(context)
+
+        print(f"{count:,} rules, {len(contexts)} contexts")
+        report("  linear scan", measure(linear, repeat=3), len(contexts), "lookups")
+        index.stats.reset()
+        report("  RuleIndex.match", measure(indexed, repeat=3), len(contexts), "lookups")
+        print(f"  {index.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Generated rules bound to a Schema, so evaluated with slot values, with and without the fast
+# paths that known operand types allow, against compile() with a dict context. Also the cost
+# of inference itself, and how many of the rules' operators have known operand types.
+# Usage: python benchmarks/bench_inference.py
+
+from typing import Any, Callable, Dict
+
+from common import measure, report
+from generator import ExpressionGenerator
+
+from expression_parser.expression import BinaryOp, ExpressionNode, UnaryOp
+from expression_parser.inference import Inference, infer
+from expression_parser.parser import Parser
+from expression_parser.schema import Schema
+
+
+# Binds as Schema.bind() does, but as if no operand's type were known.
+class Untyped(Inference):
+    def boolean(self, node: ExpressionNode) -> bool:
+        return False
+
+    def numeric(self, node: ExpressionNode) -> bool:
+        return False
+
+    def matching(self, node: ExpressionNode) -> bool:
+        return False
+
+
+def run_all(runs, contexts) -> None:
+    for context in contexts:
+        for run in runs:
+            run(context)
+
+
+def main() -> None:
+    generator = ExpressionGenerator(seed=11)
+    parser = Parser()
+    expressions = [parser.parse(source) for source in generator.corpus(2000)]
+    contexts = [generator.context() for _ in range(20)]
+    count = len(expressions) * len(contexts)
+
+    variables: Dict[str, type] = {}
+    for i in range(20):
+        variables.update({f"flag{i}": bool, f"count{i}": int, f"name{i}": str})
+    functions: Dict[str, Callable[..., Any]] = {name: value for name, value in contexts[0].items() if callable(value)}
+    returns = {"is_ready": bool, "has_item": bool, "power": int, "add": float, "clamp": float, "title": str}
+    schema = Schema(variables, functions, returns)
+
+    operators = typed = 0
+    for expression in expressions:
+        inference = infer(expression, schema)
+        work = [expression]
+        while work:
+            node = work.pop()
+            if isinstance(node, (BinaryOp, UnaryOp)):
+                operators += 1
+                typed += inference.boolean(node) or inference.numeric(node) or inference.matching(node)
+            work.extend(node._children())
+    print(f"{len(expressions)} rules x {len(contexts)} contexts, {typed / operators:.0%} of {operators:,} operators typed")
+
+    compiled = [expression.compile() for expression in expressions]
+    untyped = [expression._compile(Untyped(expression, schema)) for expression in expressions]
+    bound = [schema.bind(expression) for expression in expressions]
+    slot_values = [schema.values(context) for context in contexts]
+
+    # Interleaved, so that all see the same conditions on a busy machine.
+    results = {"compile(), dict": float("inf"), "bind(), slots, untyped": float("inf"), "bind(), slots, typed": float("inf")}
+    for _ in range(8):
+        results["compile(), dict"] = min(results["compile(), dict"], measure(lambda: run_all(compiled, contexts), repeat=2))
+        results["bind(), slots, untyped"] = min(results["bind(), slots, untyped"], measure(lambda: run_all(untyped, slot_values), repeat=2))
+        results["bind(), slots, typed"] = min(results["bind(), slots, typed"], measure(lambda: run_all(bound, slot_values), repeat=2))
+    for name, seconds in results.items():
+        report(f"  {name}", seconds, count, "evals")
+
+    report("  infer 2000 rules", measure(lambda: [infer(e, schema) for e in expressions], repeat=3), len(expressions), "rules")
+    report("  bind 2000 rules", measure(lambda: [schema.bind(e) for e in expressions], repeat=3), len(expressions), "rules")
+
+
+if __name__ == "__main__":
+    main()
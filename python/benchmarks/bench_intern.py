@@ -0,0 +1,60 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Memory and evaluation cost of 50k conditions, with and without interning.
+# Usage: python benchmarks/bench_intern.py [count]
+
+import random
+import sys
+import tracemalloc
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.intern import Interner, SharedEvaluator
+from expression_parser.parser import Parser
+
+
+def parse_all(parser: Parser, sources: list) -> tuple:
+    tracemalloc.start()
+    expressions = [parser.parse(source) for source in sources]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return expressions, size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(1234)
+    sources = [make_rule(rng) for _ in range(count)]
+    contexts = [make_context(rng) for _ in range(5)]
+
+    plain, plain_size = parse_all(Parser(), sources)
+    interner = Interner()
+    interned, interned_size = parse_all(Parser(interner=interner), sources)
+
+    print(f"{count:,} conditions")
+    print(f"  plain trees:    {plain_size / 1024 / 1024:8.2f} MB")
+    print(f"  interned trees: {interned_size / 1024 / 1024:8.2f} MB ({interner.unique:,} unique of {interner.seen:,} nodes, ~{interner.bytes_saved / 1024 / 1024:.2f} MB saved)")
+
+    def evaluate_plain() -> None:
+        for context in contexts:
+            for expression in plain:
+                expression.evaluate(context)
+
+    evaluators = []
+
+    def evaluate_shared() -> None:
+        for context in contexts:
+            evaluator = SharedEvaluator(context)
+            evaluator.evaluate_all(interned)
+            evaluators.append(evaluator)
+
+    report("  evaluate() each expression", measure(evaluate_plain, repeat=1), len(contexts), "contexts")
+    report("  SharedEvaluator", measure(evaluate_shared, repeat=1), len(contexts), "contexts")
+    computed = sum(evaluator.computed for evaluator in evaluators)
+    reused = sum(evaluator.reused for evaluator in evaluators)
+    print(f"  node evaluations: {computed:,} computed, {reused:,} avoided")
+
+
+if __name__ == "__main__":
+    main()
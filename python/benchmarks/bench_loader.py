@@ -0,0 +1,85 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Loading a large rule file, one expression per line with some comments and bad lines, the way
+# the tests do (reading it whole, then splitting and parsing) against load() and load_parallel().
+# Each run only counts what it loads, as a caller indexing rules as they arrive would. Reports
+# lines per second, and peak memory from tracemalloc, in this process only.
+# Usage: python benchmarks/bench_loader.py [lines]
+
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable, Iterable, Tuple
+
+from common import make_rule, measure, report
+
+from expression_parser.loader import load, load_parallel
+from expression_parser.parser import Parser
+
+
+def read_whole(path: str) -> Iterable[Tuple[int, object]]:
+    parser = Parser()
+    with open(path, "r", encoding="utf-8") as file:
+        source = file.read()
+    results = []
+    for line_no, line in enumerate(source.splitlines(), 1):
+        if not line or line.startswith("//"):
+            continue
+        try:
+            results.append((line_no, parser.parse(line)))
+        except SyntaxError as e:
+            results.append((line_no, e))
+    return results
+
+
+def consume(loaded: Iterable[Tuple[int, object]]) -> int:
+    count = 0
+    for _ in loaded:
+        count += 1
+    return count
+
+
+# Returns the peak memory traced while func() runs, in bytes.
+def peak(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(4)
+    workers = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rules.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            for i in range(count):
+                if i % 100 == 0:
+                    file.write(f"// Section {i // 100}\n")
+                file.write(make_rule(rng) + (" and (" if i % 250 == 0 else "") + "\n")
+        print(f"{count:,} lines, {os.path.getsize(path) / 1e6:.1f} MB, {workers} CPUs")
+
+        runs = {
+            "read whole file": lambda: consume(read_whole(path)),
+            "load()": lambda: consume(load(path)),
+            "load_parallel(), 1 worker": lambda: consume(load_parallel(path, workers=1)),
+            "load_parallel(), 2 workers": lambda: consume(load_parallel(path, workers=2)),
+        }
+        if workers > 2:
+            runs[f"load_parallel(), {workers} workers"] = lambda: consume(load_parallel(path, workers=workers))
+
+        for name, run in runs.items():
+            report(name, measure(run, repeat=3), count, "lines")
+        for name, run in runs.items():
+            print(f"{name:<40} {peak(run) / 1e6:10.2f} MB peak")
+
+
+if __name__ == "__main__":
+    main()
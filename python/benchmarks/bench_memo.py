@@ -0,0 +1,50 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Evaluating many rules against one context, where the same costly function calls appear in
+# many rules, with and without a FunctionMemo.
+# Usage: python benchmarks/bench_memo.py
+
+import random
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.memo import FunctionMemo
+from expression_parser.parser import Parser
+
+
+# Stands in for a lookup into game state, which costs more than the evaluation around it.
+def spell_power(name: str) -> int:
+    return sum(ord(c) for c in name * 20) % 25
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    rules = [parser.parse(make_rule(rng)).compile() for _ in range(5000)]
+    contexts = [make_context(rng) for _ in range(10)]
+    for context in contexts:
+        context["spell_power"] = spell_power
+    count = len(rules) * len(contexts)
+
+    def plain() -> None:
+        for context in contexts:
+            for run in rules:
+                run(context)
+
+    memo = FunctionMemo()
+
+    def memoized() -> None:
+        for context in contexts:
+            with memo.evaluation_pass():
+                bound = memo.bind(context, pure=["spell_power"])
+                for run in rules:
+                    run(bound)
+
+    report("no memo", measure(plain, repeat=3), count, "evals")
+    report("FunctionMemo per pass", measure(memoized, repeat=3), count, "evals")
+    print(f"calls saved: {memo.hits:,} of {memo.hits + memo.misses:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Memory held by parsed expressions, measured with tracemalloc: bytes per expression and per
+# node for a set of generated game-style rules: parsed, parsed and interned, and encoded as a
+# bundle.
+# Usage: python benchmarks/bench_memory.py [count]
+
+import random
+import sys
+import tracemalloc
+from typing import Any, Callable, List
+
+from common import make_rule
+
+from expression_parser.expression import ExpressionNode
+from expression_parser.intern import Interner
+from expression_parser.parser import Parser
+from expression_parser.serialize import dumps_bundle
+
+
+def count_nodes(expressions: List[ExpressionNode]) -> int:
+    count = 0
+    work = list(expressions)
+    while work:
+        node = work.pop()
+        count += 1
+        work.extend(node._children())
+    return count
+
+
+# Returns what func() allocated and still holds, in bytes, and what it returned.
+def allocated(func: Callable[[], Any]) -> Any:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(1)
+    sources = [make_rule(rng) for _ in range(count)]
+    parser = Parser()
+
+    size, expressions = allocated(lambda: [parser.parse(source) for source in sources])
+    nodes = count_nodes(expressions)
+    print(f"{count:,} expressions, {nodes:,} nodes")
+    print(f"{'parsed':<12} {size / 1e6:10.1f} MB {size / count:10.0f} bytes/expression {size / nodes:8.1f} bytes/node")
+    del expressions
+
+    interner = Interner()
+    interned_parser = Parser(interner=interner)
+    size, expressions = allocated(lambda: [interned_parser.parse(source) for source in sources])
+    print(f"{'interned':<12} {size / 1e6:10.1f} MB {size / count:10.0f} bytes/expression {size / nodes:8.1f} bytes/node")
+
+    # Expressions can also be held encoded, and decoded when they're needed. See serialize.py.
+    size = len(dumps_bundle(expressions))
+    print(f"{'bundle':<12} {size / 1e6:10.1f} MB {size / count:10.0f} bytes/expression {size / nodes:8.1f} bytes/node")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Evaluating a fixed set of rules against many context snapshots with evaluate_many(), from
+# one worker (in this process) up to one per core, plus the pickled size of the rules.
+# Usage: python benchmarks/bench_parallel.py [contexts]
+
+import os
+import pickle
+import random
+import sys
+
+from common import CHARACTERS, LOCATIONS, make_rule, measure, report
+
+from expression_parser.parallel import evaluate_many
+from expression_parser.parser import Parser
+
+
+def spell_power(name: str) -> int:
+    return len(name) * 3
+
+
+def make_snapshot(rng: random.Random) -> dict:
+    return {
+        "location": rng.choice(LOCATIONS),
+        "character": rng.choice(CHARACTERS),
+        "is_day_time": rng.random() > 0.5,
+        "level": rng.randint(0, 50),
+        "time_elapsed": rng.random() * 10,
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(1)
+    parser = Parser()
+    expressions = [parser.parse(make_rule(rng)) for _ in range(200)]
+    contexts = [make_snapshot(rng) for _ in range(count)]
+    functions = {"spell_power": spell_power}
+
+    print(f"{len(expressions)} rules pickle to {len(pickle.dumps(expressions)):,} bytes")
+    print(f"{count:,} contexts x {len(expressions)} rules")
+
+    workers = 1
+    cores = os.cpu_count() or 1
+    while True:
+        seconds = measure(lambda: evaluate_many(expressions, contexts, workers=workers, chunksize=500, functions=functions), repeat=1)
+        report(f"  workers={workers}", seconds, count, "contexts")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Parse throughput on large inputs.
+# Usage: python benchmarks/bench_parser.py
+
+from common import load_corpus, measure, report
+
+from expression_parser.parser import Parser
+
+RULE = "(location==\"spain\" and is_day_time) or spell_power(\"jamie\", 2.5)>12"
+
+
+def main() -> None:
+    parser = Parser()
+
+    corpus = [line for line in load_corpus() if _parses(parser, line)] * 200
+    corpus_chars = sum(len(line) for line in corpus)
+
+    rules = [f"{RULE} and counter_{i} >= {i}" for i in range(10000)]
+    rules_chars = sum(len(line) for line in rules)
+
+    # One long expression, built as a flat 'or' chain so the parser doesn't recurse deeply.
+    big = " or ".join(f"(x_{i}==\"v{i}\" and y_{i}>{i}.5)" for i in range(20000))
+
+    print(f"Parse.txt corpus x200: {len(corpus)} expressions, {corpus_chars:,} chars")
+    report("tokenize corpus", measure(lambda: [parser.tokenize(line) for line in corpus]), corpus_chars, "chars")
+    report("parse corpus", measure(lambda: [parser.parse(line) for line in corpus]), len(corpus), "exprs")
+
+    print(f"Synthetic rules: {len(rules)} expressions, {rules_chars:,} chars")
+    report("tokenize rules", measure(lambda: [parser.tokenize(line) for line in rules]), rules_chars, "chars")
+    if hasattr(parser, "scan"):
+        report("scan rules", measure(lambda: [parser.scan(line) for line in rules]), rules_chars, "chars")
+    report("parse rules", measure(lambda: [parser.parse(line) for line in rules]), rules_chars, "chars")
+
+    print(f"Single large expression: {len(big):,} chars")
+    report("tokenize large", measure(lambda: parser.tokenize(big), repeat=3), len(big), "chars")
+    report("parse large", measure(lambda: parser.parse(big), repeat=3), len(big), "chars")
+
+
+def _parses(parser: Parser, line: str) -> bool:
+    try:
+        parser.parse(line)
+        return True
+    except SyntaxError:
+        return False
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# The recursive-descent Parser against PrecedenceParser, on typical rules, on longer and
+# longer expressions, and on deeper and deeper nesting.
+# Usage: python benchmarks/bench_precedence.py
+
+import random
+
+from common import load_corpus, make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.precedence import PrecedenceParser
+
+
+def compare(name: str, source: str, count: int, unit: str) -> None:
+    print(name)
+    for parser in (Parser(), PrecedenceParser()):
+        try:
+            seconds = measure(lambda: parser.parse(source), repeat=3)
+        except RecursionError:
+            print(f"  {type(parser).__name__}: RecursionError")
+            continue
+        report(f"  {type(parser).__name__}", seconds, count, unit)
+
+
+def main() -> None:
+    rng = random.Random(1)
+    sources = [make_rule(rng) for _ in range(5000)] + load_corpus()
+    print(f"{len(sources):,} typical rules")
+    for parser in (Parser(), PrecedenceParser()):
+        def parse_all() -> None:
+            for source in sources:
+                try:
+                    parser.parse(source)
+                except SyntaxError:
+                    pass
+        report(f"  {type(parser).__name__}", measure(parse_all, repeat=3), len(sources), "expressions")
+
+    for terms in (1000, 10000, 100000):
+        source = " or ".join(make_rule(rng) for _ in range(terms // 3))
+        compare(f"'or' of rules, {len(source):,} characters", source, len(source), "chars")
+
+    for depth in (100, 1000, 100000):
+        compare(f"nested parentheses, depth {depth:,}", "(" * depth + "x" + ")" * depth, depth, "levels")
+        compare(f"'not' chain, depth {depth:,}", "not " * depth + "x", depth, "levels")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# The cost of a Profiler at different sample rates, against plain compiled evaluation and
+# against evaluate() with dump_eval, the only other way to see inside an evaluation.
+# Usage: python benchmarks/bench_profiler.py
+
+import random
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.profiler import Profiler
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    expressions = [parser.parse(make_rule(rng)) for _ in range(2000)]
+    contexts = [make_context(rng) for _ in range(20)]
+    count = len(expressions) * len(contexts)
+
+    def run_all(runs: list) -> None:
+        for context in contexts:
+            for run in runs:
+                run(context)
+
+    def dump_all() -> None:
+        for context in contexts:
+            for expression in expressions:
+                expression.evaluate(context, [])
+
+    compiled = [expression.compile() for expression in expressions]
+    report("compile()", measure(lambda: run_all(compiled), repeat=5), count, "evals")
+    report("evaluate() with dump_eval", measure(dump_all, repeat=5), count, "evals")
+
+    for sample_rate in [0, 1000, 100, 10, 1]:
+        profiler = Profiler(sample_rate)
+        runs = [profiler.wrap(str(index), expression) for index, expression in enumerate(expressions)]
+        report(f"Profiler(sample_rate={sample_rate})", measure(lambda: run_all(runs), repeat=5), count, "evals")
+
+    print()
+    print(profiler.report(5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Keeping 10k conditions up to date as a few variables change each tick: evaluating all of
+# them every tick, against only those which read a changed variable.
+# Usage: python benchmarks/bench_reactive.py
+
+import random
+
+from common import measure, report
+
+from expression_parser.dependencies import ReactiveEvaluator
+from expression_parser.parser import Parser
+
+VARIABLES = 500
+EXPRESSIONS = 10000
+TICKS = 200
+
+
+def make_expression(rng: random.Random) -> str:
+    clauses = []
+    for _ in range(rng.randint(1, 3)):
+        clauses.append(rng.choice([
+            f"v{rng.randrange(VARIABLES)}>{rng.randint(0, 100)}",
+            f"v{rng.randrange(VARIABLES)}==v{rng.randrange(VARIABLES)}",
+            f"scale(v{rng.randrange(VARIABLES)})<{rng.randint(0, 300)}",
+        ]))
+    return " and ".join(clauses)
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    sources = [make_expression(rng) for _ in range(EXPRESSIONS)]
+    context = {f"v{i}": rng.randint(0, 100) for i in range(VARIABLES)}
+    context["scale"] = lambda value: value * 3
+    names = [f"v{i}" for i in range(VARIABLES)]
+
+    for fraction in (0.001, 0.01, 0.05):
+        changes = [rng.sample(names, max(1, int(VARIABLES * fraction))) for _ in range(TICKS)]
+        print(f"{EXPRESSIONS} expressions, {len(changes[0])} of {VARIABLES} variables changing per tick")
+
+        compiled = [parser.parse(source).compile() for source in sources]
+
+        def full() -> None:
+            for changed in changes:
+                for name in changed:
+                    context[name] = rng.randint(0, 100)
+                for run in compiled:
+                    run(context)
+
+        evaluator = ReactiveEvaluator(enumerate(sources))
+        evaluator.update(context)
+        evaluator.stats.reset()
+
+        def reactive() -> None:
+            for changed in changes:
+                for name in changed:
+                    context[name] = rng.randint(0, 100)
+                evaluator.update(context, changed)
+
+        report("  evaluate all", measure(full, repeat=1), TICKS, "ticks")
+        report("  ReactiveEvaluator.update", measure(reactive, repeat=3), TICKS, "ticks")
+        stats = evaluator.stats
+        print(f"  evaluated {stats.evaluations / stats.updates:.0f} expressions per tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Picking the most specific matching rule: a Python loop over evaluate() plus a sort,
+# against RuleSet.best().
+# Usage: python benchmarks/bench_ruleset.py [rules]
+
+import random
+import sys
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.ruleset import RuleSet
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(1234)
+    sources = [make_rule(rng) for _ in range(count)] + ["true"]
+
+    parser = Parser()
+    expressions = [(parser.parse(source), index) for index, source in enumerate(sources)]
+    rules = RuleSet(expressions)
+
+    contexts = [make_context(rng) for _ in range(20)]
+
+    def naive() -> None:
+        for context in contexts:
+            matched = [(expression.specificity, payload) for expression, payload in expressions if expression.evaluate(context)]
+            max(matched, key=lambda match: match[0])
+
+    def ruleset() -> None:
+        for context in contexts:
+            rules.best(context)
+
+    print(f"{len(sources):,} rules, {len(contexts)} contexts")
+    report("evaluate() loop + sort", measure(naive, repeat=3), len(contexts), "ticks")
+    report("RuleSet.match", measure(lambda: [rules.match(context) for context in contexts], repeat=3), len(contexts), "ticks")
+    report("RuleSet.best", measure(ruleset, repeat=3), len(contexts), "ticks")
+    print(rules.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Typical rules evaluated with a dict context, by evaluate() and the closures from compile(),
+# against the same rules bound to a Schema and evaluated with a list of slot values, including
+# and not including the cost of making the values from each context.
+# Usage: python benchmarks/bench_schema.py
+
+import random
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.schema import Schema
+
+
+def run_all(runs, contexts) -> None:
+    for context in contexts:
+        for run in runs:
+            run(context)
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    expressions = [parser.parse(make_rule(rng)) for _ in range(2000)]
+    contexts = [make_context(rng) for _ in range(20)]
+    count = len(expressions) * len(contexts)
+
+    schema = Schema({"location": str, "character": str, "is_day_time": bool, "level": int, "time_elapsed": float},
+                    {"spell_power": contexts[0]["spell_power"]})
+    compiled = [expression.compile() for expression in expressions]
+    bound = [schema.bind(expression) for expression in expressions]
+    slot_values = [schema.values(context) for context in contexts]
+
+    def bind_each_context() -> None:
+        for context in contexts:
+            values = schema.values(context)
+            for run in bound:
+                run(values)
+
+    print(f"{len(expressions)} rules x {len(contexts)} contexts")
+    report("  evaluate, dict", measure(lambda: run_all([e.evaluate for e in expressions], contexts), repeat=3), count, "evals")
+    # Interleaved, so that both see the same conditions on a busy machine.
+    results = {"compile(), dict": float("inf"), "bind(), slots": float("inf"), "bind(), slots from dict": float("inf")}
+    for _ in range(8):
+        results["compile(), dict"] = min(results["compile(), dict"], measure(lambda: run_all(compiled, contexts), repeat=2))
+        results["bind(), slots"] = min(results["bind(), slots"], measure(lambda: run_all(bound, slot_values), repeat=2))
+        results["bind(), slots from dict"] = min(results["bind(), slots from dict"], measure(bind_each_context, repeat=2))
+    for name, seconds in results.items():
+        report(f"  {name}", seconds, count, "evals")
+
+    report("  bind 2000 rules", measure(lambda: [schema.bind(e) for e in expressions], repeat=3), len(expressions), "rules")
+
+
+if __name__ == "__main__":
+    main()
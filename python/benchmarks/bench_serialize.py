@@ -0,0 +1,45 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Cold start with many conditions: parsing the source, against loading a bundle and decoding
+# every expression, or only the few that get used.
+# Usage: python benchmarks/bench_serialize.py
+
+import os
+import random
+import tempfile
+
+from common import make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.serialize import dump_bundle, load_bundle
+
+
+def main() -> None:
+    rng = random.Random(1)
+    sources = [make_rule(rng) for _ in range(20000)]
+    parser = Parser()
+    expressions = [parser.parse(source) for source in sources]
+    count = len(sources)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "conditions.bin")
+        dump_bundle(expressions, path)
+        print(f"{count:,} expressions: {sum(len(s) for s in sources):,} bytes of source, {os.path.getsize(path):,} byte bundle")
+
+        def load_all() -> None:
+            with load_bundle(path) as bundle:
+                list(bundle)
+
+        def load_some() -> None:
+            with load_bundle(path) as bundle:
+                for index in range(0, len(bundle), 100):
+                    bundle[index]
+
+        report("Parser.parse", measure(lambda: [parser.parse(source) for source in sources], repeat=3), count, "expressions")
+        report("load_bundle, decode all", measure(load_all, repeat=3), count, "expressions")
+        report("load_bundle, decode 1%", measure(load_some, repeat=3), count, "expressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Writing expressions back out as text: write() joined into one string, against StreamWriter
+# and write_many() into an io.StringIO, for generated rules, one large expression, and a long
+# 'or' chain which is too deep for write().
+# Usage: python benchmarks/bench_stream_writer.py
+
+import io
+
+from common import measure, report
+from generator import ExpressionGenerator
+
+from expression_parser.parser import Parser
+from expression_parser.precedence import PrecedenceParser
+from expression_parser.stream_writer import StreamWriter, write_many
+
+
+def main() -> None:
+    generator = ExpressionGenerator(seed=3)
+    parser = Parser()
+    expressions = [parser.parse(source) for source in generator.corpus(5000)]
+    large = parser.parse(generator.large(300))
+    chain = PrecedenceParser().parse(" or ".join(f"flag{i % 20}" for i in range(20000)))
+    writer = StreamWriter()
+
+    def written() -> str:
+        return "\n".join(expression.write() for expression in expressions)
+
+    def streamed() -> str:
+        stream = io.StringIO()
+        write_many(expressions, stream)
+        return stream.getvalue()
+
+    # Interleaved, so that both see the same conditions on a busy machine.
+    results = {"write()": float("inf"), "write_many()": float("inf")}
+    for _ in range(5):
+        results["write()"] = min(results["write()"], measure(written, repeat=2))
+        results["write_many()"] = min(results["write_many()"], measure(streamed, repeat=2))
+    for name, seconds in results.items():
+        report(f"{name}, {len(expressions)} rules", seconds, len(expressions), "expressions")
+
+    report("write(), large", measure(lambda: [large.write() for _ in range(100)]), 100, "expressions")
+    report("StreamWriter, large", measure(lambda: [writer.write(large) for _ in range(100)]), 100, "expressions")
+    report("StreamWriter, 20,000 term chain", measure(lambda: writer.write(chain)), 1, "expressions")
+
+
+if __name__ == "__main__":
+    main()
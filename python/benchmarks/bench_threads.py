@@ -0,0 +1,35 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Parsing generated rules with one shared Parser, serially and with parse_many() on thread pools
+# of 1 to 8 threads. With the GIL, threads can't run the parser in parallel, so this mostly
+# shows the overhead of handing out chunks; on a free-threaded build it shows the scaling.
+# Usage: python benchmarks/bench_threads.py (or python3.13t, to compare)
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from common import measure, report
+from generator import ExpressionGenerator
+
+from expression_parser.parser import Parser
+
+
+def main() -> None:
+    sources = ExpressionGenerator(seed=5).corpus(20000)
+    parser = Parser()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    gil = "enabled" if is_gil_enabled is None or is_gil_enabled() else "disabled"
+    print(f"Python {sys.version.split()[0]}, GIL {gil}, {os.cpu_count()} CPUs")
+
+    report("parse(), serial", measure(lambda: [parser.parse(source) for source in sources], repeat=3), len(sources), "expressions")
+    for threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(threads) as executor:
+            seconds = measure(lambda: parser.parse_many(sources, executor, chunksize=256), repeat=3)
+        report(f"parse_many(), {threads} threads", seconds, len(sources), "expressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Evaluating with no tracing, with a dump_eval list, and with a Trace ring which is always on,
+# plus the cost of rendering the Trace afterwards.
+# Usage: python benchmarks/bench_trace.py
+
+import random
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.trace import Trace
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    expressions = [parser.parse(make_rule(rng)) for _ in range(2000)]
+    contexts = [make_context(rng) for _ in range(10)]
+    count = len(expressions) * len(contexts)
+
+    def plain() -> None:
+        for context in contexts:
+            for expression in expressions:
+                expression.evaluate(context)
+
+    def dump_eval() -> None:
+        for context in contexts:
+            for expression in expressions:
+                expression.evaluate(context, [])
+
+    trace = Trace(4096)
+
+    def traced() -> None:
+        for context in contexts:
+            for expression in expressions:
+                trace.evaluate(expression, context)
+
+    report("evaluate()", measure(plain, repeat=5), count, "evals")
+    report("evaluate() with dump_eval", measure(dump_eval, repeat=5), count, "evals")
+    report("Trace.evaluate()", measure(traced, repeat=5), count, "evals")
+    report("Trace.render()", measure(trace.render, repeat=5), len(trace), "lines")
+
+
+if __name__ == "__main__":
+    main()
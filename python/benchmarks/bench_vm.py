@@ -0,0 +1,52 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# The bytecode Program against the tree-walking evaluate() and the closures from compile(),
+# on typical rules and on long generated 'or' chains, which are too deep for the others.
+# Usage: python benchmarks/bench_vm.py
+
+import random
+import sys
+
+from common import make_context, make_rule, measure, report
+
+from expression_parser.parser import Parser
+from expression_parser.vm import Program
+
+
+def run_all(runs, contexts) -> None:
+    for context in contexts:
+        for run in runs:
+            run(context)
+
+
+def main() -> None:
+    rng = random.Random(1)
+    parser = Parser()
+    expressions = [parser.parse(make_rule(rng)) for _ in range(2000)]
+    contexts = [make_context(rng) for _ in range(20)]
+    count = len(expressions) * len(contexts)
+
+    print(f"{len(expressions)} rules x {len(contexts)} contexts")
+    report("  evaluate", measure(lambda: run_all([e.evaluate for e in expressions], contexts), repeat=3), count, "evals")
+    compiled = [e.compile() for e in expressions]
+    report("  compile()", measure(lambda: run_all(compiled, contexts), repeat=3), count, "evals")
+    programs = [Program(e).run for e in expressions]
+    report("  Program.run", measure(lambda: run_all(programs, contexts), repeat=3), count, "evals")
+
+    for terms in (500, 100000):
+        source = " or ".join(f"flag{i}" for i in range(terms))
+        expression = parser.parse(source)
+        context = {f"flag{i}": False for i in range(terms)}
+        print(f"'or' chain of {terms:,} variables ({terms * 2 - 1:,} nodes), all false")
+        try:
+            seconds = measure(lambda: expression.evaluate(context), repeat=3)
+            report("  evaluate", seconds, terms * 2 - 1, "nodes")
+        except RecursionError:
+            print(f"  evaluate: RecursionError (limit {sys.getrecursionlimit()})")
+        program = Program(expression)
+        report("  Program.run", measure(lambda: program.run(context), repeat=3), terms * 2 - 1, "nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+CORPUS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../tests"))
+
+
+def load_corpus(file_name: str = "Parse.txt") -> List[str]:
+    with open(os.path.join(CORPUS_DIR, file_name), "r", encoding="utf-8") as file:
+        return [line for line in file.read().splitlines() if line and not line.startswith("//")]
+
+
+# Returns the best wall-clock time in seconds of `repeat` runs of func().
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, seconds: float, count: int, unit: str) -> None:
+    rate = count / seconds if seconds > 0 else float("inf")
+    print(f"{name:<40} {seconds * 1000:10.2f} ms {rate:14,.0f} {unit}/s")
+
+
+LOCATIONS = ["spain", "france", "italy", "wales", "peru", "chad", "laos", "fiji", "cuba", "oman"]
+CHARACTERS = ["dave", "jamie", "gordon", "alice", "bob", "carol", "erin", "frank"]
+
+
+# A game-style condition, usually a conjunction of equality and range clauses.
+def make_rule(rng: random.Random) -> str:
+    clauses = []
+    if rng.random() < 0.9:
+        clauses.append(rng.choice([
+            f"location==\"{rng.choice(LOCATIONS)}\"",
+            f"character==\"{rng.choice(CHARACTERS)}\"",
+        ]))
+    for _ in range(rng.randint(1 - len(clauses), 3)):
+        clauses.append(rng.choice([
+            f"location==\"{rng.choice(LOCATIONS)}\"",
+            f"character==\"{rng.choice(CHARACTERS)}\"",
+            f"spell_power(\"{rng.choice(CHARACTERS)}\")>{rng.randint(0, 20)}",
+            "is_day_time",
+            f"level>={rng.randint(0, 50)}",
+            f"time_elapsed>={rng.randint(0, 10)}.5",
+        ]))
+    return " and ".join(clauses)
+
+
+def make_context(rng: random.Random) -> dict:
+    return {
+        "location": rng.choice(LOCATIONS),
+        "character": rng.choice(CHARACTERS),
+        "spell_power": lambda name: len(name) * 3,
+        "is_day_time": rng.random() > 0.5,
+        "level": rng.randint(0, 50),
+        "time_elapsed": rng.random() * 10,
+    }
@@ -0,0 +1,132 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Seeded random expressions for load testing. The same seed always gives the same corpus.
+# Expressions are typed as they're built (bool, number or string), so that they evaluate
+# without errors against context().
+# Usage: python benchmarks/generator.py [count] [seed] [max_depth] > corpus.txt
+
+import random
+import sys
+from typing import Any, Callable, Dict, List
+
+BOOL = "bool"
+NUMBER = "number"
+STRING = "string"
+
+WORDS = ["spain", "france", "dave", "jamie", "orcs", "elves", "dawn", "dusk"]
+
+
+class ExpressionGenerator:
+    def __init__(self, seed: int = 0, max_depth: int = 4, variables: int = 20) -> None:
+        self._rng = random.Random(seed)
+        self._max_depth = max_depth
+        self._variables = variables
+
+    def expression(self) -> str:
+        return self._make(BOOL, 0)
+
+    def corpus(self, count: int) -> List[str]:
+        return [self.expression() for _ in range(count)]
+
+    # One long expression of `terms` clauses joined by 'and' and 'or'.
+    def large(self, terms: int) -> str:
+        out = [self._group(BOOL, 0)]
+        for _ in range(terms - 1):
+            out.append(self._rng.choice(["and", "or"]))
+            out.append(self._group(BOOL, 0))
+        return " ".join(out)
+
+    # Nested parentheses and 'not', `depth` levels deep.
+    def deep(self, depth: int) -> str:
+        out = self._make(BOOL, self._max_depth)
+        for _ in range(depth):
+            out = f"not ({out})" if self._rng.random() < 0.5 else f"({out} and {self._make(BOOL, self._max_depth)})"
+        return out
+
+    # A context with every variable and function the expressions use.
+    def context(self) -> Dict[str, Any]:
+        rng = random.Random(self._rng.random())
+        context: Dict[str, Any] = {}
+        for i in range(self._variables):
+            context[f"flag{i}"] = rng.random() < 0.5
+            context[f"count{i}"] = rng.randint(-50, 50)
+            context[f"name{i}"] = rng.choice(WORDS)
+        functions: Dict[str, Callable[..., Any]] = {
+            "is_ready": lambda: True,
+            "has_item": lambda item: len(item) % 2 == 0,
+            "power": lambda name: len(name) * 3,
+            "add": lambda a, b: a + b,
+            "clamp": lambda value, low, high: max(low, min(high, value)),
+            "title": lambda name: name.title(),
+        }
+        context.update(functions)
+        return context
+
+    def _make(self, kind: str, depth: int) -> str:
+        rng = self._rng
+        leaf = depth >= self._max_depth or rng.random() < 0.25
+        if kind == BOOL:
+            if leaf:
+                return rng.choice([
+                    lambda: f"flag{rng.randrange(self._variables)}",
+                    lambda: rng.choice(["true", "false"]),
+                    lambda: "is_ready()",
+                    lambda: f"has_item(\"{rng.choice(WORDS)}\")",
+                ])()
+            choice = rng.random()
+            if choice < 0.35:
+                return f"{self._make(NUMBER, depth + 1)} {rng.choice(['==', '!=', '>', '<', '>=', '<='])} {self._make(NUMBER, depth + 1)}"
+            if choice < 0.5:
+                return f"{self._make(STRING, depth + 1)} {rng.choice(['==', '!='])} {self._make(STRING, depth + 1)}"
+            if choice < 0.9:
+                return f"{self._group(BOOL, depth)} {rng.choice(['and', 'or', '&&', '||'])} {self._group(BOOL, depth)}"
+            return f"not {self._group(BOOL, depth, always=True)}"
+
+        if kind == NUMBER:
+            if leaf:
+                return rng.choice([
+                    lambda: f"count{rng.randrange(self._variables)}",
+                    lambda: str(rng.randint(0, 100)),
+                    lambda: f"{rng.randint(0, 100)}.{rng.randint(1, 9)}",
+                    lambda: f"power(name{rng.randrange(self._variables)})",
+                ])()
+            choice = rng.random()
+            if choice < 0.6:
+                op = rng.choice(["+", "-", "*"])
+                return f"{self._group(NUMBER, depth)} {op} {self._group(NUMBER, depth)}"
+            if choice < 0.75:
+                # Only ever divide by a non-zero literal.
+                return f"{self._group(NUMBER, depth)} / {rng.randint(1, 9)}"
+            if choice < 0.85:
+                return f"add({self._make(NUMBER, depth + 1)}, {self._make(NUMBER, depth + 1)})"
+            if choice < 0.95:
+                return f"clamp({self._make(NUMBER, depth + 1)}, 0, 10)"
+            return f"-{self._group(NUMBER, depth, always=True)}"
+
+        if leaf or rng.random() < 0.5:
+            return rng.choice([
+                lambda: f"name{rng.randrange(self._variables)}",
+                lambda: f"\"{rng.choice(WORDS)}\"",
+            ])()
+        return f"title({self._make(STRING, depth + 1)})"
+
+    # A subexpression, in parentheses unless it's a leaf.
+    def _group(self, kind: str, depth: int, always: bool = False) -> str:
+        inner = self._make(kind, depth + 1)
+        if always or " " in inner:
+            return f"({inner})"
+        return inner
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    max_depth = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    generator = ExpressionGenerator(seed, max_depth)
+    for _ in range(count):
+        print(generator.expression())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Benchmark suite for the core operations: tokenize, parse, evaluate (plain, with dump_eval
+# and with a Trace), write and dump_structure, over the shared corpora plus generated workloads.
+# Results can be saved as JSON and compared with a saved baseline; the exit status is 1 if
+# any benchmark is slower than its baseline by more than the threshold.
+#
+# Usage:
+#   python benchmarks/suite.py --output baseline.json
+#   python benchmarks/suite.py --baseline baseline.json --threshold 0.2
+#   python benchmarks/suite.py --filter parse --repeat 10
+
+import argparse
+import json
+import platform
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common import load_corpus, measure
+from generator import ExpressionGenerator
+
+from expression_parser.parser import Parser
+from expression_parser.trace import Trace
+
+DEFAULT_THRESHOLD = 0.25
+RESULTS_VERSION = 1
+
+# The shared corpora are small, so they're run through this many times per timing.
+CORPUS_LOOPS = 20
+
+# A benchmark returns the function to time, how many operations one call does, and their unit.
+Benchmark = Callable[["Workloads"], Tuple[Callable[[], Any], int, str]]
+
+_benchmarks: List[Tuple[str, Benchmark]] = []
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(func: Benchmark) -> Benchmark:
+        _benchmarks.append((name, func))
+        return func
+    return register
+
+
+# Everything the benchmarks run on, built once, from a fixed seed.
+class Workloads:
+    def __init__(self, scale: float = 1.0) -> None:
+        parser = Parser()
+        self.parse_sources = (load_corpus("Parse.txt") + load_corpus("Writer.txt")) * CORPUS_LOOPS
+        self.sources = [source for source in self.parse_sources if _parses(parser, source)]
+        self.expressions = [parser.parse(source) for source in self.sources]
+        self.context: Dict[str, Any] = {
+            "C": 15,
+            "D": False,
+            "get_name": lambda: "fred",
+            "end_func": lambda: True,
+            "whisky": lambda id, n: str(int(n)) + "whisky_" + id,
+            "counter": 1,
+        }
+
+        generator = ExpressionGenerator(seed=1)
+        self.generated_sources = generator.corpus(int(2000 * scale))
+        self.generated = [parser.parse(source) for source in self.generated_sources]
+        self.generated_context = generator.context()
+
+        # Kept within what the recursive parser and evaluator can manage.
+        self.large_source = generator.large(int(300 * scale))
+        self.large = parser.parse(self.large_source)
+        self.deep_source = generator.deep(60)
+        self.deep = parser.parse(self.deep_source)
+
+        calls = ExpressionGenerator(seed=2, max_depth=6)
+        self.call_heavy = [parser.parse(f"clamp(add(power(name{i % 20}), {i}), 0, 10) > add(power(\"dave\"), clamp(count{i % 20}, 0, 5))")
+                           for i in range(int(500 * scale))] + [parser.parse(source) for source in calls.corpus(int(500 * scale)) if "(" in source]
+        self.call_context = calls.context()
+
+
+def _parses(parser: Parser, source: str) -> bool:
+    try:
+        parser.parse(source)
+        return True
+    except SyntaxError:
+        return False
+
+
+def _evaluate_all(expressions: List[Any], context: Dict[str, Any], dump: bool = False, trace: Optional[Trace] = None) -> None:
+    for expression in expressions:
+        try:
+            expression.evaluate(context, [] if dump else trace)
+        except Exception:
+            pass  # Parts of the corpus are there to check errors.
+
+
+@benchmark("tokenize/corpus")
+def tokenize_corpus(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    parser = Parser()
+    return lambda: [parser.tokenize(source) for source in w.sources], len(w.sources), "expressions"
+
+
+@benchmark("tokenize/generated")
+def tokenize_generated(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    parser = Parser()
+    return lambda: [parser.tokenize(source) for source in w.generated_sources], len(w.generated_sources), "expressions"
+
+
+@benchmark("parse/corpus")
+def parse_corpus(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    parser = Parser()
+    return lambda: [_parses(parser, source) for source in w.parse_sources], len(w.parse_sources), "expressions"
+
+
+@benchmark("parse/generated")
+def parse_generated(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    parser = Parser()
+    return lambda: [parser.parse(source) for source in w.generated_sources], len(w.generated_sources), "expressions"
+
+
+@benchmark("parse/large")
+def parse_large(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    parser = Parser()
+    return lambda: parser.parse(w.large_source), len(w.large_source), "chars"
+
+
+@benchmark("parse/deep")
+def parse_deep(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    parser = Parser()
+    return lambda: parser.parse(w.deep_source), len(w.deep_source), "chars"
+
+
+@benchmark("evaluate/corpus")
+def evaluate_corpus(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: _evaluate_all(w.expressions, w.context), len(w.expressions), "evals"
+
+
+@benchmark("evaluate/corpus+dump_eval")
+def evaluate_corpus_dump(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: _evaluate_all(w.expressions, w.context, dump=True), len(w.expressions), "evals"
+
+
+@benchmark("evaluate/generated")
+def evaluate_generated(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: _evaluate_all(w.generated, w.generated_context), len(w.generated), "evals"
+
+
+@benchmark("evaluate/generated+dump_eval")
+def evaluate_generated_dump(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: _evaluate_all(w.generated, w.generated_context, dump=True), len(w.generated), "evals"
+
+
+@benchmark("evaluate/generated+trace")
+def evaluate_generated_trace(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    trace = Trace(4096)
+    return lambda: _evaluate_all(w.generated, w.generated_context, trace=trace), len(w.generated), "evals"
+
+
+@benchmark("evaluate/large")
+def evaluate_large(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: [w.large.evaluate(w.generated_context) for _ in range(100)], 100, "evals"
+
+
+@benchmark("evaluate/deep")
+def evaluate_deep(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: [w.deep.evaluate(w.generated_context) for _ in range(100)], 100, "evals"
+
+
+@benchmark("evaluate/call_heavy")
+def evaluate_calls(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: _evaluate_all(w.call_heavy, w.call_context), len(w.call_heavy), "evals"
+
+
+@benchmark("write/corpus")
+def write_corpus(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: [expression.write() for expression in w.expressions], len(w.expressions), "expressions"
+
+
+@benchmark("write/generated")
+def write_generated(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: [expression.write() for expression in w.generated], len(w.generated), "expressions"
+
+
+@benchmark("dump_structure/corpus")
+def dump_corpus(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: [expression.dump_structure() for expression in w.expressions], len(w.expressions), "expressions"
+
+
+@benchmark("dump_structure/generated")
+def dump_generated(w: Workloads) -> Tuple[Callable[[], Any], int, str]:
+    return lambda: [expression.dump_structure() for expression in w.generated], len(w.generated), "expressions"
+
+
+def run(workloads: Workloads, repeat: int, name_filter: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, make in _benchmarks:
+        if name_filter and name_filter not in name:
+            continue
+        func, count, unit = make(workloads)
+        seconds = measure(func, repeat)
+        results[name] = {"seconds": seconds, "count": count, "unit": unit, "rate": count / seconds if seconds > 0 else None}
+    return results
+
+
+# Returns a line describing each benchmark which is slower than its baseline by more than
+# `threshold` (0.25 is 25% slower). Benchmarks missing from either side are ignored.
+def regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None or before["count"] != result["count"]:
+            continue
+        change = result["seconds"] / before["seconds"] - 1
+        if change > threshold:
+            found.append(f"{name}: {change:+.1%} (limit {threshold:+.0%})")
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = argparse.ArgumentParser(description="Runs the benchmark suite.")
+    arguments.add_argument("--output", help="write the results to this JSON file")
+    arguments.add_argument("--baseline", help="compare with the results in this JSON file")
+    arguments.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                           help=f"allowed slowdown against the baseline (default {DEFAULT_THRESHOLD})")
+    arguments.add_argument("--repeat", type=int, default=5, help="runs per benchmark; the best is kept")
+    arguments.add_argument("--filter", help="only run benchmarks whose name contains this")
+    arguments.add_argument("--scale", type=float, default=1.0, help="size of the generated workloads")
+    args = arguments.parse_args(argv)
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    results = run(Workloads(args.scale), args.repeat, args.filter)
+
+    for name, result in results.items():
+        line = f"{name:<32} {result['seconds'] * 1000:10.2f} ms {result['rate']:14,.0f} {result['unit']}/s"
+        before = baseline.get(name)
+        if before is not None and before["count"] == result["count"]:
+            line += f" {result['seconds'] / before['seconds'] - 1:+8.1%}"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "scale": args.scale,
+                "results": results,
+            }, file, indent=2)
+
+    found = regressions(results, baseline, args.threshold)
+    if found:
+        print(f"\n{len(found)} regression(s) against {args.baseline}:")
+        for line in found:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
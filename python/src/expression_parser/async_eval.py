@@ -0,0 +1,98 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import asyncio
+import inspect
+from typing import Any, Dict, Iterable, List, Optional
+
+from .expression import (
+    BinaryOp,
+    ExpressionNode,
+    FunctionCall,
+    UnaryOp,
+    _check_arguments,
+    _check_result,
+)
+
+
+# Evaluates an expression whose context functions may be coroutine functions (or return
+# awaitables), awaiting them as they're called. The result, coercion and errors are the same
+# as evaluate(), and 'and', 'or' and '*' still skip their right-hand side when the left
+# decides the result. The arguments of a function call are evaluated concurrently, so calls
+# in different arguments overlap.
+async def evaluate_async(node: ExpressionNode, context: Dict[str, Any]) -> Any:
+    if _is_simple(node):
+        return node.evaluate(context)
+
+    if isinstance(node, BinaryOp):
+        left_val = await evaluate_async(node._left, context)
+        short_circuit, short_circuit_result = node._short_circuit(left_val)
+        if short_circuit:
+            return short_circuit_result
+        return node._do_eval(left_val, await evaluate_async(node._right, context))
+
+    if isinstance(node, UnaryOp):
+        return node._do_eval(await evaluate_async(node._operand, context))
+
+    func = context.get(node._func_name)
+    if func is None:
+        raise RuntimeError(f"Function '{node._func_name}' not found in context.")
+    arg_values = await _evaluate_args(node._args, context)
+
+    _check_arguments(node._func_name, func, arg_values)
+    result = func(*arg_values)
+    if inspect.isawaitable(result):
+        result = await result
+    return _check_result(node._func_name, result)
+
+
+# Evaluates many expressions against one context concurrently on the running event loop,
+# returning the results in the same order. With return_exceptions=True, an expression which
+# raises gives its exception as its result instead of failing the batch.
+async def evaluate_many_async(expressions: Iterable[ExpressionNode], context: Dict[str, Any],
+                              return_exceptions: bool = False) -> List[Any]:
+    return await asyncio.gather(*(evaluate_async(expression, context) for expression in expressions),
+                                return_exceptions=return_exceptions)
+
+
+# Errors are the same as evaluate()'s, which evaluates the arguments left to right: the first
+# argument to fail is the one whose error is raised, and arguments after it aren't evaluated.
+# When one fails, any still running are cancelled.
+async def _evaluate_args(args: List[ExpressionNode], context: Dict[str, Any]) -> List[Any]:
+    values: List[Any] = [None] * len(args)
+    pending = []
+    error: Optional[Exception] = None
+    for index, arg in enumerate(args):
+        if _is_simple(arg):
+            try:
+                values[index] = arg.evaluate(context)
+            except Exception as e:
+                error = e
+                break
+        else:
+            pending.append(index)
+
+    if len(pending) == 1:
+        values[pending[0]] = await evaluate_async(args[pending[0]], context)
+    elif pending:
+        tasks = [asyncio.ensure_future(evaluate_async(args[index], context)) for index in pending]
+        try:
+            # Awaited in order, so the first to raise is the earliest argument that fails.
+            for index, task in zip(pending, tasks):
+                values[index] = await task
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    if error is not None:
+        raise error
+    return values
+
+
+# A node with no function calls below it can't await anything, so it's quicker to evaluate
+# it directly. Only looks one level down, to keep the check cheap.
+def _is_simple(node: ExpressionNode) -> bool:
+    if isinstance(node, FunctionCall):
+        return False
+    return all(not child._children() and not isinstance(child, FunctionCall) for child in node._children())
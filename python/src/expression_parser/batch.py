@@ -0,0 +1,339 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+# Evaluates an expression over columns of values (one NumPy array per variable) rather
+# than one context dictionary at a time. Requires NumPy.
+
+from typing import Any, Callable, Dict, List, Optional
+
+from .expression import (
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpDivide,
+    OpEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+    OpMinus,
+    OpMultiply,
+    OpNegative,
+    OpNot,
+    OpNotEquals,
+    OpOr,
+    OpPlus,
+    Variable,
+    _call_function,
+    _make_bool,
+    _make_numeric,
+    _make_str,
+    _make_type_match,
+)
+from .functions import is_vectorized
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+_VALUE_KINDS = "biufUO"
+
+
+# Evaluates the expression for every row of `columns`, returning an array of results.
+# Each value in `columns` can be an array or list (one value per row), a single value
+# (shared by every row) or a function. `size` is only needed when no column is an array.
+#
+# Rows follow the same coercion and short-circuit rules as evaluate(), but an error in any
+# row (e.g. a division by zero) is raised for the whole batch.
+def evaluate_batch(expression: ExpressionNode, columns: Dict[str, Any], size: Optional[int] = None) -> Any:
+    if np is None:
+        raise ImportError("evaluate_batch requires numpy.")
+
+    if size is None:
+        size = _find_size(columns)
+    batch = _Batch(columns, size)
+    result = _evaluate(expression, batch)
+    # A bare variable gives back the caller's own array, which mustn't be shared with them.
+    if not result.flags.writeable or any(result is column for column in columns.values()):
+        result = np.array(result, copy=True)
+    return result
+
+
+class _Batch:
+    def __init__(self, columns: Dict[str, Any], size: int, rows: Any = None, parent: Optional["_Batch"] = None) -> None:
+        self.columns = columns
+        self.size = size
+        self.rows = rows  # Indices into the full columns, or None for every row.
+        self._full_size: int = size if parent is None else parent._full_size
+        self._full: Dict[str, Any] = {} if parent is None else parent._full
+        self._local: Dict[str, Any] = {}
+
+    def get(self, name: str) -> Any:
+        value = self._local.get(name)
+        if value is not None:
+            return value
+
+        full = self._full.get(name)
+        if full is None:
+            raw = self.columns.get(name)
+            if raw is None or callable(raw):
+                return raw
+            full = _to_column(raw, self._full_size)
+            self._full[name] = full
+
+        value = full if self.rows is None else full[self.rows]
+        self._local[name] = value
+        return value
+
+    def subset(self, rows: Any) -> "_Batch":
+        if self.rows is not None:
+            rows = self.rows[rows]
+        return _Batch(self.columns, len(rows), rows, self)
+
+    def full(self, value: Any) -> Any:
+        return np.broadcast_to(np.asarray(value), (self.size,))
+
+
+def _find_size(columns: Dict[str, Any]) -> int:
+    for value in columns.values():
+        if isinstance(value, (list, tuple)) or (np is not None and isinstance(value, np.ndarray) and value.ndim > 0):
+            return len(value)
+    return 1
+
+
+def _to_column(values: Any, size: int) -> Any:
+    if isinstance(values, np.ndarray):
+        column = values
+    elif isinstance(values, (list, tuple)):
+        column = _to_array(list(values))
+    else:
+        column = np.asarray(values)
+    if column.ndim == 0:
+        column = np.broadcast_to(column, (size,))
+    return column
+
+
+# Builds an array from Python values without numpy's own coercions (which would turn
+# [True, 2.0] into [1.0, 2.0]); mixed types are kept as an object array.
+def _to_array(values: List[Any]) -> Any:
+    if all(isinstance(val, bool) for val in values):
+        return np.array(values, dtype=bool)
+    if all(isinstance(val, float) for val in values):
+        return np.array(values, dtype=float)
+    if all(isinstance(val, int) and not isinstance(val, bool) for val in values):
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    if all(isinstance(val, str) for val in values):
+        return np.array(values, dtype=str)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _evaluate(node: ExpressionNode, batch: _Batch) -> Any:
+    handler = _HANDLERS.get(type(node))
+    if handler is None:
+        raise TypeError(f"evaluate_batch does not support {type(node).__name__}.")
+    return handler(node, batch)
+
+
+def _eval_boolean(node: LiteralBoolean, batch: _Batch) -> Any:
+    return batch.full(np.bool_(node._value))
+
+
+def _eval_number(node: LiteralNumber, batch: _Batch) -> Any:
+    return batch.full(np.float64(node._value))
+
+
+def _eval_string(node: LiteralString, batch: _Batch) -> Any:
+    return batch.full(np.str_(node._value))
+
+
+def _eval_variable(node: Variable, batch: _Batch) -> Any:
+    value = batch.get(node._name)
+    if value is None:
+        raise RuntimeError(f"Variable '{node._name}' not found in context.")
+    if callable(value):
+        raise TypeError(f"Variable '{node._name}' must return bool, string, or numeric.")
+    _check_values(value, f"Variable '{node._name}'", True)
+    return value
+
+
+def _eval_function(node: FunctionCall, batch: _Batch) -> Any:
+    func = batch.columns.get(node._func_name)
+    if func is None:
+        raise RuntimeError(f"Function '{node._func_name}' not found in context.")
+
+    args = [_evaluate(arg, batch) for arg in node._args]
+
+    if is_vectorized(func):
+        result = np.asarray(func(*args))
+        if result.ndim == 0:
+            result = batch.full(result)
+        if result.shape != (batch.size,):
+            raise TypeError(f"Function '{node._func_name}' must return one value per row.")
+        _check_values(result, f"Function '{node._func_name}'", False)
+        return result
+
+    # Fall back to calling the function once per row, with plain Python values.
+    arg_rows = [arg.tolist() for arg in args]
+    results = [_call_function(node._func_name, func, [arg[row] for arg in arg_rows]) for row in range(batch.size)]
+    return _to_array(results)
+
+
+def _check_values(values: Any, what: str, check_missing: bool) -> None:
+    kind = values.dtype.kind
+    if kind not in _VALUE_KINDS:
+        raise TypeError(f"{what} must return bool, string, or numeric.")
+    if kind == "O":
+        for val in values:
+            if val is None and check_missing:
+                raise RuntimeError(f"{what} not found in context.")
+            if not isinstance(val, (int, float, bool, str)):
+                raise TypeError(f"{what} must return bool, string, or numeric.")
+
+
+def _make_bool_array(values: Any) -> Any:
+    kind = values.dtype.kind
+    if kind == "b":
+        return values
+    if kind in "iuf":
+        return values != 0
+    if kind == "U":
+        return (np.char.lower(values) == "true") | (values == "1")
+    return np.fromiter((_make_bool(val) for val in values), dtype=bool, count=len(values))
+
+
+def _make_numeric_array(values: Any) -> Any:
+    kind = values.dtype.kind
+    if kind in "biuf":
+        return values.astype(float)
+    if kind == "U":
+        try:
+            return values.astype(float)
+        except ValueError:
+            pass
+    # Per-value conversion, which raises the same error as evaluate() for the first bad value.
+    return np.fromiter((_make_numeric(val) for val in values.tolist()), dtype=float, count=len(values))
+
+
+def _make_str_array(values: Any) -> Any:
+    if values.dtype.kind == "U":
+        return values
+    return _to_array([_make_str(val) for val in values.tolist()])
+
+
+def _make_type_match_array(left: Any, right: Any) -> Any:
+    kind = left.dtype.kind
+    if kind == "b":
+        return _make_bool_array(right)
+    if kind in "iuf":
+        return _make_numeric_array(right)
+    if kind == "U":
+        return _make_str_array(right)
+    return _to_array([_make_type_match(left_val, right_val) for left_val, right_val in zip(left.tolist(), right.tolist())])
+
+
+def _equals(left: Any, right: Any) -> Any:
+    right = _make_type_match_array(left, right)
+    if left.dtype.kind == "O" or right.dtype.kind == "O":
+        return np.fromiter((left_val == right_val for left_val, right_val in zip(left.tolist(), right.tolist())), dtype=bool, count=len(left))
+    return np.asarray(left == right, dtype=bool)
+
+
+def _eval_and(node: OpAnd, batch: _Batch) -> Any:
+    left = _make_bool_array(_evaluate(node._left, batch))
+    result = np.zeros(batch.size, dtype=bool)
+    return _eval_short_circuit(node, batch, left, left, result, lambda left, right: _make_bool_array(right))
+
+
+def _eval_or(node: OpOr, batch: _Batch) -> Any:
+    left = _make_bool_array(_evaluate(node._left, batch))
+    result = np.ones(batch.size, dtype=bool)
+    return _eval_short_circuit(node, batch, left, ~left, result, lambda left, right: _make_bool_array(right))
+
+
+def _eval_multiply(node: OpMultiply, batch: _Batch) -> Any:
+    left = _make_numeric_array(_evaluate(node._left, batch))
+    result = np.zeros(batch.size, dtype=float)
+    return _eval_short_circuit(node, batch, left, left != 0, result, lambda left, right: left * _make_numeric_array(right))
+
+
+# Evaluates the right-hand side only for the rows in `needed`, as evaluate() would; the
+# other rows keep their short-circuit value from `result`.
+def _eval_short_circuit(node: Any, batch: _Batch, left: Any, needed: Any, result: Any, combine: Callable[[Any, Any], Any]) -> Any:
+    if needed.all():
+        return combine(left, _evaluate(node._right, batch))
+    if not needed.any():
+        return result
+
+    rows = np.flatnonzero(needed)
+    result[rows] = combine(left[rows], _evaluate(node._right, batch.subset(rows)))
+    return result
+
+
+def _eval_divide(node: OpDivide, batch: _Batch) -> Any:
+    left = _evaluate(node._left, batch)
+    right = _make_numeric_array(_evaluate(node._right, batch))
+    if (right == 0).any():
+        raise ZeroDivisionError(f"Division by zero.")
+    return _make_numeric_array(left) / right
+
+
+def _numeric_op(op: Callable[[Any, Any], Any]) -> Callable[[Any, _Batch], Any]:
+    def handler(node: Any, batch: _Batch) -> Any:
+        left = _evaluate(node._left, batch)
+        right = _evaluate(node._right, batch)
+        return op(_make_numeric_array(left), _make_numeric_array(right))
+    return handler
+
+
+def _eval_equals(node: OpEquals, batch: _Batch) -> Any:
+    left = _evaluate(node._left, batch)
+    return _equals(left, _evaluate(node._right, batch))
+
+
+def _eval_not_equals(node: OpNotEquals, batch: _Batch) -> Any:
+    left = _evaluate(node._left, batch)
+    return ~_equals(left, _evaluate(node._right, batch))
+
+
+def _eval_not(node: OpNot, batch: _Batch) -> Any:
+    return ~_make_bool_array(_evaluate(node._operand, batch))
+
+
+def _eval_negative(node: OpNegative, batch: _Batch) -> Any:
+    return -_make_numeric_array(_evaluate(node._operand, batch))
+
+
+_HANDLERS: Dict[type, Callable[[Any, _Batch], Any]] = {
+    LiteralBoolean: _eval_boolean,
+    LiteralNumber: _eval_number,
+    LiteralString: _eval_string,
+    Variable: _eval_variable,
+    FunctionCall: _eval_function,
+    OpAnd: _eval_and,
+    OpOr: _eval_or,
+    OpMultiply: _eval_multiply,
+    OpDivide: _eval_divide,
+    OpEquals: _eval_equals,
+    OpNotEquals: _eval_not_equals,
+    OpNot: _eval_not,
+    OpNegative: _eval_negative,
+}
+
+if np is not None:
+    _HANDLERS.update({
+        OpPlus: _numeric_op(np.add),
+        OpMinus: _numeric_op(np.subtract),
+        OpGreaterThan: _numeric_op(np.greater),
+        OpLessThan: _numeric_op(np.less),
+        OpGreaterThanEquals: _numeric_op(np.greater_equal),
+        OpLessThanEquals: _numeric_op(np.less_equal),
+    })
@@ -0,0 +1,91 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import threading
+from collections import OrderedDict
+
+from .expression import ExpressionNode
+from .parser import Parser
+
+DEFAULT_MAX_SIZE = 1024
+
+# Parses expressions, reusing the parsed tree for any source string seen recently.
+# Parsed trees are never modified after parsing, so the same ExpressionNode can be
+# evaluated by many threads at once.
+class ParseCache:
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError("ParseCache max_size must be at least 1.")
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, ExpressionNode]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse(self, expression: str) -> ExpressionNode:
+        with self._lock:
+            node = self._entries.get(expression)
+            if node is not None:
+                self._entries.move_to_end(expression)
+                self._hits += 1
+                return node
+            self._misses += 1
+
+        # Parse outside the lock so one slow parse doesn't hold up other threads.
+        # Syntax errors are raised to the caller and never cached.
+        node = Parser().parse(expression)
+
+        with self._lock:
+            existing = self._entries.get(expression)
+            if existing is not None:
+                # Another thread got there first; share its tree.
+                self._entries.move_to_end(expression)
+                return existing
+            self._entries[expression] = node
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return node
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        if value < 1:
+            raise ValueError("ParseCache max_size must be at least 1.")
+        with self._lock:
+            self._max_size = value
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, expression: str) -> bool:
+        return expression in self._entries
@@ -0,0 +1,197 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .expression import ExpressionNode, FunctionCall, Variable
+from .functions import is_volatile
+from .parser import Parser
+
+
+# The context names an expression reads: variables, and the functions it calls.
+class Dependencies(NamedTuple):
+    variables: FrozenSet[str]
+    functions: FrozenSet[str]
+
+    # Every context key the expression reads.
+    @property
+    def names(self) -> FrozenSet[str]:
+        return self.variables | self.functions
+
+
+def find_dependencies(node: ExpressionNode) -> Dependencies:
+    variables: Set[str] = set()
+    functions: Set[str] = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Variable):
+            variables.add(node._name)
+        elif isinstance(node, FunctionCall):
+            functions.add(node._func_name)
+        stack.extend(node._children())
+    return Dependencies(frozenset(variables), frozenset(functions))
+
+
+class ReactiveEvaluatorStats:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.updates = 0
+        self.evaluations = 0
+        self.skipped = 0  # Expressions whose cached result was reused.
+
+    def __repr__(self) -> str:
+        return f"ReactiveEvaluatorStats(updates={self.updates}, evaluations={self.evaluations}, skipped={self.skipped})"
+
+
+class _Entry:
+    def __init__(self, expression: ExpressionNode) -> None:
+        self.expression = expression
+        self.dependencies = find_dependencies(expression)
+        self.run: Callable[[Dict[str, Any]], Any] = expression.compile()
+
+
+# Keeps the last result of each of a set of keyed expressions, and on update() only evaluates
+# again the expressions which read one of the context keys that changed.
+#
+# Functions are assumed to return the same result while their arguments do, unless they're
+# marked with @volatile or named in `volatile`, in which case anything calling them is
+# evaluated on every update. An expression which raises keeps its error (see errors) until it
+# next evaluates successfully.
+class ReactiveEvaluator:
+    def __init__(self,
+                 expressions: Optional[Iterable[Tuple[Hashable, Union[str, ExpressionNode]]]] = None,
+                 volatile: Iterable[str] = ()) -> None:
+        self._parser = Parser()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._dependents: Dict[str, Set[Hashable]] = {}  # Context key -> expressions reading it.
+        self._functions: Dict[str, Set[Hashable]] = {}  # Function name -> expressions calling it.
+        self._volatile = set(volatile)
+        self._results: Dict[Hashable, Any] = {}
+        self._errors: Dict[Hashable, Exception] = {}
+        self._dirty: Set[Hashable] = set()
+        self._stats = ReactiveEvaluatorStats()
+        if expressions is not None:
+            for key, expression in expressions:
+                self.add(key, expression)
+
+    # Adds an expression, or replaces the one with the same key. It's evaluated on the next update().
+    def add(self, key: Hashable, expression: Union[str, ExpressionNode]) -> None:
+        if isinstance(expression, str):
+            expression = self._parser.parse(expression)
+        if key in self._entries:
+            self.remove(key)
+
+        entry = _Entry(expression)
+        self._entries[key] = entry
+        for name in entry.dependencies.names:
+            self._dependents.setdefault(name, set()).add(key)
+        for name in entry.dependencies.functions:
+            self._functions.setdefault(name, set()).add(key)
+        self._dirty.add(key)
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for name in entry.dependencies.names:
+            _discard(self._dependents, name, key)
+        for name in entry.dependencies.functions:
+            _discard(self._functions, name, key)
+        self._results.pop(key, None)
+        self._errors.pop(key, None)
+        self._dirty.discard(key)
+
+    # Makes the next update() evaluate `key` again, or every expression if no key is given.
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._dirty.update(self._entries)
+        elif key in self._entries:
+            self._dirty.add(key)
+        else:
+            raise KeyError(key)
+
+    # Brings the results up to date with `context`, given the context keys (variables or
+    # functions) which changed since the last update. With changed=None everything is
+    # evaluated again. Returns the new result of each expression whose result changed.
+    def update(self, context: Dict[str, Any], changed: Optional[Iterable[str]] = None) -> Dict[Hashable, Any]:
+        dirty = self._dirty
+        if changed is None:
+            dirty.update(self._entries)
+        else:
+            dependents = self._dependents
+            for name in changed:
+                keys = dependents.get(name)
+                if keys:
+                    dirty.update(keys)
+
+        for name, keys in self._functions.items():
+            if name in self._volatile or is_volatile(context.get(name)):
+                dirty.update(keys)
+
+        stats = self._stats
+        stats.updates += 1
+        stats.evaluations += len(dirty)
+        stats.skipped += len(self._entries) - len(dirty)
+
+        results = self._results
+        errors = self._errors
+        entries = self._entries
+        updated: Dict[Hashable, Any] = {}
+        for key in dirty:
+            try:
+                value = entries[key].run(context)
+            except Exception as e:
+                errors[key] = e
+                results.pop(key, None)
+                continue
+            errors.pop(key, None)
+            if key not in results or _differs(results[key], value):
+                updated[key] = value
+            results[key] = value
+        dirty.clear()
+        return updated
+
+    # The last result of an expression, or the error it raised.
+    def __getitem__(self, key: Hashable) -> Any:
+        error = self._errors.get(key)
+        if error is not None:
+            raise error
+        return self._results[key]
+
+    @property
+    def results(self) -> Dict[Hashable, Any]:
+        return dict(self._results)
+
+    @property
+    def errors(self) -> Dict[Hashable, Exception]:
+        return dict(self._errors)
+
+    def dependencies(self, key: Hashable) -> Dependencies:
+        return self._entries[key].dependencies
+
+    # The keys of the expressions which read a context key.
+    def dependents(self, name: str) -> List[Hashable]:
+        return list(self._dependents.get(name, ()))
+
+    @property
+    def stats(self) -> ReactiveEvaluatorStats:
+        return self._stats
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _discard(index: Dict[str, Set[Hashable]], name: str, key: Hashable) -> None:
+    keys = index[name]
+    keys.discard(key)
+    if not keys:
+        del index[name]
+
+
+# True (1) and 1.0 compare equal, but evaluate to different things.
+def _differs(old: Any, new: Any) -> bool:
+    return type(old) is not type(new) or old != new
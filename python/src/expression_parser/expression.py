@@ -1,29 +1,99 @@
 # This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
 # Copyright (c) 2025 Ian Thomas
 
-import inspect
+import math
+import sys
 from abc import abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from .functions import accepts
+from .trace import Trace
 from .writer import Writer, STRING_FORMAT_SINGLEQUOTE, STRING_FORMAT_ESCAPED_SINGLEQUOTE, STRING_FORMAT_DOUBLEQUOTE, STRING_FORMAT_ESCAPED_DOUBLEQUOTE
 
+if TYPE_CHECKING:
+    from .dependencies import Dependencies
+    from .inference import Inference
+    from .schema import Schema
+
+# What a compiled expression is called with: a context, or if it's bound to a schema, the
+# variables' values in slot order.
+_Values = Union[Dict[str, Any], Sequence[Any]]
+
+# Nodes have no __dict__, as there can be millions of them. What's the same for every node of a
+# class, like its name and precedence, is a class attribute, and each class lists the fields it
+# adds in __slots__. Subclasses must declare __slots__ too, even if it's empty.
 class ExpressionNode:
-    @abstractmethod
-    def __init__(self, name: str, precedence: int) -> None:
-        self._name = name
-        self._precedence = precedence
-        self._specificity = 0
+    __slots__ = ()
+    _name = ""
+    _precedence = 0
+    _specificity = 0
 
+    # dump_eval can be a list, which is given a line describing each step, or a Trace, which
+    # keeps the values and only formats them if it's rendered.
     @abstractmethod
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> Any:
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> Any:
         raise NotImplementedError()
 
     @abstractmethod
     def dump_structure(self, indent: int = 0) -> str:
         raise NotImplementedError()
     
-    @abstractmethod
+    # Writes the expression out as text, quoting strings as Writer.string_format says.
     def write(self) -> str:
+        return self._write(_QUOTES.get(Writer.string_format, "\""))
+
+    # Writes the expression with `quote` around strings. See also stream_writer.py.
+    @abstractmethod
+    def _write(self, quote: str) -> str:
         raise NotImplementedError()
+
+    # Returns a plain callable f(context) -> value which behaves like evaluate(),
+    # but without tracing or per-node dispatch.
+    def compile(self) -> Callable[[Dict[str, Any]], Any]:
+        return self._compile()
+
+    # When binding to a schema, `inference` is the expression's Inference. Variables and
+    # functions are read from the slots the schema gives them instead, so the callable takes a
+    # sequence of slot values rather than a context, and operands whose types are known skip the
+    # coercions.
+    # See schema.py and inference.py.
+    @abstractmethod
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        raise NotImplementedError()
+
+    def _children(self) -> List["ExpressionNode"]:
+        return []
+
+    # Like evaluate(), but awaits context functions which are coroutines. See async_eval.py.
+    async def evaluate_async(self, context: Dict[str, Any]) -> Any:
+        from .async_eval import evaluate_async
+        return await evaluate_async(self, context)
+
+    # Returns a callable f(values) -> value like compile(), which reads its variables from a
+    # sequence of values in the schema's slot order. See schema.py.
+    def bind(self, schema: "Schema") -> Callable[[Sequence[Any]], Any]:
+        return schema.bind(self)
+
+    # Works out the type of each part of the expression, and finds errors which are certain to
+    # happen. See inference.py.
+    def infer(self, schema: Optional["Schema"] = None) -> "Inference":
+        from .inference import infer
+        return infer(self, schema)
+
+    # Returns the names of the variables and functions the expression uses. See dependencies.py.
+    def dependencies(self) -> "Dependencies":
+        from .dependencies import find_dependencies
+        return find_dependencies(self)
+
+    # Returns a simplified copy of the expression. See optimizer.py.
+    def optimize(self) -> "ExpressionNode":
+        from .optimizer import optimize
+        return optimize(self)
+
+    # Evaluates the expression for every row of a set of NumPy columns. See batch.py.
+    def evaluate_batch(self, columns: Dict[str, Any], size: Optional[int] = None) -> Any:
+        from .batch import evaluate_batch
+        return evaluate_batch(self, columns, size)
     
     @property
     def specificity(self):
@@ -31,21 +101,21 @@ class ExpressionNode:
     
 
 class BinaryOp(ExpressionNode):
-    @abstractmethod
-    def __init__(self, name: str, left: ExpressionNode, op: str, right: ExpressionNode, precedence: int) -> None:
-        super().__init__(name, precedence)
+    __slots__ = ("_left", "_right", "_specificity")
+    _op = ""
+
+    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
         self._left = left
-        self._op = op
         self._right = right
-        self._specificity = left.specificity + right.specificity;
+        self._specificity = left.specificity + right.specificity
     
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> Any:
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> Any:
         left_val = self._left.evaluate(context, dump_eval)
         
         short_circuit, short_circuit_result = self._short_circuit(left_val)
         if short_circuit:
             if dump_eval is not None:
-                dump_eval.append(f"Evaluated: {_format_value(left_val)} {self._op} (ignore) = {_format_value(short_circuit_result)}")
+                _trace(dump_eval, self, left_val, None, short_circuit_result, True)
 
             return short_circuit_result
         
@@ -53,9 +123,14 @@ class BinaryOp(ExpressionNode):
         result: Any = self._do_eval(left_val, right_val)
         
         if dump_eval is not None:
-            dump_eval.append(f"Evaluated: {_format_value(left_val)} {self._op} {_format_value(right_val)} = {_format_value(result)}")
+            _trace(dump_eval, self, left_val, right_val, result, False)
 
         return result
+
+    def _describe(self, left_val: Any, right_val: Any, result: Any, short_circuited: bool) -> str:
+        if short_circuited:
+            return f"Evaluated: {_format_value(left_val)} {self._op} (ignore) = {_format_value(result)}"
+        return f"Evaluated: {_format_value(left_val)} {self._op} {_format_value(right_val)} = {_format_value(result)}"
     
     @abstractmethod
     def _do_eval(self, left_val: Any, right_val: Any) -> Any:
@@ -64,15 +139,22 @@ class BinaryOp(ExpressionNode):
     def _short_circuit(self, left_val: Any) -> tuple[bool, Any]:
         return [False, None]
 
+    def _children(self) -> List[ExpressionNode]:
+        return [self._left, self._right]
+
+    # Pickles as the constructor call, which works out everything else again.
+    def __reduce__(self) -> tuple:
+        return (type(self), (self._left, self._right))
+
     def dump_structure(self, indent: int = 0) -> str:
         out = ("  " * indent + f"{self._name}") + "\n"
         out += self._left.dump_structure(indent + 1)
         out += self._right.dump_structure(indent + 1)
         return out
     
-    def write(self) -> str:
-        left_str = self._left.write()
-        right_str = self._right.write()
+    def _write(self, quote: str) -> str:
+        left_str = self._left._write(quote)
+        right_str = self._right._write(quote)
 
         if self._left._precedence < self._precedence:
             left_str = f"({left_str})"
@@ -84,8 +166,13 @@ class BinaryOp(ExpressionNode):
     
 
 class OpOr(BinaryOp):
+    __slots__ = ()
+    _name = "Or"
+    _op = "or"
+    _precedence = 40
+
     def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("Or", left, "or", right, 40)
+        super().__init__(left, right)
         self._specificity+=1
 
     def _short_circuit(self, left_val: Any) -> tuple[bool, Any]:
@@ -96,11 +183,28 @@ class OpOr(BinaryOp):
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_bool(left_val) or _make_bool(right_val)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.boolean(self):
+            def op_or_bools(values: Sequence[Any]) -> Any:
+                return left(values) or right(values)
+            return op_or_bools
+        def op_or(context: Dict[str, Any]) -> Any:
+            if _make_bool(left(context)):
+                return True
+            return _make_bool(right(context))
+        return op_or
     
 
 class OpAnd(BinaryOp):
+    __slots__ = ()
+    _name = "And"
+    _op = "and"
+    _precedence = 50
+
     def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("And", left, "and", right, 50)
+        super().__init__(left, right)
         self._specificity+=1
 
     def _short_circuit(self, left_val: Any) -> tuple[bool, Any]:
@@ -111,45 +215,121 @@ class OpAnd(BinaryOp):
     
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_bool(left_val) and _make_bool(right_val)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.boolean(self):
+            def op_and_bools(values: Sequence[Any]) -> Any:
+                return left(values) and right(values)
+            return op_and_bools
+        def op_and(context: Dict[str, Any]) -> Any:
+            if not _make_bool(left(context)):
+                return False
+            return _make_bool(right(context))
+        return op_and
     
 
 class OpEquals(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("Equals", left, "==", right, 60)
+    __slots__ = ()
+    _name = "Equals"
+    _op = "=="
+    _precedence = 60
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         right_val = _make_type_match(left_val, right_val)
         return left_val == right_val
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_equals_numbers(values: Sequence[Any]) -> Any:
+                return left(values) == float(right(values))
+            return op_equals_numbers
+        if inference is not None and inference.matching(self):
+            def op_equals_same(values: Sequence[Any]) -> Any:
+                return left(values) == right(values)
+            return op_equals_same
+        def op_equals(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            return left_val == _make_type_match(left_val, right(context))
+        return op_equals
+
 
 class OpNotEquals(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("NotEquals", left, "!=", right, 60)
+    __slots__ = ()
+    _name = "NotEquals"
+    _op = "!="
+    _precedence = 60
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         right_val = _make_type_match(left_val, right_val)
         return left_val != right_val
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_not_equals_numbers(values: Sequence[Any]) -> Any:
+                return left(values) != float(right(values))
+            return op_not_equals_numbers
+        if inference is not None and inference.matching(self):
+            def op_not_equals_same(values: Sequence[Any]) -> Any:
+                return left(values) != right(values)
+            return op_not_equals_same
+        def op_not_equals(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            return left_val != _make_type_match(left_val, right(context))
+        return op_not_equals
+
 
 class OpPlus(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("Plus", left, "+", right, 70)
+    __slots__ = ()
+    _name = "Plus"
+    _op = "+"
+    _precedence = 70
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) + _make_numeric(right_val)
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_plus_numbers(values: Sequence[Any]) -> Any:
+                return float(left(values)) + float(right(values))
+            return op_plus_numbers
+        def op_plus(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = right(context)
+            return _make_numeric(left_val) + _make_numeric(right_val)
+        return op_plus
+
 
 class OpMinus(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("Minus", left, "-", right, 70)
+    __slots__ = ()
+    _name = "Minus"
+    _op = "-"
+    _precedence = 70
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) - _make_numeric(right_val)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_minus_numbers(values: Sequence[Any]) -> Any:
+                return float(left(values)) - float(right(values))
+            return op_minus_numbers
+        def op_minus(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = right(context)
+            return _make_numeric(left_val) - _make_numeric(right_val)
+        return op_minus
     
 
 class OpDivide(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("Divide", left, "/", right, 85)
+    __slots__ = ()
+    _name = "Divide"
+    _op = "/"
+    _precedence = 85
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         right_val = _make_numeric(right_val)
@@ -157,10 +337,30 @@ class OpDivide(BinaryOp):
             raise ZeroDivisionError(f"Division by zero.")
         return _make_numeric(left_val) / right_val
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_divide_numbers(values: Sequence[Any]) -> Any:
+                left_val = float(left(values))
+                right_val = float(right(values))
+                if right_val == 0:
+                    raise ZeroDivisionError(f"Division by zero.")
+                return left_val / right_val
+            return op_divide_numbers
+        def op_divide(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = _make_numeric(right(context))
+            if right_val == 0:
+                raise ZeroDivisionError(f"Division by zero.")
+            return _make_numeric(left_val) / right_val
+        return op_divide
+
 
 class OpMultiply(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("Multiply", left, "*", right, 80)
+    __slots__ = ()
+    _name = "Multiply"
+    _op = "*"
+    _precedence = 80
 
     def _short_circuit(self, left_val: Any) -> tuple[bool, Any]:
         result = _make_numeric(left_val)
@@ -170,54 +370,126 @@ class OpMultiply(BinaryOp):
     
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) * _make_numeric(right_val)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_multiply_numbers(values: Sequence[Any]) -> Any:
+                left_val = float(left(values))
+                if left_val==0:
+                    return 0
+                return left_val * float(right(values))
+            return op_multiply_numbers
+        def op_multiply(context: Dict[str, Any]) -> Any:
+            left_val = _make_numeric(left(context))
+            if left_val==0:
+                return 0
+            return left_val * _make_numeric(right(context))
+        return op_multiply
     
 
 class OpGreaterThan(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("GreaterThan", left, ">", right, 60)
+    __slots__ = ()
+    _name = "GreaterThan"
+    _op = ">"
+    _precedence = 60
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) > _make_numeric(right_val)
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_greater_than_numbers(values: Sequence[Any]) -> Any:
+                return float(left(values)) > float(right(values))
+            return op_greater_than_numbers
+        def op_greater_than(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = right(context)
+            return _make_numeric(left_val) > _make_numeric(right_val)
+        return op_greater_than
+
 
 class OpLessThan(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("LessThan", left, "<", right, 60)
+    __slots__ = ()
+    _name = "LessThan"
+    _op = "<"
+    _precedence = 60
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) < _make_numeric(right_val)
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_less_than_numbers(values: Sequence[Any]) -> Any:
+                return float(left(values)) < float(right(values))
+            return op_less_than_numbers
+        def op_less_than(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = right(context)
+            return _make_numeric(left_val) < _make_numeric(right_val)
+        return op_less_than
+
 
 class OpGreaterThanEquals(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("GreaterThanEquals", left, ">=", right, 60)
+    __slots__ = ()
+    _name = "GreaterThanEquals"
+    _op = ">="
+    _precedence = 60
     
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) >= _make_numeric(right_val)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_greater_than_equals_numbers(values: Sequence[Any]) -> Any:
+                return float(left(values)) >= float(right(values))
+            return op_greater_than_equals_numbers
+        def op_greater_than_equals(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = right(context)
+            return _make_numeric(left_val) >= _make_numeric(right_val)
+        return op_greater_than_equals
     
     
 class OpLessThanEquals(BinaryOp):
-    def __init__(self, left: ExpressionNode, right: ExpressionNode) -> None:
-        super().__init__("LessThanEquals", left, "<=", right, 60)
+    __slots__ = ()
+    _name = "LessThanEquals"
+    _op = "<="
+    _precedence = 60
 
     def _do_eval(self, left_val: Any, right_val: Any) -> Any: 
         return _make_numeric(left_val) <= _make_numeric(right_val)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        left, right = self._left._compile(inference), self._right._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_less_than_equals_numbers(values: Sequence[Any]) -> Any:
+                return float(left(values)) <= float(right(values))
+            return op_less_than_equals_numbers
+        def op_less_than_equals(context: Dict[str, Any]) -> Any:
+            left_val = left(context)
+            right_val = right(context)
+            return _make_numeric(left_val) <= _make_numeric(right_val)
+        return op_less_than_equals
     
 
 class UnaryOp(ExpressionNode):
-    @abstractmethod
-    def __init__(self, name: str, op: str, operand: ExpressionNode, precedence: int) -> None:
-        super().__init__(name, precedence)
+    __slots__ = ("_operand", "_specificity")
+    _op = ""
+
+    def __init__(self, operand: ExpressionNode) -> None:
         self._operand = operand
-        self._op = op
         self._specificity = operand.specificity
 
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> Any:
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> Any:
         val = self._operand.evaluate(context, dump_eval)
         result: Any = self._do_eval(val)
         
         if dump_eval is not None:
-            dump_eval.append(f"Evaluated: {self._op} {_format_value(val)} = {_format_value(result)}")
+            _trace(dump_eval, self, val, None, result, False)
         
         return result
     
@@ -225,13 +497,22 @@ class UnaryOp(ExpressionNode):
     def _do_eval(self, val: Any) -> Any:
         raise NotImplementedError()
 
+    def _describe(self, val: Any, unused: Any, result: Any, short_circuited: bool) -> str:
+        return f"Evaluated: {self._op} {_format_value(val)} = {_format_value(result)}"
+
+    def _children(self) -> List[ExpressionNode]:
+        return [self._operand]
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self._operand,))
+
     def dump_structure(self, indent: int = 0) -> str:
         out = ("  " * indent + f"{self._name}") + "\n"
         out += self._operand.dump_structure(indent + 1)
         return out
     
-    def write(self) -> str:
-        operand_str = self._operand.write()
+    def _write(self, quote: str) -> str:
+        operand_str = self._operand._write(quote)
 
         if self._operand._precedence < self._precedence:
             operand_str = f"({operand_str})"
@@ -240,80 +521,165 @@ class UnaryOp(ExpressionNode):
     
 
 class OpNegative(UnaryOp):
-    def __init__(self, operand: ExpressionNode) -> None:
-        super().__init__("Negative", "-", operand, 90)
+    __slots__ = ()
+    _name = "Negative"
+    _op = "-"
+    _precedence = 90
 
     def _do_eval(self, val: Any) -> Any:
         val = _make_numeric(val)
         return -val
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        operand = self._operand._compile(inference)
+        if inference is not None and inference.numeric(self):
+            def op_negative_number(values: Sequence[Any]) -> Any:
+                return -float(operand(values))
+            return op_negative_number
+        def op_negative(context: Dict[str, Any]) -> Any:
+            return -_make_numeric(operand(context))
+        return op_negative
+
 
 class OpNot(UnaryOp):
-    def __init__(self, operand: ExpressionNode) -> None:
-        super().__init__("Not", "not", operand, 90)
+    __slots__ = ()
+    _name = "Not"
+    _op = "not"
+    _precedence = 90
 
     def _do_eval(self, val: Any) -> Any:
         val = _make_bool(val)
         return not val
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        operand = self._operand._compile(inference)
+        if inference is not None and inference.boolean(self):
+            def op_not_bool(values: Sequence[Any]) -> Any:
+                return not operand(values)
+            return op_not_bool
+        def op_not(context: Dict[str, Any]) -> Any:
+            return not _make_bool(operand(context))
+        return op_not
 
-class LiteralBoolean(ExpressionNode):
-    def __init__(self, value: bool) -> None:
-        super().__init__("Boolean", 100)
-        self._value = value
 
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> bool:
+class LiteralBoolean(ExpressionNode):
+    __slots__ = ("_value",)
+    _name = "Boolean"
+    _precedence = 100
+
+    # Nodes never change once they're made, so every true and every false can share one node.
+    def __new__(cls, value: bool) -> "LiteralBoolean":
+        if cls is LiteralBoolean and type(value) is bool:
+            node = _SHARED_BOOLEANS.get(value)
+            if node is not None:
+                return node
+        node = super().__new__(cls)
+        node._value = value
+        return node
+
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> bool:
         if dump_eval is not None:
-            dump_eval.append(f"Boolean: {_format_boolean(self._value)}")
+            _trace(dump_eval, self, None, None, self._value, False)
         return self._value
 
+    def _describe(self, unused: Any, unused_too: Any, result: Any, short_circuited: bool) -> str:
+        return f"Boolean: {_format_boolean(result)}"
+
     def dump_structure(self, indent: int = 0) -> str:
         return ("  " * indent + f"Boolean({_format_boolean(self._value)})") + "\n"
     
-    def write(self) -> str:
+    def _write(self, quote: str) -> str:
         return _format_boolean(self._value)
 
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        value = self._value
+        def literal(values: _Values) -> Any:
+            return value
+        return literal
+
+    def __reduce__(self) -> tuple:
+        return (LiteralBoolean, (self._value,))
 
-class LiteralNumber(ExpressionNode):
-    def __init__(self, value: str) -> None:
-        super().__init__("Number", 100)
-        self._value = float(value)
 
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> float:
+class LiteralNumber(ExpressionNode):
+    __slots__ = ("_value",)
+    _name = "Number"
+    _precedence = 100
+
+    # Small whole numbers share a node, as literal booleans do.
+    def __new__(cls, value: str) -> "LiteralNumber":
+        number = float(value)
+        if cls is LiteralNumber and number in _SHARED_NUMBERS and math.copysign(1.0, number) > 0:
+            return _SHARED_NUMBERS[number]
+        node = super().__new__(cls)
+        node._value = number
+        return node
+
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> float:
         if dump_eval is not None:
-            dump_eval.append(f"Number: {_format_numeric(self._value)}")
+            _trace(dump_eval, self, None, None, self._value, False)
         return self._value
 
+    def _describe(self, unused: Any, unused_too: Any, result: Any, short_circuited: bool) -> str:
+        return f"Number: {_format_numeric(result)}"
+
     def dump_structure(self, indent: int = 0) -> str:
         return ("  " * indent + f"Number({_format_numeric(self._value)})") + "\n"
 
-    def write(self) -> str:
+    def _write(self, quote: str) -> str:
         return _format_numeric(self._value)
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        value = self._value
+        def literal(values: _Values) -> Any:
+            return value
+        return literal
+
+    def __reduce__(self) -> tuple:
+        return (LiteralNumber, (self._value,))
     
 
 class LiteralString(ExpressionNode):
+    __slots__ = ("_value",)
+    _name = "String"
+    _precedence = 100
+
     def __init__(self, value: str) -> None:
-        super().__init__("String", 100)
         self._value = value
 
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> str:
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> str:
         if dump_eval is not None:
-            dump_eval.append(f"String: {_format_string(self._value)}")
+            _trace(dump_eval, self, None, None, self._value, False)
         return self._value
 
+    def _describe(self, unused: Any, unused_too: Any, result: Any, short_circuited: bool) -> str:
+        return f"String: {_format_string(result)}"
+
     def dump_structure(self, indent: int = 0) -> str:
         return ("  " * indent + f"String({_format_string(self._value)})") + "\n"
 
-    def write(self) -> str:
-        return _format_string(self._value)
+    def _write(self, quote: str) -> str:
+        return f"{quote}{self._value}{quote}"
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        value = self._value
+        def literal(values: _Values) -> Any:
+            return value
+        return literal
+
+    def __reduce__(self) -> tuple:
+        return (LiteralString, (self._value,))
     
     
+# A variable's _name is the name it's looked up by, rather than "Variable".
 class Variable(ExpressionNode):
+    __slots__ = ("_name",)
+    _precedence = 100
+
     def __init__(self, name: str) -> None:
-        super().__init__("Variable", 100)
-        self._name = name
+        self._name = sys.intern(name)
 
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> Any:
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> Any:
         value = context.get(self._name)
         if value is None:
             raise RuntimeError(f"Variable '{self._name}' not found in context.")
@@ -321,64 +687,134 @@ class Variable(ExpressionNode):
             raise TypeError(f"Variable '{self._name}' must return bool, string, or numeric.")
         
         if dump_eval is not None:
-            dump_eval.append(f"Fetching variable: {self._name} -> {_format_value(value)}")
+            _trace(dump_eval, self, None, None, value, False)
         return value
 
+    def _describe(self, unused: Any, unused_too: Any, result: Any, short_circuited: bool) -> str:
+        return f"Fetching variable: {self._name} -> {_format_value(result)}"
+
     def dump_structure(self, indent: int = 0) -> str:
         return ("  " * indent + f"Variable({self._name})") + "\n"
     
-    def write(self) -> str:
+    def _write(self, quote: str) -> str:
         return self._name
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        if inference is not None:
+            # The schema has checked the value's type when the values were made.
+            return itemgetter(inference.slot(self._name))
+        name = self._name
+        def variable(context: Dict[str, Any]) -> Any:
+            value = context.get(name)
+            if value is None:
+                raise RuntimeError(f"Variable '{name}' not found in context.")
+            if not isinstance(value, (int, float, bool, str)):
+                raise TypeError(f"Variable '{name}' must return bool, string, or numeric.")
+            return value
+        return variable
+
+    def __reduce__(self) -> tuple:
+        return (Variable, (self._name,))
     
 
 class FunctionCall(ExpressionNode):
-    def __init__(self, func_name: str, args: Optional[List[ExpressionNode]] = None) -> None:
-        super().__init__("FunctionCall", 100)
-        if args is None:
-            args = []
-        self._func_name = func_name
-        self._args = args
-
-    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[List[str]] = None) -> Any:
+    __slots__ = ("_func_name", "_args")
+    _name = "FunctionCall"
+    _precedence = 100
+
+    def __init__(self, func_name: str, args: Optional[Iterable[ExpressionNode]] = None) -> None:
+        self._func_name = sys.intern(func_name)
+        # A tuple, like every other part of a node, can't be changed once the node is made.
+        self._args: Tuple[ExpressionNode, ...] = tuple(args) if args is not None else ()
+
+    def evaluate(self, context: Dict[str, Any], dump_eval: Optional[Union[List[str], Trace]] = None) -> Any:
         func = context.get(self._func_name)
         if func is None:
             raise RuntimeError(f"Function '{self._func_name}' not found in context.")
         
         arg_values: List[Any] = [arg.evaluate(context, dump_eval) for arg in self._args]
 
-        # Get the function signature and check if it accepts the provided arguments.
-        sig = inspect.signature(func)
-        try:
-            sig.bind(*arg_values)
-        except TypeError as e:
-            formatted_args = ", ".join(_format_value(val) for val in arg_values)
-            raise RuntimeError(f"Function '{self._func_name}' does not support the provided arguments ({formatted_args}).")
-
-        result = func(*arg_values)
-
-        if not isinstance(result, (int, float, bool, str)):
-            raise TypeError(f"Function '{self._func_name}' must return bool, string, or numeric.")
+        result = _call_function(self._func_name, func, arg_values)
         
         if dump_eval is not None:
-            formatted_args = ", ".join(_format_value(val) for val in arg_values)
-            dump_eval.append(f"Called function: {self._func_name}({formatted_args}) = {_format_value(result)}")
+            _trace(dump_eval, self, arg_values, None, result, False)
 
         return result
 
+    def _describe(self, arg_values: List[Any], unused: Any, result: Any, short_circuited: bool) -> str:
+        formatted_args = ", ".join(_format_value(val) for val in arg_values)
+        return f"Called function: {self._func_name}({formatted_args}) = {_format_value(result)}"
+
     def dump_structure(self, indent: int = 0) -> str:
         out = ("  " * indent + f"FunctionCall({self._func_name})") + "\n"
         for arg in self._args:
             out += arg.dump_structure(indent + 1)
         return out
     
-    def write(self) -> str:
+    def _write(self, quote: str) -> str:
         out = self._func_name+"("
         written_args = []
         for arg in self._args:
-            written_args.append(arg.write())
+            written_args.append(arg._write(quote))
         out += ", ".join(written_args)
         out += ")"
         return out
+
+    def _children(self) -> List[ExpressionNode]:
+        return list(self._args)
+
+    def __reduce__(self) -> tuple:
+        return (FunctionCall, (self._func_name, self._args))
+
+    def _compile(self, inference: Optional["Inference"] = None) -> Callable[[_Values], Any]:
+        func_name = self._func_name
+        args = [arg._compile(inference) for arg in self._args]
+        if inference is not None:
+            # The function and its arity are looked up and checked once, when binding.
+            func = inference.function(func_name, len(args))
+            check = inference.result_check(func_name)
+            def bound_function_call(values: Sequence[Any]) -> Any:
+                return check(func_name, func(*[arg(values) for arg in args]))
+            return bound_function_call
+        def function_call(context: Dict[str, Any]) -> Any:
+            func = context.get(func_name)
+            if func is None:
+                raise RuntimeError(f"Function '{func_name}' not found in context.")
+            return _call_function(func_name, func, [arg(context) for arg in args])
+        return function_call
+    
+
+# Records one step of an evaluation: a line of text for a list, or the values for a Trace.
+def _trace(dump_eval: Union[List[str], Trace], node: ExpressionNode, a: Any, b: Any, result: Any, short_circuited: bool) -> None:
+    if isinstance(dump_eval, Trace):
+        dump_eval._steps.append((node, a, b, result, short_circuited, dump_eval._evaluation))
+    else:
+        dump_eval.append(node._describe(a, b, result, short_circuited))
+
+
+_SHARED_BOOLEANS: Dict[bool, LiteralBoolean] = {}
+_SHARED_BOOLEANS.update({value: LiteralBoolean(value) for value in (True, False)})
+
+_SHARED_NUMBERS: Dict[float, LiteralNumber] = {}
+_SHARED_NUMBERS.update({float(value): LiteralNumber(str(value)) for value in range(256)})
+
+
+def _call_function(func_name: str, func: Callable[..., Any], arg_values: List[Any]) -> Any:
+    _check_arguments(func_name, func, arg_values)
+    return _check_result(func_name, func(*arg_values))
+
+
+def _check_arguments(func_name: str, func: Callable[..., Any], arg_values: List[Any]) -> None:
+    # Check the function accepts the provided arguments; its arity is cached after the first call.
+    if not accepts(func, len(arg_values)):
+        formatted_args = ", ".join(_format_value(val) for val in arg_values)
+        raise RuntimeError(f"Function '{func_name}' does not support the provided arguments ({formatted_args}).")
+
+
+def _check_result(func_name: str, result: Any) -> Any:
+    if not isinstance(result, (int, float, bool, str)):
+        raise TypeError(f"Function '{func_name}' must return bool, string, or numeric.")
+    return result
     
 
 def _make_bool(val: Any) -> bool:
@@ -432,14 +868,20 @@ def _format_numeric(num: Union[int, float]) -> str:
         return str(int(num))
     return str(num)
 
-def _format_string(val: str) -> str:
-    if Writer.string_format==STRING_FORMAT_SINGLEQUOTE:
-        return f"'{val}'"
-    if Writer.string_format==STRING_FORMAT_ESCAPED_SINGLEQUOTE:
-        return f"\\'{val}\\'"
-    if Writer.string_format==STRING_FORMAT_ESCAPED_DOUBLEQUOTE:
-        return f"\\\"{val}\\\""
-    return f"\"{val}\""
+# The quotes each of the STRING_FORMAT_* settings puts around a string.
+_QUOTES = {
+    STRING_FORMAT_SINGLEQUOTE: "'",
+    STRING_FORMAT_ESCAPED_SINGLEQUOTE: "\\'",
+    STRING_FORMAT_DOUBLEQUOTE: "\"",
+    STRING_FORMAT_ESCAPED_DOUBLEQUOTE: "\\\"",
+}
+
+# Quotes with the given format, or by default with the global Writer.string_format.
+def _format_string(val: str, string_format: Optional[int] = None) -> str:
+    if string_format is None:
+        string_format = Writer.string_format
+    quote = _QUOTES.get(string_format, "\"")
+    return f"{quote}{val}{quote}"
 
 def _format_value(val: Any) -> str:
     if isinstance(val, bool):
@@ -0,0 +1,121 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import inspect
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# (min, max) number of positional arguments a function accepts.
+Arity = Tuple[float, float]
+
+# Arity of each function seen so far, keyed by id() and checked by identity, so that replacing
+# a function in the context (even with one of the same name) works it out again. Entries go
+# away when the function does.
+_arities: Dict[int, Tuple[Callable[[], Any], Optional[Arity]]] = {}
+
+# Functions which can't be weakly referenced, like str.upper or (1).__add__, are held
+# instead, so their ids can't be reused while they're here. Only the most recently used are
+# kept, so ones made on the fly don't pile up.
+MAX_HELD_ARITIES = 256
+_held_arities: "OrderedDict[int, Tuple[Callable[..., Any], Optional[Arity]]]" = OrderedDict()
+
+
+# Returns how many positional arguments `func` accepts, or None if it can't be worked out
+# (some builtins and C functions have no signature), in which case calls aren't checked.
+def arity(func: Callable[..., Any]) -> Optional[Arity]:
+    key = id(func)
+    entry = _arities.get(key)
+    if entry is not None and entry[0]() is func:
+        return entry[1]
+    held = _held_arities.get(key)
+    if held is not None and held[0] is func:
+        try:
+            _held_arities.move_to_end(key)
+        except KeyError:
+            pass  # Another thread dropped it.
+        return held[1]
+
+    result = _find_arity(func)
+    try:
+        ref = weakref.ref(func, lambda ref: _forget(key, ref))
+    except TypeError:
+        _held_arities[key] = (func, result)
+        while len(_held_arities) > MAX_HELD_ARITIES:
+            _held_arities.popitem(last=False)
+        return result
+    _arities[key] = (ref, result)
+    return result
+
+
+# Works out and caches the arity of every function in a context up front, rather than on
+# first use.
+def register_functions(context: Dict[str, Any]) -> None:
+    for value in context.values():
+        if callable(value):
+            arity(value)
+
+
+# Marks a function whose result can change even when none of the variables passed to it
+# do (e.g. a random roll or the current time), so a ReactiveEvaluator always calls it again.
+def volatile(func: Callable[..., Any]) -> Callable[..., Any]:
+    func._expression_volatile = True  # type: ignore[attr-defined]
+    return func
+
+
+def is_volatile(func: Any) -> bool:
+    return getattr(func, "_expression_volatile", False)
+
+
+# Marks a function whose result depends only on its arguments, so a FunctionMemo can reuse
+# the result of an earlier call with the same arguments.
+def pure(func: Callable[..., Any]) -> Callable[..., Any]:
+    func._expression_pure = True  # type: ignore[attr-defined]
+    return func
+
+
+def is_pure(func: Any) -> bool:
+    return getattr(func, "_expression_pure", False)
+
+
+# Marks a function which takes and returns whole arrays, so evaluate_batch() calls it once
+# rather than once per row.
+def vectorized(func: Callable[..., Any]) -> Callable[..., Any]:
+    func._expression_vectorized = True  # type: ignore[attr-defined]
+    return func
+
+
+def is_vectorized(func: Any) -> bool:
+    return getattr(func, "_expression_vectorized", False)
+
+
+def accepts(func: Callable[..., Any], count: int) -> bool:
+    bounds = arity(func)
+    return bounds is None or bounds[0] <= count <= bounds[1]
+
+
+def _find_arity(func: Callable[..., Any]) -> Optional[Arity]:
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+
+    min_args: float = 0
+    max_args: float = 0
+    for param in sig.parameters.values():
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            max_args += 1
+            if param.default is param.empty:
+                min_args += 1
+        elif param.kind == param.VAR_POSITIONAL:
+            max_args = float("inf")
+        elif param.kind == param.KEYWORD_ONLY and param.default is param.empty:
+            # Can never be called with positional arguments alone.
+            return (float("inf"), 0)
+    return (min_args, max_args)
+
+
+def _forget(key: int, ref: Any) -> None:
+    entry = _arities.get(key)
+    if entry is not None and entry[0] is ref:
+        _arities.pop(key, None)  # Another thread may have got there first.
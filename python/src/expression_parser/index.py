@@ -0,0 +1,267 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .expression import (
+    ExpressionNode,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+    Variable,
+    _make_bool,
+    _make_numeric,
+    _make_str,
+)
+from .parser import Parser
+from .ruleset import _Rule
+
+_LITERALS = (LiteralBoolean, LiteralNumber, LiteralString)
+
+_RANGE_OPS = {
+    OpGreaterThan: ">",
+    OpGreaterThanEquals: ">=",
+    OpLessThan: "<",
+    OpLessThanEquals: "<=",
+}
+
+# The same comparison with the operands swapped, i.e. 5 < x is x > 5.
+_FLIPPED = {">": "<", ">=": "<=", "<": ">", "<=": ">="}
+
+
+class RuleIndexStats:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.queries = 0
+        self.candidates = 0
+        self.pruned = 0  # Rules never evaluated because the index ruled them out.
+        self.matches = 0
+
+    def __repr__(self) -> str:
+        return f"RuleIndexStats(queries={self.queries}, candidates={self.candidates}, pruned={self.pruned}, matches={self.matches})"
+
+
+# Indexes rules on one equality or range clause taken from the top level 'and' chain of each
+# expression (e.g. location=="spain" in location=="spain" and is_day_time), so that a lookup
+# only evaluates rules whose indexed clause holds for the context. Rules without such a clause
+# are always evaluated.
+#
+# A rule ruled out by the index is treated as not matching, so it never raises errors that
+# its other clauses might have raised under evaluate().
+class RuleIndex:
+    def __init__(self, rules: Optional[Iterable[Tuple[Union[str, ExpressionNode], Any]]] = None) -> None:
+        self._parser = Parser()
+        self._rules: List[_Rule] = []
+        self._unindexed: List[int] = []
+        self._equality: Dict[str, _EqualityIndex] = {}
+        self._range: Dict[str, _RangeIndex] = {}
+        self._stats = RuleIndexStats()
+        if rules is not None:
+            for expression, payload in rules:
+                self.add(expression, payload)
+
+    def add(self, expression: Union[str, ExpressionNode], payload: Any) -> None:
+        if isinstance(expression, str):
+            expression = self._parser.parse(expression)
+
+        rule_id = len(self._rules)
+        self._rules.append(_Rule(expression, payload))
+
+        clauses = _conjuncts(expression)
+        for clause in clauses:
+            equality = _equality_clause(clause)
+            if equality is not None:
+                name, literal_value, literal_first = equality
+                self._equality.setdefault(name, _EqualityIndex()).add(literal_value, literal_first, rule_id)
+                return
+
+        for clause in clauses:
+            comparison = _range_clause(clause)
+            if comparison is not None:
+                name, op, threshold = comparison
+                self._range.setdefault(name, _RangeIndex()).add(op, threshold, rule_id)
+                return
+
+        self._unindexed.append(rule_id)
+
+    # Returns the ids (in the order the rules were added) of the rules which could match.
+    def candidates(self, context: Dict[str, Any]) -> List[int]:
+        found: Set[int] = set(self._unindexed)
+        for name, index in self._equality.items():
+            index.find(context.get(name), found)
+        for name, index in self._range.items():
+            index.find(context.get(name), found)
+        return sorted(found)
+
+    # Returns the payloads of every matching rule, in the order they were added.
+    def match(self, context: Dict[str, Any]) -> List[Any]:
+        candidates = self.candidates(context)
+        rules = self._rules
+
+        matched = [rules[rule_id].payload for rule_id in candidates if _make_bool(rules[rule_id].run(context))]
+
+        stats = self._stats
+        stats.queries += 1
+        stats.candidates += len(candidates)
+        stats.pruned += len(rules) - len(candidates)
+        stats.matches += len(matched)
+        return matched
+
+    @property
+    def rules(self) -> List[Tuple[ExpressionNode, Any]]:
+        return [(rule.expression, rule.payload) for rule in self._rules]
+
+    @property
+    def stats(self) -> RuleIndexStats:
+        return self._stats
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+
+# Rules whose clause is `variable == literal` or `literal == variable`. A clause matches when
+# evaluate() would return true for it, so lookups follow the _make_type_match rules: the
+# right-hand side is converted to the type of the left-hand side.
+class _EqualityIndex:
+    def __init__(self) -> None:
+        # variable == literal: the literal converted to each type the variable could have.
+        self._by_bool: Dict[bool, List[int]] = {}
+        self._by_number: Dict[float, List[int]] = {}
+        self._by_string: Dict[str, List[int]] = {}
+        self._any_number: List[int] = []  # Literals which can't convert to a number (that raises).
+        # literal == variable: the literal itself, keyed by its type.
+        self._literal_bool: Dict[bool, List[int]] = {}
+        self._literal_number: Dict[float, List[int]] = {}
+        self._literal_string: Dict[str, List[int]] = {}
+        self._all: List[int] = []
+
+    def add(self, value: Any, literal_first: bool, rule_id: int) -> None:
+        self._all.append(rule_id)
+
+        if literal_first:
+            if isinstance(value, bool):
+                self._literal_bool.setdefault(value, []).append(rule_id)
+            elif isinstance(value, str):
+                self._literal_string.setdefault(value, []).append(rule_id)
+            else:
+                self._literal_number.setdefault(value, []).append(rule_id)
+            return
+
+        self._by_bool.setdefault(_make_bool(value), []).append(rule_id)
+        self._by_string.setdefault(_make_str(value), []).append(rule_id)
+        try:
+            self._by_number.setdefault(_make_numeric(value), []).append(rule_id)
+        except TypeError:
+            self._any_number.append(rule_id)
+
+    def find(self, value: Any, found: Set[int]) -> None:
+        if not isinstance(value, (int, float, bool, str)):
+            # Missing or invalid; let evaluation report it.
+            found.update(self._all)
+            return
+
+        if isinstance(value, bool):
+            found.update(self._by_bool.get(value, ()))
+        elif isinstance(value, str):
+            found.update(self._by_string.get(value, ()))
+        else:
+            found.update(self._by_number.get(value, ()))
+            found.update(self._any_number)
+
+        found.update(self._literal_bool.get(_make_bool(value), ()))
+        found.update(self._literal_string.get(_make_str(value), ()))
+        try:
+            found.update(self._literal_number.get(_make_numeric(value), ()))
+        except TypeError:
+            for rule_ids in self._literal_number.values():
+                found.update(rule_ids)
+
+
+# Rules whose clause compares a variable with a number, kept sorted by the number so a lookup
+# is a bisect per comparison operator.
+class _RangeIndex:
+    def __init__(self) -> None:
+        self._bounds: Dict[str, Tuple[List[float], List[int]]] = {op: ([], []) for op in _FLIPPED}
+        self._sorted = True
+        self._all: List[int] = []
+
+    def add(self, op: str, threshold: float, rule_id: int) -> None:
+        thresholds, rule_ids = self._bounds[op]
+        thresholds.append(threshold)
+        rule_ids.append(rule_id)
+        self._all.append(rule_id)
+        self._sorted = False
+
+    def find(self, value: Any, found: Set[int]) -> None:
+        if not isinstance(value, (int, float, bool, str)):
+            found.update(self._all)
+            return
+        try:
+            value = _make_numeric(value)
+        except TypeError:
+            found.update(self._all)
+            return
+        if value != value:
+            return  # NaN compares false with everything.
+
+        if not self._sorted:
+            self._sort()
+
+        thresholds, rule_ids = self._bounds[">"]
+        found.update(rule_ids[:bisect_left(thresholds, value)])
+        thresholds, rule_ids = self._bounds[">="]
+        found.update(rule_ids[:bisect_right(thresholds, value)])
+        thresholds, rule_ids = self._bounds["<"]
+        found.update(rule_ids[bisect_right(thresholds, value):])
+        thresholds, rule_ids = self._bounds["<="]
+        found.update(rule_ids[bisect_left(thresholds, value):])
+
+    def _sort(self) -> None:
+        for op, (thresholds, rule_ids) in self._bounds.items():
+            pairs = sorted(zip(thresholds, rule_ids))
+            self._bounds[op] = ([threshold for threshold, _ in pairs], [rule_id for _, rule_id in pairs])
+        self._sorted = True
+
+
+# The clauses of the top level 'and' chain, in evaluation order.
+def _conjuncts(node: ExpressionNode) -> List[ExpressionNode]:
+    clauses: List[ExpressionNode] = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, OpAnd):
+            stack.append(node._right)
+            stack.append(node._left)
+        else:
+            clauses.append(node)
+    return clauses
+
+
+def _equality_clause(node: ExpressionNode) -> Optional[Tuple[str, Any, bool]]:
+    if type(node) is not OpEquals:
+        return None
+    if isinstance(node._left, Variable) and isinstance(node._right, _LITERALS):
+        return node._left._name, node._right._value, False
+    if isinstance(node._left, _LITERALS) and isinstance(node._right, Variable):
+        return node._right._name, node._left._value, True
+    return None
+
+
+def _range_clause(node: ExpressionNode) -> Optional[Tuple[str, str, float]]:
+    op = _RANGE_OPS.get(type(node))
+    if op is None:
+        return None
+    if isinstance(node._left, Variable) and isinstance(node._right, LiteralNumber):
+        return node._left._name, op, node._right._value
+    if isinstance(node._left, LiteralNumber) and isinstance(node._right, Variable):
+        return node._right._name, _FLIPPED[op], node._left._value
+    return None
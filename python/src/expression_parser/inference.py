@@ -0,0 +1,234 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .expression import (
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpDivide,
+    OpEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+    OpMinus,
+    OpMultiply,
+    OpNegative,
+    OpNot,
+    OpNotEquals,
+    OpOr,
+    OpPlus,
+    Variable,
+)
+from .functions import accepts
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+# The types a part of an expression can have. None is used where the type isn't known.
+BOOL = "bool"
+NUMBER = "number"
+STRING = "string"
+
+_TYPE_NAMES = {bool: BOOL, int: NUMBER, float: NUMBER, str: STRING}
+
+_LOGICAL = (OpOr, OpAnd)
+_COMPARISONS = (OpGreaterThan, OpLessThan, OpGreaterThanEquals, OpLessThanEquals)
+_EQUALITY = (OpEquals, OpNotEquals)
+_ARITHMETIC = (OpPlus, OpMinus, OpDivide)
+
+
+# An error which a node raises every time it's evaluated, whatever the values, with the same
+# message it would raise with.
+class TypeProblem(NamedTuple):
+    node: ExpressionNode
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.node.write()}: {self.message}"
+
+
+# Works out the type of the result of each node of an expression, from the literals, what the
+# operators always give, and the types of the variables and function results in a schema, if
+# there is one. It also finds the errors which are certain to happen when a node is evaluated,
+# like comparing a string which isn't a number with '>', or calling a function with the wrong
+# number of arguments.
+#
+# Only those in parts of the expression which are always evaluated are certain to happen when
+# the expression is, and are in `errors`. Those in parts which can be skipped, like the right-
+# hand side of 'and', 'or' and '*', are in `possible_errors`.
+#
+# An Inference is also what Schema.bind() compiles the expression with, so it passes on the
+# schema's slots and functions.
+class Inference:
+    def __init__(self, expression: ExpressionNode, schema: Optional["Schema"] = None) -> None:
+        self._expression = expression  # Keeps the nodes, and so their ids, alive.
+        self._schema = schema
+        self._types: Dict[int, Optional[str]] = {}
+        self._errors: List[TypeProblem] = []
+        self._possible_errors: List[TypeProblem] = []
+        self._always = _always_evaluated(expression)
+
+        stack: List[Tuple[ExpressionNode, bool]] = [(expression, False)]
+        while stack:
+            node, ready = stack.pop()
+            if id(node) in self._types:
+                continue
+            if ready:
+                self._types[id(node)] = self._infer(node)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node._children())
+
+    # The type of the whole expression.
+    @property
+    def type(self) -> Optional[str]:
+        return self._types[id(self._expression)]
+
+    @property
+    def errors(self) -> List[TypeProblem]:
+        return list(self._errors)
+
+    @property
+    def possible_errors(self) -> List[TypeProblem]:
+        return list(self._possible_errors)
+
+    def type_of(self, node: ExpressionNode) -> Optional[str]:
+        if id(node) not in self._types:
+            raise KeyError(f"'{node.write()}' is not part of the expression.")
+        return self._types[id(node)]
+
+    # Whether every operand of the node is a bool, a number, or the same known type.
+    def boolean(self, node: ExpressionNode) -> bool:
+        return all(self._types[id(child)] == BOOL for child in node._children())
+
+    def numeric(self, node: ExpressionNode) -> bool:
+        return all(self._types[id(child)] == NUMBER for child in node._children())
+
+    def matching(self, node: ExpressionNode) -> bool:
+        types = {self._types[id(child)] for child in node._children()}
+        return len(types) == 1 and None not in types
+
+    def slot(self, name: str) -> int:
+        assert self._schema is not None
+        return self._schema.slot(name)
+
+    def function(self, name: str, count: int) -> Callable[..., Any]:
+        assert self._schema is not None
+        return self._schema.function(name, count)
+
+    def result_check(self, name: str) -> Callable[[str, Any], Any]:
+        assert self._schema is not None
+        return self._schema.result_check(name)
+
+    def _infer(self, node: ExpressionNode) -> Optional[str]:
+        if isinstance(node, LiteralBoolean):
+            return BOOL
+        if isinstance(node, LiteralNumber):
+            return NUMBER
+        if isinstance(node, LiteralString):
+            return STRING
+
+        if isinstance(node, Variable):
+            if self._schema is None:
+                return None
+            declared = self._schema.variable_type(node._name)
+            if declared is None:
+                self._problem(TypeProblem(node, f"Variable '{node._name}' is not in the schema."))
+                return None
+            return _TYPE_NAMES[declared]
+
+        if isinstance(node, FunctionCall):
+            if self._schema is None:
+                return None
+            func = self._schema._functions.get(node._func_name)
+            if func is None:
+                self._problem(TypeProblem(node, f"Function '{node._func_name}' is not in the schema."))
+                return None
+            if not accepts(func, len(node._args)):
+                self._problem(TypeProblem(node, f"Function '{node._func_name}' does not support the provided arguments."))
+            declared = self._schema.return_type(node._func_name)
+            return _TYPE_NAMES[declared] if declared is not None else None
+
+        if isinstance(node, _LOGICAL):
+            return BOOL
+        if isinstance(node, OpNot):
+            return BOOL
+
+        if isinstance(node, _COMPARISONS):
+            self._check_numeric(node, node._left)
+            self._check_numeric(node, node._right)
+            return BOOL
+
+        if isinstance(node, _EQUALITY):
+            # The right-hand side is made the same type as the left.
+            if self._types[id(node._left)] == NUMBER:
+                self._check_numeric(node, node._right)
+            return BOOL
+
+        if isinstance(node, _ARITHMETIC):
+            self._check_numeric(node, node._left)
+            self._check_numeric(node, node._right)
+            if isinstance(node, OpDivide) and isinstance(node._right, LiteralNumber) and node._right._value == 0:
+                self._problem(TypeProblem(node, "Division by zero."))
+            return NUMBER
+
+        if isinstance(node, OpMultiply):
+            # The right-hand side is only evaluated when the left isn't 0.
+            self._check_numeric(node, node._left)
+            self._check_numeric(node, node._right, _right_always(node))
+            return NUMBER
+
+        if isinstance(node, OpNegative):
+            self._check_numeric(node, node._operand)
+            return NUMBER
+
+        return None
+
+    # A string literal used as a number has to be one.
+    def _check_numeric(self, node: ExpressionNode, operand: ExpressionNode, always: bool = True) -> None:
+        if not isinstance(operand, LiteralString):
+            return
+        try:
+            float(operand._value)
+        except ValueError:
+            self._problem(TypeProblem(node, f"Type mismatch: Expecting number but got '{operand._value}'"), always)
+
+    def _problem(self, problem: TypeProblem, always: bool = True) -> None:
+        if always and id(problem.node) in self._always:
+            self._errors.append(problem)
+        else:
+            self._possible_errors.append(problem)
+
+
+# The ids of the nodes which are evaluated whenever the whole expression is: all but those
+# below the right-hand side of 'and', 'or', and '*' (unless its left is a number other than 0).
+def _always_evaluated(expression: ExpressionNode) -> Set[int]:
+    always: Set[int] = set()
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        if id(node) in always:
+            continue
+        always.add(id(node))
+        if isinstance(node, (OpOr, OpAnd, OpMultiply)):
+            stack.append(node._left)
+            if _right_always(node):
+                stack.append(node._right)
+        else:
+            stack.extend(node._children())
+    return always
+
+
+def _right_always(node: ExpressionNode) -> bool:
+    return isinstance(node, OpMultiply) and isinstance(node._left, LiteralNumber) and node._left._value != 0
+
+
+# Returns the Inference for an expression, optionally with the types declared in a schema.
+def infer(expression: ExpressionNode, schema: Optional["Schema"] = None) -> Inference:
+    return Inference(expression, schema)
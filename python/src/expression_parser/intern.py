@@ -0,0 +1,167 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import sys
+import threading
+from typing import Any, Dict, Hashable, List, Tuple
+
+from .expression import (
+    BinaryOp,
+    ExpressionNode,
+    FunctionCall,
+    LiteralNumber,
+    UnaryOp,
+    Variable,
+    _call_function,
+)
+
+
+# Deduplicates structurally identical nodes across many expressions, so that e.g. every
+# is_day_time or spell_power("jamie")>12 shares one node. Pass one to Parser(interner=...)
+# to intern everything it parses.
+class Interner:
+    def __init__(self) -> None:
+        self._nodes: Dict[Hashable, ExpressionNode] = {}
+        self._lock = threading.Lock()
+        self._seen = 0
+        self._bytes_saved = 0
+
+    def intern(self, node: ExpressionNode) -> ExpressionNode:
+        with self._lock:
+            return self._intern(node)
+
+    def _intern(self, root: ExpressionNode) -> ExpressionNode:
+        # Post-order walk with an explicit stack, so long generated chains don't hit the
+        # recursion limit. Children are interned before their parents.
+        canonical: Dict[int, ExpressionNode] = {}
+        stack: List[Tuple[ExpressionNode, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in canonical:
+                continue
+            children = node._children()
+            if not expanded and children:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+
+            shared_children = [canonical[id(child)] for child in children]
+            key = _key(node, shared_children)
+            self._seen += 1
+
+            shared = self._nodes.get(key)
+            if shared is None:
+                if any(new is not old for new, old in zip(shared_children, children)):
+                    shared = _rebuild(node, shared_children)
+                else:
+                    shared = node
+                self._nodes[key] = shared
+            elif shared is not node:
+                self._bytes_saved += _node_size(node)
+            canonical[id(node)] = shared
+
+        return canonical[id(root)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+    # Number of nodes passed through the interner.
+    @property
+    def seen(self) -> int:
+        return self._seen
+
+    # Number of distinct nodes kept.
+    @property
+    def unique(self) -> int:
+        return len(self._nodes)
+
+    # Approximate memory no longer needed, assuming the original trees are dropped.
+    @property
+    def bytes_saved(self) -> int:
+        return self._bytes_saved
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+# Evaluates expressions against one context, computing each distinct node at most once. This
+# pays off with interned expressions, where clauses are shared between many expressions.
+# Function calls are treated as pure: a shared call is only made once per context.
+class SharedEvaluator:
+    def __init__(self, context: Dict[str, Any]) -> None:
+        self._context = context
+        self._results: Dict[int, Tuple[Any, Any]] = {}
+        self._keep: List[ExpressionNode] = []  # Keeps nodes alive so their ids stay unique.
+        self.computed = 0
+        self.reused = 0
+
+    def evaluate(self, node: ExpressionNode) -> Any:
+        entry = self._results.get(id(node))
+        if entry is not None:
+            self.reused += 1
+            value, error = entry
+            if error is not None:
+                # A new exception each time, so callers don't share one with a growing traceback.
+                raise error[0](*error[1])
+            return value
+
+        self.computed += 1
+        self._keep.append(node)
+        try:
+            value = self._compute(node)
+        except Exception as e:
+            self._results[id(node)] = (None, (type(e), e.args))
+            raise
+        self._results[id(node)] = (value, None)
+        return value
+
+    def evaluate_all(self, expressions: List[ExpressionNode]) -> List[Any]:
+        return [self.evaluate(expression) for expression in expressions]
+
+    def _compute(self, node: ExpressionNode) -> Any:
+        if isinstance(node, BinaryOp):
+            left_val = self.evaluate(node._left)
+            short_circuit, short_circuit_result = node._short_circuit(left_val)
+            if short_circuit:
+                return short_circuit_result
+            return node._do_eval(left_val, self.evaluate(node._right))
+
+        if isinstance(node, UnaryOp):
+            return node._do_eval(self.evaluate(node._operand))
+
+        if isinstance(node, FunctionCall):
+            func = self._context.get(node._func_name)
+            if func is None:
+                raise RuntimeError(f"Function '{node._func_name}' not found in context.")
+            return _call_function(node._func_name, func, [self.evaluate(arg) for arg in node._args])
+
+        return node.evaluate(self._context)
+
+
+def _key(node: ExpressionNode, children: List[ExpressionNode]) -> Hashable:
+    if isinstance(node, FunctionCall):
+        return (FunctionCall, node._func_name, tuple(id(child) for child in children))
+    if isinstance(node, Variable):
+        return (Variable, node._name)
+    if isinstance(node, LiteralNumber):
+        # hex() keeps 0.0 and -0.0 apart.
+        return (LiteralNumber, node._value.hex())
+    if children:
+        return (type(node),) + tuple(id(child) for child in children)
+    return (type(node), node._value)
+
+
+def _rebuild(node: ExpressionNode, children: List[ExpressionNode]) -> ExpressionNode:
+    if isinstance(node, FunctionCall):
+        return FunctionCall(node._func_name, children)
+    return type(node)(*children)
+
+
+def _node_size(node: ExpressionNode) -> int:
+    size = sys.getsizeof(node)
+    if hasattr(node, "__dict__"):
+        size += sys.getsizeof(node.__dict__)
+    if isinstance(node, FunctionCall):
+        size += sys.getsizeof(node._args)
+    return size
@@ -0,0 +1,150 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import multiprocessing
+import os
+from collections import deque
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .expression import ExpressionNode
+from .parser import Parser
+from .serialize import Bundle, dumps_bundle
+
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+COMMENT = "//"
+
+# A file name, or an open text stream or any other iterable of lines.
+Source = Union[str, "os.PathLike[str]", Iterable[str]]
+
+# What's loaded from each line: its 1-based line number, and the expression or the error.
+Loaded = Tuple[int, Union[ExpressionNode, SyntaxError]]
+
+# Set up in each worker process on first use.
+_worker_parser: Optional[Parser] = None
+
+
+# Loads a rule file like tests/Parse.txt, with one expression per line, yielding each line's
+# number and expression as it's read, so the file is never held in memory. A line which
+# doesn't parse gives its SyntaxError in place of the expression, and loading carries on; so
+# does one nested too deeply for the parser's recursion.
+# Blank lines and comments (lines starting "//") are skipped, but still counted.
+def load(source: Source, parser: Optional[Parser] = None, encoding: str = "utf-8") -> Iterator[Loaded]:
+    if parser is None:
+        parser = Parser()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding=encoding, newline="\n") as file:
+            yield from _parse_lines(parser, file, 1)
+    else:
+        yield from _parse_lines(parser, source, 1)
+
+
+# Like load(), but the file is split into chunks of about `chunk_bytes`, at line breaks, which
+# are read and parsed by a pool of worker processes. Results are yielded in file order, with
+# only a few chunks per worker in flight. The workers send their expressions back as bundles
+# (see serialize.py), which are much quicker to pass between processes than pickled trees.
+#
+# Only a file name can be loaded this way, and the encoding must be one where "\n" is always
+# a single byte, like UTF-8. With workers=1 the chunks are parsed in this process.
+def load_parallel(path: Union[str, "os.PathLike[str]"], workers: Optional[int] = None,
+                  chunk_bytes: int = DEFAULT_CHUNK_BYTES, encoding: str = "utf-8") -> Iterator[Loaded]:
+    if chunk_bytes < 1:
+        raise ValueError("load_parallel chunk_bytes must be at least 1.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("load_parallel workers must be at least 1.")
+
+    path = os.fspath(path)
+    line_no = 1
+    if workers == 1:
+        for start, end in _ranges(path, chunk_bytes):
+            line_count, results = _parse_range(path, start, end, encoding)
+            yield from _unpack(line_no, results)
+            line_no += line_count
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        pending: Deque[Any] = deque()
+        for start, end in _ranges(path, chunk_bytes):
+            pending.append(pool.apply_async(_parse_range, (path, start, end, encoding)))
+            # Keep the workers busy without reading the whole file's results up front.
+            if len(pending) >= workers * 2:
+                line_count, results = pending.popleft().get()
+                yield from _unpack(line_no, results)
+                line_no += line_count
+        while pending:
+            line_count, results = pending.popleft().get()
+            yield from _unpack(line_no, results)
+            line_no += line_count
+
+
+def _parse_lines(parser: Parser, lines: Iterable[str], line_no: int) -> Iterator[Loaded]:
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line and not line.startswith(COMMENT):
+            try:
+                expression = parser.parse(line)
+            except SyntaxError as e:
+                yield line_no, e
+            except RecursionError:
+                yield line_no, SyntaxError("Expression is nested too deeply to parse")
+            else:
+                yield line_no, expression
+        line_no += 1
+
+
+# Byte offsets of each chunk of the file. Each chunk after the first starts just after a "\n".
+def _ranges(path: str, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_bytes, size) - 1)
+            file.readline()
+            end = min(file.tell(), size)
+            yield start, end
+            start = end
+
+
+# The results of one chunk, with line numbers counted from its start: how many lines it had,
+# which of those parsed (in a bundle) and which gave errors.
+_RangeResults = Tuple[List[int], bytes, List[Tuple[int, SyntaxError]]]
+
+
+def _parse_range(path: str, start: int, end: int, encoding: str) -> Tuple[int, _RangeResults]:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = Parser()
+
+    with open(path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+
+    parsed: List[int] = []
+    expressions: List[ExpressionNode] = []
+    errors: List[Tuple[int, SyntaxError]] = []
+    for line_no, result in _parse_lines(_worker_parser, lines, 0):
+        if isinstance(result, SyntaxError):
+            errors.append((line_no, result))
+        else:
+            parsed.append(line_no)
+            expressions.append(result)
+    return len(lines), (parsed, dumps_bundle(expressions), errors)
+
+
+def _unpack(first_line_no: int, results: _RangeResults) -> Iterator[Loaded]:
+    parsed, data, errors = results
+    bundle = Bundle(data)
+    index = 0
+    for error_line_no, error in errors:
+        while index < len(parsed) and parsed[index] < error_line_no:
+            yield first_line_no + parsed[index], bundle[index]
+            index += 1
+        yield first_line_no + error_line_no, error
+    while index < len(parsed):
+        yield first_line_no + parsed[index], bundle[index]
+        index += 1
@@ -0,0 +1,147 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from .functions import is_pure
+
+DEFAULT_MAX_SIZE = 4096
+
+# Remembers the results of pure context functions, keyed on the function name and argument
+# values, so that e.g. spell_power("jamie") is only called once however many rules use it.
+#
+#     memo = FunctionMemo()
+#     context = memo.bind(context)
+#     for rule in rules:
+#         rule.evaluate(context)
+#
+# Results are kept across evaluations until invalidate() is called, or only for the length
+# of a `with memo.evaluation_pass():` block. Calls which raise aren't remembered.
+class FunctionMemo:
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError("FunctionMemo max_size must be at least 1.")
+        self._max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._wrappers: Dict[str, Tuple[Callable[..., Any], Callable[..., Any]]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # Returns a copy of the context with each pure function (marked with @pure, or named in
+    # `pure`) replaced by one that remembers its results. Binding the same function again
+    # gives the same wrapper; binding a different function under the same name forgets the
+    # results of the old one.
+    def bind(self, context: Dict[str, Any], pure: Iterable[str] = ()) -> Dict[str, Any]:
+        names = set(pure)
+        bound = dict(context)
+        for name, value in context.items():
+            if callable(value) and (name in names or is_pure(value)):
+                bound[name] = self._wrap(name, value)
+        return bound
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        existing = self._wrappers.get(name)
+        if existing is not None:
+            if func is existing[0] or func is existing[1]:
+                return existing[1]
+            self.invalidate(name)
+
+        @functools.wraps(func)
+        def memoized(*args: Any) -> Any:
+            return self._call(name, func, args)
+
+        self._wrappers[name] = (func, memoized)
+        return memoized
+
+    def _call(self, name: str, func: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        coerced = [_coerced(arg) for arg in args]
+        if None in coerced:
+            return func(*args)  # NaN is never equal to itself, so the result could never be found.
+        key = (name,) + tuple(coerced)
+        with self._lock:
+            try:
+                result = self._entries[key]
+            except KeyError:
+                pass
+            except TypeError:
+                return func(*args)  # An unhashable argument; nothing to remember it by.
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return result
+            self._misses += 1
+
+        # Call outside the lock; if two threads make the same call, both results are equal.
+        result = func(*args)
+
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return result
+
+    # Forgets the results of one function, or of every function.
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == name]:
+                    del self._entries[key]
+
+    # Forgets all results at the end of the block, so results are only shared within it,
+    # e.g. within one pass over the rules for a frame.
+    @contextmanager
+    def evaluation_pass(self) -> Iterator["FunctionMemo"]:
+        try:
+            yield self
+        finally:
+            self.invalidate()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    # Calls saved by reusing an earlier result.
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# An argument as the expression sees it: ints and floats are all numbers, so 1 and 1.0 are
+# the same argument, but true, 1 and "1" are different ones. An int too big for a float is
+# kept as it is, and NaN gives None, as it can't be a key.
+def _coerced(arg: Any) -> Optional[Tuple[type, Any]]:
+    if isinstance(arg, (int, float)) and not isinstance(arg, bool):
+        try:
+            number = float(arg)
+        except OverflowError:
+            return int, arg
+        if number != number:
+            return None
+        return float, number
+    return type(arg), arg
@@ -0,0 +1,165 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import re
+from typing import Any, Optional
+
+from .expression import (
+    BinaryOp,
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+    OpNegative,
+    OpNot,
+    OpNotEquals,
+    OpOr,
+    UnaryOp,
+    _format_numeric,
+    _make_numeric,
+)
+
+_LITERALS = (LiteralBoolean, LiteralNumber, LiteralString)
+
+# Nodes which always evaluate to a bool, so wrapping them in _make_bool() changes nothing.
+_BOOLEAN_NODES = (
+    LiteralBoolean,
+    OpAnd,
+    OpOr,
+    OpNot,
+    OpEquals,
+    OpNotEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+)
+
+_WRITABLE_NUMBER = re.compile(r'^\d+(\.\d+)?$')
+
+
+# Returns a simplified copy of the expression which evaluates to the same value:
+#   - literal-only subtrees are folded into a literal (5/5.0!=0 becomes true),
+#   - branches that can never be evaluated are dropped (false and x becomes false, 0 * x becomes 0),
+#   - boolean identities are removed (true and x, x or false, not not x become x when x is
+#     already a bool).
+# Anything which would raise an error (e.g. 1/0) is left in place so that it still raises when
+# evaluated. The original expression isn't changed, so its specificity is still available.
+def optimize(node: ExpressionNode) -> ExpressionNode:
+    if isinstance(node, BinaryOp):
+        return _optimize_binary(node)
+    if isinstance(node, UnaryOp):
+        return _optimize_unary(node)
+    if isinstance(node, FunctionCall):
+        args = [optimize(arg) for arg in node._args]
+        if any(new is not old for new, old in zip(args, node._args)):
+            return FunctionCall(node._func_name, args)
+    return node
+
+
+def _optimize_binary(node: BinaryOp) -> ExpressionNode:
+    left = optimize(node._left)
+    right = optimize(node._right)
+
+    left_value = _literal_value(left)
+    if left_value is not None:
+        # The left side decides whether the right side is ever evaluated.
+        short_circuit = _try(node._short_circuit, left_value[0])
+        if short_circuit is not None and short_circuit[0]:
+            return _fold(lambda: short_circuit[1]) or _rebuild(node, left, right)
+
+        right_value = _literal_value(right)
+        if right_value is not None:
+            folded = _fold(node._do_eval, left_value[0], right_value[0])
+            if folded is not None:
+                return folded
+
+        # true and x, false or x
+        if isinstance(node, (OpAnd, OpOr)) and isinstance(right, _BOOLEAN_NODES):
+            return right
+
+    # x and true, x or false
+    if isinstance(node, (OpAnd, OpOr)) and isinstance(right, LiteralBoolean) and isinstance(left, _BOOLEAN_NODES):
+        if right._value == isinstance(node, OpAnd):
+            return left
+
+    return _rebuild(node, left, right)
+
+
+def _optimize_unary(node: UnaryOp) -> ExpressionNode:
+    operand = optimize(node._operand)
+
+    # A negated number is how the parser reads a negative literal; it's as simple as it gets.
+    if isinstance(node, OpNegative) and isinstance(operand, LiteralNumber):
+        return node if operand is node._operand else OpNegative(operand)
+
+    operand_value = _literal_value(operand)
+    if operand_value is not None:
+        folded = _fold(node._do_eval, operand_value[0])
+        if folded is not None:
+            return folded
+
+    # not not x
+    if isinstance(node, OpNot) and isinstance(operand, OpNot) and isinstance(operand._operand, _BOOLEAN_NODES):
+        return operand._operand
+
+    if operand is node._operand:
+        return node
+    return type(node)(operand)
+
+
+def _rebuild(node: BinaryOp, left: ExpressionNode, right: ExpressionNode) -> ExpressionNode:
+    if left is node._left and right is node._right:
+        return node
+    return type(node)(left, right)
+
+
+# The value of a literal, or of a negative number literal, wrapped in a tuple so that
+# literals with falsy values aren't mistaken for None.
+def _literal_value(node: ExpressionNode) -> Optional[tuple]:
+    if isinstance(node, _LITERALS):
+        return (node._value,)
+    if isinstance(node, OpNegative) and isinstance(node._operand, LiteralNumber):
+        return (-node._operand._value,)
+    return None
+
+
+def _try(func: Any, *values: Any) -> Any:
+    try:
+        return func(*values)
+    except Exception:
+        return None
+
+
+# Evaluates an operation on literal values now, unless it raises, in which case it's left
+# for evaluate() to raise at the usual time.
+def _fold(func: Any, *values: Any) -> Optional[ExpressionNode]:
+    try:
+        return _literal(func(*values))
+    except Exception:
+        return None
+
+
+# Makes a literal node that evaluates to `value` and writes back out as valid source.
+def _literal(value: Any) -> Optional[ExpressionNode]:
+    if isinstance(value, bool):
+        return LiteralBoolean(value)
+    if isinstance(value, str):
+        return LiteralString(value)
+    if isinstance(value, (int, float)):
+        value = _make_numeric(value)
+        negative = value < 0
+        text = _format_numeric(-value if negative else value)
+        if not _WRITABLE_NUMBER.match(text):
+            return None  # e.g. inf or 1e-07, which the parser can't read back.
+        number = LiteralNumber(text)
+        # Negative numbers are parsed as a negated literal, so build them the same way.
+        return OpNegative(number) if negative else number
+    return None
@@ -0,0 +1,131 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import importlib
+import multiprocessing
+import os
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from .expression import ExpressionNode
+from .parser import Parser
+
+DEFAULT_CHUNK_SIZE = 256
+
+# A context function, or the "module:attribute" name of one to import in each worker.
+FunctionSpec = Union[Callable[..., Any], str]
+
+# Set up in each worker process by _init_worker().
+_worker: Optional["_Worker"] = None
+
+
+# Evaluates every expression against every context using a pool of worker processes, and
+# returns one list of results (one per expression) for each context, in order.
+#
+# The expressions are sent to each worker once, when it starts. Contexts are sent in chunks
+# of `chunksize`, so they should only hold values; functions are given separately in
+# `functions`, either as picklable functions (defined at the top level of a module) or as
+# "module:attribute" names which each worker imports. A context value with the same name
+# as a function takes its place.
+#
+# With workers=1 everything runs in this process. With return_exceptions=True, an expression
+# which raises gives its exception as its result, rather than stopping the whole run.
+def evaluate_many(expressions: Iterable[Union[str, ExpressionNode]],
+                  contexts: Iterable[Dict[str, Any]],
+                  workers: Optional[int] = None,
+                  chunksize: int = DEFAULT_CHUNK_SIZE,
+                  functions: Optional[Dict[str, FunctionSpec]] = None,
+                  return_exceptions: bool = False) -> List[List[Any]]:
+    return list(iter_evaluate_many(expressions, contexts, workers, chunksize, functions, return_exceptions))
+
+
+# Like evaluate_many(), but yields the results for each context as they're ready. Contexts
+# are read lazily, with only a few chunks per worker in flight, so a long stream of contexts
+# never has to be held in memory at once.
+def iter_evaluate_many(expressions: Iterable[Union[str, ExpressionNode]],
+                       contexts: Iterable[Dict[str, Any]],
+                       workers: Optional[int] = None,
+                       chunksize: int = DEFAULT_CHUNK_SIZE,
+                       functions: Optional[Dict[str, FunctionSpec]] = None,
+                       return_exceptions: bool = False) -> Iterator[List[Any]]:
+    if chunksize < 1:
+        raise ValueError("evaluate_many chunksize must be at least 1.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("evaluate_many workers must be at least 1.")
+
+    parser = Parser()
+    nodes = [parser.parse(expression) if isinstance(expression, str) else expression for expression in expressions]
+    functions = dict(functions or {})
+
+    if workers == 1:
+        worker = _Worker(nodes, functions, return_exceptions)
+        for context in contexts:
+            yield worker.evaluate(context)
+        return
+
+    with multiprocessing.Pool(workers, _init_worker, (nodes, functions, return_exceptions)) as pool:
+        pending: Deque[Any] = deque()
+        for chunk in _chunks(contexts, chunksize):
+            pending.append(pool.apply_async(_evaluate_chunk, (chunk,)))
+            # Keep the workers busy without reading every context up front.
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def _chunks(contexts: Iterable[Dict[str, Any]], chunksize: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for context in contexts:
+        chunk.append(context)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# The compiled expressions and resolved functions, built once per process.
+class _Worker:
+    def __init__(self, nodes: List[ExpressionNode], functions: Dict[str, FunctionSpec], return_exceptions: bool) -> None:
+        self._runs = [node.compile() for node in nodes]
+        self._functions = {name: _resolve(spec) for name, spec in functions.items()}
+        self._return_exceptions = return_exceptions
+
+    def evaluate(self, context: Dict[str, Any]) -> List[Any]:
+        if self._functions:
+            context = dict(self._functions, **context)
+        if not self._return_exceptions:
+            return [run(context) for run in self._runs]
+
+        results: List[Any] = []
+        for run in self._runs:
+            try:
+                results.append(run(context))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def _init_worker(nodes: List[ExpressionNode], functions: Dict[str, FunctionSpec], return_exceptions: bool) -> None:
+    global _worker
+    _worker = _Worker(nodes, functions, return_exceptions)
+
+
+def _evaluate_chunk(chunk: List[Dict[str, Any]]) -> List[List[Any]]:
+    assert _worker is not None
+    return [_worker.evaluate(context) for context in chunk]
+
+
+def _resolve(spec: FunctionSpec) -> Callable[..., Any]:
+    if not isinstance(spec, str):
+        return spec
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Function '{spec}' should be given as 'module:attribute'.")
+    target: Any = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    return target
@@ -2,7 +2,8 @@
 # Copyright (c) 2025 Ian Thomas
 
 import re
-from typing import List, Optional
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from .expression import (
     ExpressionNode,
@@ -27,179 +28,244 @@ from .expression import (
     FunctionCall,
 )
 
+if TYPE_CHECKING:
+    from .intern import Interner
+
+TOKEN_OPERATOR = "operator"
+TOKEN_KEYWORD = "keyword"
+TOKEN_IDENTIFIER = "identifier"
+TOKEN_NUMBER = "number"
+TOKEN_STRING = "string"
+TOKEN_ERROR = "error"
+
+# Each alternative is a named group, so a single match tells us the kind of token as well
+# as its text. Group order matters: keywords must be tried before identifiers, and the
+# '-' operator before negative numbers. The final group only matches where nothing else
+# does, so the scan stops at the first unrecognised character.
 TOKEN_REGEX = re.compile(r'''
-    \s*(
-        >=|<=|==|=|!=|>|<|\(|\)|,|and|&&|or|\|\||not|!  # Operators & keywords
-        | \+|\-|\/|\*                                   # Maths operators
-        | [A-Za-z_][A-Za-z0-9_]*                        # Identifiers (Variables & Functions)
-        | -?\d+\.\d+(?![A-Za-z_])                       # Floating-point numbers (supports negative)
-        | -?\d+(?![A-Za-z_])                            # Integers (supports negative)
-        | "[^"]*"                                       # Strings in double quotes
-        | '[^']*'                                       # Strings in single quotes
-        | true|false|True|False                         # Booleans
+    \s*(?:
+        (?P<operator>>=|<=|==|=|!=|>|<|\(|\)|,|&&|\|\||!|\+|\-|\/|\*)     # Operators & maths operators
+        | (?P<keyword>and|or|not)                                       # Keywords
+        | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)                        # Identifiers (Variables, Functions & Booleans)
+        | (?P<number>-?\d+\.\d+(?![A-Za-z_])|-?\d+(?![A-Za-z_]))        # Floating-point numbers & integers (supports negative)
+        | (?P<string>"[^"]*"|'[^']*')                                   # Strings in double or single quotes
+        | (?P<error>[\s\S])                                             # Anything else is an error
     )\s*
 ''', re.VERBOSE)
 
 
+class Token(NamedTuple):
+    kind: str
+    text: str
+    pos: int
+
+
+# The tokens of one call to parse() and how far through them it's got. Keeping these out of
+# the Parser means it has no state between calls, so one Parser can be shared by any number of
+# threads.
+class _Cursor:
+    __slots__ = ("tokens", "pos")
+
+    def __init__(self, tokens: List[Tuple[str, str, int]]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def match(self, *expected_tokens: str) -> bool:
+        if self.pos < len(self.tokens) and self.tokens[self.pos][1] in expected_tokens:
+            self.pos += 1
+            return True
+        return False
+
+    def consume(self, expected_token: str) -> None:
+        if self.match(expected_token):
+            return
+        if self.pos>=len(self.tokens):
+            raise SyntaxError(f"Expected '{expected_token}' but expression ended.")
+        raise SyntaxError(f"Expected '{expected_token}' but found '{self.peek()}'")
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def peek_kind(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def previous(self) -> Optional[str]:
+        return self.tokens[self.pos - 1][1] if self.pos > 0 else None
+
+    def advance(self) -> Optional[str]:
+        if self.pos < len(self.tokens):
+            self.pos += 1
+            return self.tokens[self.pos - 1][1]
+        return None
+
+    def expect(self, expected_token: str) -> str:
+        token: Optional[str] = self.advance()
+        if token != expected_token:
+            raise SyntaxError(f"Expected '{expected_token}', but found '{token}'")
+        return token
+
+    def match_identifier(self) -> Optional[str]:
+        # Keywords are also accepted as names when they appear where a term is expected.
+        if self.peek_kind() in (TOKEN_IDENTIFIER, TOKEN_KEYWORD):
+            return self.advance()
+        return None
+
+
+# Parsing is reentrant: everything about one call is in a _Cursor local to it, so a Parser can
+# be shared between threads. The trees it returns are never changed afterwards, so they can be
+# evaluated from many threads at once too.
 class Parser:
-    def __init__(self) -> None:
-        self._tokens: List[str] = []
-        self._pos: int = 0
+    def __init__(self, interner: Optional["Interner"] = None) -> None:
+        self._interner = interner
 
     def parse(self, expression: str) -> ExpressionNode:
-        self._tokens = self.tokenize(expression)
-        self._pos = 0
-        node: ExpressionNode = self._parse_or()
+        cursor = _Cursor(self._scan(expression))
+        node: ExpressionNode = self._parse_or(cursor)
+
+        if cursor.pos < len(cursor.tokens):
+            kind, text, pos = cursor.tokens[cursor.pos]
+            raise SyntaxError(f"Unexpected token '{text}' at position {pos}")
 
-        if self._pos < len(self._tokens):
-            raise SyntaxError(f"Unexpected token '{self._tokens[self._pos]}' at position {self._pos}")
+        if self._interner is not None:
+            node = self._interner.intern(node)
     
         return node
 
+    # Parses each of the sources, in order. With an executor, like a ThreadPoolExecutor, they're
+    # parsed in chunks of `chunksize` on its workers, sharing this Parser. A syntax error is
+    # raised as soon as it's found, unless `return_exceptions` is set, in which case it's put
+    # in the results in place of that expression.
+    def parse_many(self, sources: Iterable[str], executor: Optional[Executor] = None, chunksize: int = 64,
+                   return_exceptions: bool = False) -> List[Union[ExpressionNode, SyntaxError]]:
+        sources = list(sources)
+        if executor is None:
+            return self._parse_chunk(sources, return_exceptions)
+        chunks = [sources[start:start + chunksize] for start in range(0, len(sources), chunksize)]
+        futures = [executor.submit(self._parse_chunk, chunk, return_exceptions) for chunk in chunks]
+        results: List[Union[ExpressionNode, SyntaxError]] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _parse_chunk(self, sources: List[str], return_exceptions: bool) -> List[Union[ExpressionNode, SyntaxError]]:
+        if not return_exceptions:
+            return [self.parse(source) for source in sources]
+        results: List[Union[ExpressionNode, SyntaxError]] = []
+        for source in sources:
+            try:
+                results.append(self.parse(source))
+            except SyntaxError as e:
+                results.append(e)
+        return results
+
     def tokenize(self, expression: str) -> List[str]:
-        tokens: List[str] = []
-        pos: int = 0
+        return [text for kind, text, pos in self._scan(expression)]
 
-        while pos < len(expression):
-            match = TOKEN_REGEX.match(expression, pos)
-            if not match:
-                raise SyntaxError(f"Unrecognized token at position {pos}: '{expression[pos:]}'")
-            
-            token: str = match.group(0).strip()
-            if token:
-                tokens.append(token)
+    def scan(self, expression: str) -> List[Token]:
+        return [Token(kind, text, pos) for kind, text, pos in self._scan(expression)]
 
-            pos = match.end()
+    # Tokens are kept as plain (kind, text, pos) tuples internally, as they are cheaper to build.
+    def _scan(self, expression: str) -> List[Tuple[str, str, int]]:
+        tokens: List[Tuple[str, str, int]] = []
+        append = tokens.append
+
+        for match in TOKEN_REGEX.finditer(expression):
+            kind: str = match.lastgroup
+            if kind == TOKEN_ERROR:
+                pos: int = match.start()
+                raise SyntaxError(f"Unrecognized token at position {pos}: '{expression[pos:]}'")
+            append((kind, match.group(kind), match.start(kind)))
 
         return tokens
 
-    def _parse_or(self) -> ExpressionNode:
-        node: ExpressionNode = self._parse_and()
-        while self._match("or") or self._match("||"):
-            node = OpOr(node, self._parse_and())
+    def _parse_or(self, cursor: _Cursor) -> ExpressionNode:
+        node: ExpressionNode = self._parse_and(cursor)
+        while cursor.match("or") or cursor.match("||"):
+            node = OpOr(node, self._parse_and(cursor))
         return node
 
-    def _parse_and(self) -> ExpressionNode:
-        node: ExpressionNode = self._parse_binary_op()
-        while self._match("and") or self._match("&&"):
-            node = OpAnd(node, self._parse_binary_op())
+    def _parse_and(self, cursor: _Cursor) -> ExpressionNode:
+        node: ExpressionNode = self._parse_binary_op(cursor)
+        while cursor.match("and") or cursor.match("&&"):
+            node = OpAnd(node, self._parse_binary_op(cursor))
         return node
 
-    def _parse_math_add_sub(self) -> ExpressionNode:
-        node: ExpressionNode = self._parse_math_mul_div()
-        while self._match("+", "-"):
-            op: str = self._previous() or ""
+    def _parse_math_add_sub(self, cursor: _Cursor) -> ExpressionNode:
+        node: ExpressionNode = self._parse_math_mul_div(cursor)
+        while cursor.match("+", "-"):
+            op: str = cursor.previous() or ""
             if op=="+":
-                node = OpPlus(node, self._parse_math_mul_div())
+                node = OpPlus(node, self._parse_math_mul_div(cursor))
             else:
-                node = OpMinus(node, self._parse_math_mul_div())
+                node = OpMinus(node, self._parse_math_mul_div(cursor))
         return node
 
-    def _parse_math_mul_div(self) -> ExpressionNode:
-        node: ExpressionNode = self._parse_unary_op()
-        while self._match("*", "/"):
-            op: str = self._previous() or ""
+    def _parse_math_mul_div(self, cursor: _Cursor) -> ExpressionNode:
+        node: ExpressionNode = self._parse_unary_op(cursor)
+        while cursor.match("*", "/"):
+            op: str = cursor.previous() or ""
             if op=="*":
-                node = OpMultiply(node, self._parse_unary_op())
+                node = OpMultiply(node, self._parse_unary_op(cursor))
             else:
-                node = OpDivide(node, self._parse_unary_op())          
+                node = OpDivide(node, self._parse_unary_op(cursor))          
         return node
 
-    def _parse_binary_op(self) -> ExpressionNode:
-        node: ExpressionNode = self._parse_math_add_sub()
-        while self._match("==", "!=", ">", "<", ">=", "<=", "="):
-            op: str = self._previous() or ""
+    def _parse_binary_op(self, cursor: _Cursor) -> ExpressionNode:
+        node: ExpressionNode = self._parse_math_add_sub(cursor)
+        while cursor.match("==", "!=", ">", "<", ">=", "<=", "="):
+            op: str = cursor.previous() or ""
             if op == "=" or op == "==":
-                node = OpEquals(node, self._parse_math_add_sub())
+                node = OpEquals(node, self._parse_math_add_sub(cursor))
             elif op == "!=":
-                node = OpNotEquals(node, self._parse_math_add_sub())
+                node = OpNotEquals(node, self._parse_math_add_sub(cursor))
             elif op == ">":
-                node = OpGreaterThan(node, self._parse_math_add_sub())
+                node = OpGreaterThan(node, self._parse_math_add_sub(cursor))
             elif op == "<":
-                node = OpLessThan(node, self._parse_math_add_sub())
+                node = OpLessThan(node, self._parse_math_add_sub(cursor))
             elif op == ">=":
-                node = OpGreaterThanEquals(node, self._parse_math_add_sub())
+                node = OpGreaterThanEquals(node, self._parse_math_add_sub(cursor))
             elif op == "<=":
-                node = OpLessThanEquals(node, self._parse_math_add_sub())          
+                node = OpLessThanEquals(node, self._parse_math_add_sub(cursor))          
         return node
 
-    def _parse_unary_op(self) -> ExpressionNode:
-        if self._match("not") or self._match("!"):
-            return OpNot(self._parse_unary_op())
-        elif self._match("-"):
-            return OpNegative(self._parse_unary_op())
-        return self._parse_term()
+    def _parse_unary_op(self, cursor: _Cursor) -> ExpressionNode:
+        if cursor.match("not") or cursor.match("!"):
+            return OpNot(self._parse_unary_op(cursor))
+        elif cursor.match("-"):
+            return OpNegative(self._parse_unary_op(cursor))
+        return self._parse_term(cursor)
     
-    def _parse_string_literal(self) -> Optional[LiteralString]:
-        string_val = self._peek()
-        if string_val and ((string_val.startswith('"') and string_val.endswith('"')) or (string_val.startswith("'") and string_val.endswith("'"))):
-            self._advance()
+    def _parse_string_literal(self, cursor: _Cursor) -> Optional[LiteralString]:
+        if cursor.peek_kind() == TOKEN_STRING:
+            string_val: str = cursor.advance() or ""
             return LiteralString(string_val[1:-1])
         return None
     
-    def _parse_term(self) -> ExpressionNode:
-        if self._match("("):
-            node: ExpressionNode = self._parse_or()
-            self._consume(")")
+    def _parse_term(self, cursor: _Cursor) -> ExpressionNode:
+        if cursor.match("("):
+            node: ExpressionNode = self._parse_or(cursor)
+            cursor.consume(")")
             return node
-        elif self._match("true") or self._match("True"):
+        elif cursor.match("true") or cursor.match("True"):
             return LiteralBoolean(True)
-        elif self._match("false") or self._match("False"):
+        elif cursor.match("false") or cursor.match("False"):
             return LiteralBoolean(False)
-        elif re.match(r'^-?\d+(\.\d+)?$', self._peek() or ""):
-            return LiteralNumber(self._advance() or "")
+        elif cursor.peek_kind() == TOKEN_NUMBER:
+            return LiteralNumber(cursor.advance() or "")
         
-        string_val = self._parse_string_literal()
+        string_val = self._parse_string_literal(cursor)
         if string_val is not None:
             return string_val
         
-        identifier = self._match_identifier()
+        identifier = cursor.match_identifier()
         if identifier:
-            if self._match("("):
+            if cursor.match("("):
                 args = []
-                if not self._match(")"):
-                    args.append(self._parse_or())
-                    while self._match(","):
-                        args.append(self._parse_or())
-                    self._consume(")")
+                if not cursor.match(")"):
+                    args.append(self._parse_or(cursor))
+                    while cursor.match(","):
+                        args.append(self._parse_or(cursor))
+                    cursor.consume(")")
                 return FunctionCall(identifier, args)
             return Variable(identifier)
-        raise SyntaxError(f"Unexpected token: {self._peek()}")
-
-    def _match(self, *expected_tokens: str) -> bool:
-        if self._pos < len(self._tokens) and self._tokens[self._pos] in expected_tokens:
-            self._pos += 1
-            return True
-        return False
-
-    def _consume(self, expected_token: str) -> None:
-        if self._match(expected_token):
-            return
-        if self._pos>=len(self._tokens):
-            raise SyntaxError(f"Expected '{expected_token}' but expression ended.")
-        raise SyntaxError(f"Expected '{expected_token}' but found '{self._peek()}'")
-
-    def _peek(self) -> Optional[str]:
-        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
-
-    def _previous(self) -> Optional[str]:
-        return self._tokens[self._pos - 1] if self._pos > 0 else None
-
-    def _advance(self) -> Optional[str]:
-        if self._pos < len(self._tokens):
-            self._pos += 1
-            return self._tokens[self._pos - 1]
-        return None
-
-    def _expect(self, expected_token: str) -> str:
-        token: Optional[str] = self._advance()
-        if token != expected_token:
-            raise SyntaxError(f"Expected '{expected_token}', but found '{token}'")
-        return token
-
-    def _match_identifier(self) -> Optional[str]:
-        if self._pos < len(self._tokens) and re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', self._tokens[self._pos]):
-            token: str = self._tokens[self._pos]
-            self._pos += 1
-            return token
-        return None
\ No newline at end of file
+        raise SyntaxError(f"Unexpected token: {cursor.peek()}")
@@ -0,0 +1,158 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from typing import Any, Dict, List, Tuple, Type
+
+from .expression import (
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpDivide,
+    OpEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+    OpMinus,
+    OpMultiply,
+    OpNegative,
+    OpNot,
+    OpNotEquals,
+    OpOr,
+    OpPlus,
+    Variable,
+)
+from .parser import TOKEN_IDENTIFIER, TOKEN_KEYWORD, TOKEN_NUMBER, TOKEN_STRING, Parser
+
+# Binding strength of each binary operator, lowest first, matching the levels of Parser's
+# recursive descent: or, and, comparisons, + and -, * and /. All are left associative.
+_BINARY: Dict[str, Tuple[int, Type[ExpressionNode]]] = {
+    "or": (1, OpOr), "||": (1, OpOr),
+    "and": (2, OpAnd), "&&": (2, OpAnd),
+    "==": (3, OpEquals), "=": (3, OpEquals), "!=": (3, OpNotEquals),
+    ">": (3, OpGreaterThan), "<": (3, OpLessThan), ">=": (3, OpGreaterThanEquals), "<=": (3, OpLessThanEquals),
+    "+": (4, OpPlus), "-": (4, OpMinus),
+    "*": (5, OpMultiply), "/": (5, OpDivide),
+}
+
+# Prefix operators apply to the single term after them, binding tighter than any binary operator.
+_UNARY: Dict[str, Type[ExpressionNode]] = {"not": OpNot, "!": OpNot, "-": OpNegative}
+
+_BOOLEANS = {"true": True, "True": True, "false": False, "False": False}
+
+# Entries on the operator stack are tuples tagged with one of these.
+_UNARY_OP = 0     # (tag, class)
+_BINARY_OP = 1    # (tag, level, class)
+_GROUP = 2        # (tag,) for an open parenthesis
+_CALL = 3         # (tag, function name, arguments so far)
+
+
+# Parses the same language into the same trees as Parser, and raises the same syntax errors,
+# but with an operator-precedence loop over explicit stacks rather than recursive descent.
+# It takes one step per token, so time is linear in the length of the expression, and there's
+# no limit on how deeply parentheses or prefix operators can be nested.
+class PrecedenceParser(Parser):
+    def parse(self, expression: str) -> ExpressionNode:
+        node = self._parse_tokens(self._scan(expression))
+        if self._interner is not None:
+            node = self._interner.intern(node)
+        return node
+
+    def _parse_tokens(self, tokens: List[Tuple[str, str, int]]) -> ExpressionNode:
+        operands: List[ExpressionNode] = []
+        operators: List[Tuple[Any, ...]] = []
+        count = len(tokens)
+        pos = 0
+
+        while True:
+            # Expecting a term, possibly after prefix operators and open parentheses.
+            node: ExpressionNode
+            while True:
+                if pos >= count:
+                    raise SyntaxError("Unexpected token: None")
+                kind, text, _ = tokens[pos]
+                pos += 1
+                unary = _UNARY.get(text)
+                if unary is not None:
+                    operators.append((_UNARY_OP, unary))
+                elif text == "(":
+                    operators.append((_GROUP,))
+                elif text in _BOOLEANS:
+                    node = LiteralBoolean(_BOOLEANS[text])
+                    break
+                elif kind == TOKEN_NUMBER:
+                    node = LiteralNumber(text)
+                    break
+                elif kind == TOKEN_STRING:
+                    node = LiteralString(text[1:-1])
+                    break
+                elif kind == TOKEN_IDENTIFIER or kind == TOKEN_KEYWORD:
+                    if pos < count and tokens[pos][1] == "(":
+                        pos += 1
+                        if pos < count and tokens[pos][1] == ")":
+                            pos += 1
+                            node = FunctionCall(text, [])
+                            break
+                        operators.append((_CALL, text, []))
+                    else:
+                        node = Variable(text)
+                        break
+                else:
+                    raise SyntaxError(f"Unexpected token: {text}")
+
+            # After a term: finish it off, then look for an operator, a closing parenthesis or
+            # a comma. Closing a group or call finishes another term, so this can repeat.
+            while True:
+                while operators and operators[-1][0] == _UNARY_OP:
+                    node = operators.pop()[1](node)
+                operands.append(node)
+
+                if pos >= count:
+                    self._reduce(operands, operators, 0)
+                    if operators:
+                        raise SyntaxError("Expected ')' but expression ended.")
+                    return operands[0]
+
+                kind, text, token_pos = tokens[pos]
+                binary = _BINARY.get(text)
+                if binary is not None:
+                    pos += 1
+                    level, cls = binary
+                    self._reduce(operands, operators, level)
+                    operators.append((_BINARY_OP, level, cls))
+                    break
+
+                self._reduce(operands, operators, 0)
+                if not operators:
+                    raise SyntaxError(f"Unexpected token '{text}' at position {token_pos}")
+                frame = operators[-1]
+                if frame[0] == _GROUP and text == ")":
+                    pos += 1
+                    operators.pop()
+                    node = operands.pop()
+                elif frame[0] == _CALL and text == ")":
+                    pos += 1
+                    operators.pop()
+                    frame[2].append(operands.pop())
+                    node = FunctionCall(frame[1], frame[2])
+                elif frame[0] == _CALL and text == ",":
+                    pos += 1
+                    frame[2].append(operands.pop())
+                    break
+                else:
+                    raise SyntaxError(f"Expected ')' but found '{text}'")
+
+    # Builds the nodes for every binary operator on top of the stack which binds at least as
+    # tightly as `level`, which is what left associativity needs.
+    @staticmethod
+    def _reduce(operands: List[ExpressionNode], operators: List[Tuple[Any, ...]], level: int) -> None:
+        while operators:
+            top = operators[-1]
+            if top[0] != _BINARY_OP or top[1] < level:
+                return
+            operators.pop()
+            right = operands.pop()
+            operands[-1] = top[2](operands[-1], right)
@@ -0,0 +1,241 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import time
+from typing import Any, Callable, Dict, List
+
+from .expression import BinaryOp, ExpressionNode, FunctionCall, UnaryOp, _check_arguments, _check_result
+
+
+class RuleProfile:
+    def __init__(self, name: str, expression: ExpressionNode) -> None:
+        self.name = name
+        self.expression = expression
+        self.calls = 0
+        self.sampled = 0
+        self.time = 0  # Nanoseconds, over the sampled evaluations only.
+        self.errors = 0  # Sampled evaluations which raised.
+
+    @property
+    def mean(self) -> float:
+        return self.time / self.sampled if self.sampled else 0.0
+
+    # The time spent on every evaluation, sampled or not, assuming they all take the mean.
+    @property
+    def estimated_time(self) -> float:
+        return self.mean * self.calls
+
+    def __repr__(self) -> str:
+        return f"RuleProfile({self.name!r}, calls={self.calls}, sampled={self.sampled}, mean={self.mean / 1000:.2f}us, errors={self.errors})"
+
+
+class FunctionProfile:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.time = 0  # Nanoseconds inside the function, not counting its arguments.
+        self.errors = 0
+
+    @property
+    def mean(self) -> float:
+        return self.time / self.calls if self.calls else 0.0
+
+    def __repr__(self) -> str:
+        return f"FunctionProfile({self.name!r}, calls={self.calls}, mean={self.mean / 1000:.2f}us, errors={self.errors})"
+
+
+class NodeProfile:
+    def __init__(self, node: ExpressionNode, rule: str) -> None:
+        self.node = node
+        self.rule = rule  # The first rule the node was seen in; interned nodes can be shared.
+        self.calls = 0
+        self.time = 0  # Nanoseconds, including the node's children.
+        self.short_circuits = 0
+
+    # True for the operators which can skip their right-hand side: 'and', 'or' and '*'.
+    @property
+    def can_short_circuit(self) -> bool:
+        return isinstance(self.node, BinaryOp) and type(self.node)._short_circuit is not BinaryOp._short_circuit
+
+    @property
+    def short_circuit_rate(self) -> float:
+        return self.short_circuits / self.calls if self.calls else 0.0
+
+    def __repr__(self) -> str:
+        return f"NodeProfile({self.node._name}, rule={self.rule!r}, calls={self.calls}, time={self.time / 1000:.2f}us)"
+
+
+# Records where evaluation time goes: per rule, per node and per context function, plus how
+# often 'and', 'or' and '*' skip their right-hand side.
+#
+# Only 1 in `sample_rate` evaluations of each rule is profiled, starting with the first. The
+# rest run the rule's compiled form with nothing added but a counter, so a profiler can be left
+# in place in production. A sample_rate of 0 turns profiling off altogether.
+#
+# Profiled evaluations walk the tree much as evaluate() does, with the same results and errors,
+# timing each node as they go.
+class Profiler:
+    def __init__(self, sample_rate: int = 1) -> None:
+        if sample_rate < 0:
+            raise ValueError("sample_rate must be 0 or more.")
+        self.sample_rate = sample_rate
+        self._rules: Dict[str, RuleProfile] = {}
+        self._runs: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._nodes: Dict[int, NodeProfile] = {}
+        self._functions: Dict[str, FunctionProfile] = {}
+        self._rule_name = ""  # The rule being profiled.
+
+    # Returns f(context) -> value for the expression, recorded under `name`.
+    def wrap(self, name: str, expression: ExpressionNode) -> Callable[[Dict[str, Any]], Any]:
+        rule = self._rule(name, expression)
+        run = expression.compile()
+        profile = self._profile
+
+        def profiled(context: Dict[str, Any]) -> Any:
+            calls = rule.calls
+            rule.calls = calls + 1
+            rate = self.sample_rate
+            if rate and calls % rate == 0:
+                return profile(rule, context)
+            return run(context)
+        return profiled
+
+    # Evaluates the expression, recorded under `name`. Calling the result of wrap() is quicker.
+    def evaluate(self, name: str, expression: ExpressionNode, context: Dict[str, Any]) -> Any:
+        run = self._runs.get(name)
+        if run is None or self._rules[name].expression is not expression:
+            run = self._runs[name] = self.wrap(name, expression)
+        return run(context)
+
+    def rules(self) -> List[RuleProfile]:
+        return sorted(self._rules.values(), key=lambda rule: rule.mean, reverse=True)
+
+    def functions(self) -> List[FunctionProfile]:
+        return sorted(self._functions.values(), key=lambda function: function.mean, reverse=True)
+
+    def nodes(self) -> List[NodeProfile]:
+        return sorted(self._nodes.values(), key=lambda node: node.time, reverse=True)
+
+    # Clears what's been recorded, keeping the rules.
+    def reset(self) -> None:
+        for rule in self._rules.values():
+            rule.calls = rule.sampled = rule.time = rule.errors = 0
+        self._nodes.clear()
+        self._functions.clear()
+
+    # The slowest `limit` rules and functions, and the short-circuit rates, as plain data.
+    def as_dict(self, limit: int = 10) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "rules": [{
+                "name": rule.name,
+                "expression": rule.expression.write(),
+                "calls": rule.calls,
+                "sampled": rule.sampled,
+                "mean_us": rule.mean / 1000,
+                "estimated_ms": rule.estimated_time / 1e6,
+                "errors": rule.errors,
+            } for rule in self.rules()[:limit]],
+            "functions": [{
+                "name": function.name,
+                "calls": function.calls,
+                "mean_us": function.mean / 1000,
+                "total_ms": function.time / 1e6,
+                "errors": function.errors,
+            } for function in self.functions()[:limit]],
+            "short_circuits": [{
+                "rule": node.rule,
+                "expression": node.node.write(),
+                "calls": node.calls,
+                "rate": node.short_circuit_rate,
+            } for node in self.nodes() if node.can_short_circuit][:limit],
+        }
+
+    # The same as as_dict(), as text.
+    def report(self, limit: int = 10) -> str:
+        data = self.as_dict(limit)
+        rate = f"1 in {self.sample_rate}" if self.sample_rate else "no"
+        lines = [f"Slowest rules ({rate} evaluations sampled):",
+                 f"  {'rule':<24} {'calls':>10} {'sampled':>10} {'mean us':>10} {'est. ms':>10} {'errors':>8}"]
+        for rule in data["rules"]:
+            lines.append(f"  {_clip(rule['name'], 24):<24} {rule['calls']:>10} {rule['sampled']:>10} "
+                         f"{rule['mean_us']:>10.2f} {rule['estimated_ms']:>10.2f} {rule['errors']:>8}")
+        lines += ["", "Slowest functions:",
+                  f"  {'function':<24} {'calls':>10} {'mean us':>10} {'total ms':>10} {'errors':>8}"]
+        for function in data["functions"]:
+            lines.append(f"  {_clip(function['name'], 24):<24} {function['calls']:>10} "
+                         f"{function['mean_us']:>10.2f} {function['total_ms']:>10.2f} {function['errors']:>8}")
+        lines += ["", "Short circuits:",
+                  f"  {'rule':<24} {'expression':<40} {'calls':>10} {'rate':>8}"]
+        for node in data["short_circuits"]:
+            lines.append(f"  {_clip(node['rule'], 24):<24} {_clip(node['expression'], 40):<40} "
+                         f"{node['calls']:>10} {node['rate']:>8.1%}")
+        return "\n".join(lines)
+
+    def _rule(self, name: str, expression: ExpressionNode) -> RuleProfile:
+        rule = self._rules.get(name)
+        if rule is None or rule.expression is not expression:
+            rule = self._rules[name] = RuleProfile(name, expression)
+            self._runs.pop(name, None)
+        return rule
+
+    def _profile(self, rule: RuleProfile, context: Dict[str, Any]) -> Any:
+        self._rule_name = rule.name
+        start = time.perf_counter_ns()
+        try:
+            return self._evaluate(rule.expression, context)
+        except Exception:
+            rule.errors += 1
+            raise
+        finally:
+            rule.time += time.perf_counter_ns() - start
+            rule.sampled += 1
+
+    def _evaluate(self, node: ExpressionNode, context: Dict[str, Any]) -> Any:
+        stats = self._nodes.get(id(node))
+        if stats is None:
+            stats = self._nodes[id(node)] = NodeProfile(node, self._rule_name)
+        start = time.perf_counter_ns()
+        try:
+            if isinstance(node, BinaryOp):
+                left_val = self._evaluate(node._left, context)
+                short_circuit, result = node._short_circuit(left_val)
+                if short_circuit:
+                    stats.short_circuits += 1
+                    return result
+                return node._do_eval(left_val, self._evaluate(node._right, context))
+            if isinstance(node, UnaryOp):
+                return node._do_eval(self._evaluate(node._operand, context))
+            if isinstance(node, FunctionCall):
+                return self._call(node, context)
+            return node.evaluate(context)
+        finally:
+            stats.time += time.perf_counter_ns() - start
+            stats.calls += 1
+
+    def _call(self, node: FunctionCall, context: Dict[str, Any]) -> Any:
+        func_name = node._func_name
+        func = context.get(func_name)
+        if func is None:
+            raise RuntimeError(f"Function '{func_name}' not found in context.")
+
+        arg_values = [self._evaluate(arg, context) for arg in node._args]
+        _check_arguments(func_name, func, arg_values)
+
+        stats = self._functions.get(func_name)
+        if stats is None:
+            stats = self._functions[func_name] = FunctionProfile(func_name)
+        start = time.perf_counter_ns()
+        try:
+            result = func(*arg_values)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.time += time.perf_counter_ns() - start
+            stats.calls += 1
+        return _check_result(func_name, result)
+
+
+def _clip(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 3] + "..."
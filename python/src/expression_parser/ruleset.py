@@ -0,0 +1,88 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from bisect import bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .expression import ExpressionNode, _make_bool
+from .parser import Parser
+
+
+class RuleSetStats:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.queries = 0
+        self.evaluations = 0
+        self.matches = 0
+        self.skipped = 0  # Rules never evaluated because a better match had already been found.
+
+    def __repr__(self) -> str:
+        return f"RuleSetStats(queries={self.queries}, evaluations={self.evaluations}, matches={self.matches}, skipped={self.skipped})"
+
+
+class _Rule:
+    def __init__(self, expression: ExpressionNode, payload: Any) -> None:
+        self.expression = expression
+        self.payload = payload
+        self.run: Callable[[Dict[str, Any]], Any] = expression.compile()
+
+
+# A set of (expression, payload) rules, kept in order of specificity so that the best
+# match for a context can be found without evaluating every rule.
+class RuleSet:
+    def __init__(self, rules: Optional[Iterable[Tuple[Union[str, ExpressionNode], Any]]] = None) -> None:
+        self._parser = Parser()
+        self._rules: List[_Rule] = []
+        self._order: List[int] = []  # Negated specificity of each rule, for bisecting.
+        self._stats = RuleSetStats()
+        if rules is not None:
+            for expression, payload in rules:
+                self.add(expression, payload)
+
+    def add(self, expression: Union[str, ExpressionNode], payload: Any) -> None:
+        if isinstance(expression, str):
+            expression = self._parser.parse(expression)
+
+        # Most specific first; rules of equal specificity keep the order they were added in.
+        index = bisect_right(self._order, -expression.specificity)
+        self._order.insert(index, -expression.specificity)
+        self._rules.insert(index, _Rule(expression, payload))
+
+    # Returns the payloads of every matching rule, most specific first.
+    def match(self, context: Dict[str, Any]) -> List[Any]:
+        stats = self._stats
+        stats.queries += 1
+        stats.evaluations += len(self._rules)
+
+        matched = [rule.payload for rule in self._rules if _make_bool(rule.run(context))]
+        stats.matches += len(matched)
+        return matched
+
+    # Returns the payload of the most specific matching rule, or `default` if none match.
+    # As rules are sorted, the first match can't be beaten and the rest are skipped.
+    def best(self, context: Dict[str, Any], default: Any = None) -> Any:
+        stats = self._stats
+        stats.queries += 1
+
+        for index, rule in enumerate(self._rules):
+            if _make_bool(rule.run(context)):
+                stats.evaluations += index + 1
+                stats.matches += 1
+                stats.skipped += len(self._rules) - index - 1
+                return rule.payload
+
+        stats.evaluations += len(self._rules)
+        return default
+
+    @property
+    def rules(self) -> List[Tuple[ExpressionNode, Any]]:
+        return [(rule.expression, rule.payload) for rule in self._rules]
+
+    @property
+    def stats(self) -> RuleSetStats:
+        return self._stats
+
+    def __len__(self) -> int:
+        return len(self._rules)
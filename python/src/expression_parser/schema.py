@@ -0,0 +1,177 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .dependencies import find_dependencies
+from .expression import ExpressionNode, _check_result
+from .functions import accepts
+from .inference import Inference
+
+# The types a variable can be declared as. int and float are the same to expressions, as
+# numbers are.
+_TYPES: Dict[type, Tuple[type, ...]] = {
+    bool: (bool,),
+    int: (int, float),
+    float: (int, float),
+    str: (str,),
+}
+
+
+# Raised when an expression uses a name its schema doesn't declare, or calls a function with
+# a number of arguments it can't take, or when binding strictly, has a certain type error.
+class BindError(ValueError):
+    pass
+
+
+# Declares up front the variables an expression can read, with their types, and the functions
+# it can call. Each variable gets a slot, numbered in the order they're given. A function's
+# return type is taken from `returns`, or else from its return annotation, if either is one of
+# the types a variable can be; results of other types are then a TypeError.
+#
+# Binding an expression to the schema resolves each variable to its slot and each function
+# to the function itself, once, and checks every name is known. The bound expression takes a
+# sequence of values in slot order, like a tuple or list, instead of a context, so evaluating
+# it does no lookups by name and no checks of the values' types. Make the values with
+# values(), which checks them, or keep a list from it and update it in place.
+#
+#   schema = Schema({"level": float, "name": str}, {"spell_power": spell_power})
+#   run = schema.bind(parser.parse("spell_power(name) > level"))
+#   run(schema.values({"level": 3, "name": "dave"}))
+#
+# Binding also works out the type of each part of the expression (see inference.py), and
+# operators whose operands' types are known skip the runtime coercions.
+class Schema:
+    def __init__(self, variables: Optional[Dict[str, type]] = None, functions: Optional[Dict[str, Callable[..., Any]]] = None,
+                 returns: Optional[Dict[str, type]] = None) -> None:
+        self._types: List[Tuple[str, Tuple[type, ...]]] = []
+        self._declared: Dict[str, type] = {}
+        self._slots: Dict[str, int] = {}
+        for name, declared in (variables or {}).items():
+            if declared not in _TYPES:
+                raise ValueError(f"Variable '{name}' must be declared as bool, int, float or str.")
+            self._slots[name] = len(self._types)
+            self._types.append((name, _TYPES[declared]))
+            self._declared[name] = declared
+
+        self._functions: Dict[str, Callable[..., Any]] = {}
+        for name, func in (functions or {}).items():
+            if not callable(func):
+                raise ValueError(f"Function '{name}' is not callable.")
+            if name in self._slots:
+                raise ValueError(f"'{name}' is declared as both a variable and a function.")
+            self._functions[name] = func
+
+        self._returns: Dict[str, type] = {}
+        for name, func in self._functions.items():
+            declared = _return_annotation(func)
+            if declared is not None:
+                self._returns[name] = declared
+        for name, declared in (returns or {}).items():
+            if name not in self._functions:
+                raise ValueError(f"Function '{name}' has a return type but isn't in the schema.")
+            if declared not in _TYPES:
+                raise ValueError(f"Function '{name}' must be declared to return bool, int, float or str.")
+            self._returns[name] = declared
+
+    # The variable names, in slot order.
+    @property
+    def variables(self) -> List[str]:
+        return [name for name, types in self._types]
+
+    @property
+    def functions(self) -> List[str]:
+        return list(self._functions)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slots or name in self._functions
+
+    # The declared type of a variable, or None if it isn't in the schema.
+    def variable_type(self, name: str) -> Optional[type]:
+        return self._declared.get(name)
+
+    # The return type of a function, or None if it isn't known.
+    def return_type(self, name: str) -> Optional[type]:
+        return self._returns.get(name)
+
+    def slot(self, name: str) -> int:
+        slot = self._slots.get(name)
+        if slot is None:
+            raise BindError(f"Variable '{name}' is not in the schema.")
+        return slot
+
+    # Returns the function, if it takes `count` arguments.
+    def function(self, name: str, count: int) -> Callable[..., Any]:
+        func = self._functions.get(name)
+        if func is None:
+            raise BindError(f"Function '{name}' is not in the schema.")
+        if not accepts(func, count):
+            raise BindError(f"Function '{name}' does not take {count} argument{'' if count == 1 else 's'}.")
+        return func
+
+    # Returns a callable f(values) -> value, which gives the same results as evaluate() would
+    # with a context holding the same variables and functions. Every unknown name is reported
+    # at once. With strict=True, so are the errors inference finds which the expression would
+    # raise every time it's evaluated, but not those in parts which may be skipped.
+    def bind(self, expression: ExpressionNode, strict: bool = False) -> Callable[[Sequence[Any]], Any]:
+        dependencies = find_dependencies(expression)
+        unknown = sorted(f"variable '{name}'" for name in dependencies.variables if name not in self._slots)
+        unknown += sorted(f"function '{name}'" for name in dependencies.functions if name not in self._functions)
+        if unknown:
+            raise BindError(f"Not in the schema: {', '.join(unknown)}.")
+
+        inference = Inference(expression, self)
+        if strict and inference.errors:
+            raise BindError(" ".join(str(error) for error in inference.errors))
+        return expression._compile(inference)
+
+    # Returns a check for a function's results: that it has the declared return type, or if it
+    # has none, that it's one of the types expressions use.
+    def result_check(self, name: str) -> Callable[[str, Any], Any]:
+        declared = self._returns.get(name)
+        if declared is None:
+            return _check_result
+        types = _TYPES[declared]
+        def check_result(func_name: str, result: Any) -> Any:
+            if not _matches(result, types):
+                raise TypeError(f"Function '{func_name}' must return {_describe(types)}, but returned '{result}'.")
+            return result
+        return check_result
+
+    # Returns the variables from a context as a list in slot order, checking each is there and
+    # has the declared type.
+    def values(self, context: Dict[str, Any]) -> List[Any]:
+        values: List[Any] = []
+        for name, types in self._types:
+            value = context.get(name)
+            if value is None:
+                raise RuntimeError(f"Variable '{name}' not found in context.")
+            if not _matches(value, types):
+                raise TypeError(f"Variable '{name}' must be {_describe(types)}, but got '{value}'.")
+            values.append(value)
+        return values
+
+
+# Whether a value is one of the types, where a bool isn't a number.
+def _matches(value: Any, types: Tuple[type, ...]) -> bool:
+    return isinstance(value, types) and (bool in types or not isinstance(value, bool))
+
+
+def _return_annotation(func: Callable[..., Any]) -> Optional[type]:
+    try:
+        annotation = inspect.signature(func).return_annotation
+    except (TypeError, ValueError):
+        return None
+    return annotation if annotation in _TYPES else None
+
+
+def _describe(types: Tuple[type, ...]) -> str:
+    if str in types:
+        return "a string"
+    if bool in types:
+        return "a bool"
+    return "numeric"
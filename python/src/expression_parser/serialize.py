@@ -0,0 +1,349 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import mmap
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .expression import (
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpDivide,
+    OpEquals,
+    OpGreaterThan,
+    OpGreaterThanEquals,
+    OpLessThan,
+    OpLessThanEquals,
+    OpMinus,
+    OpMultiply,
+    OpNegative,
+    OpNot,
+    OpNotEquals,
+    OpOr,
+    OpPlus,
+    Variable,
+)
+
+# A binary format for parsed expressions, which loads much faster than parsing the source.
+#
+# A bundle holds any number of expressions, which share one table of strings (variable and
+# function names, and string literals) and one of numbers. Each expression is stored as
+# opcodes in post-order, so it's decoded with a stack, without recursion. All integers are
+# little-endian.
+#
+#   header    magic "EXPB", u16 version, u16 flags (0), u32 expressions, u32 strings, u32 numbers
+#   index     u32 offset of each expression's code, plus one for the end of the last
+#   strings   u32 offset of each string, plus one for the end of the last
+#   numbers   f64 for each number
+#   data      UTF-8 string data, then the code of each expression
+#
+# Offsets are from the start of the bundle. dumps() of a single expression is a bundle of one.
+
+MAGIC = b"EXPB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIII")
+_OFFSET = struct.Struct("<I")
+_NUMBER = struct.Struct("<d")
+
+# Opcodes. A binary operator's opcode is its position in _BINARY_OPS, so never reorder them;
+# add new ones at the end and bump VERSION.
+_BINARY_OPS = (OpOr, OpAnd, OpEquals, OpNotEquals, OpPlus, OpMinus, OpDivide, OpMultiply,
+               OpGreaterThan, OpLessThan, OpGreaterThanEquals, OpLessThanEquals)
+_BINARY_CODES = {cls: code for code, cls in enumerate(_BINARY_OPS)}
+_NEGATIVE = 12
+_NOT = 13
+_TRUE = 14
+_FALSE = 15
+_NUMBER_LITERAL = 16  # + number index
+_STRING_LITERAL = 17  # + string index
+_VARIABLE = 18        # + string index
+_CALL = 19            # + string index, argument count
+
+
+# Returns one expression in the binary format.
+def dumps(expression: ExpressionNode) -> bytes:
+    return dumps_bundle([expression])
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> ExpressionNode:
+    bundle = Bundle(data)
+    if len(bundle) != 1:
+        raise ValueError(f"Expected one expression, but the data holds {len(bundle)}.")
+    return bundle[0]
+
+
+def dumps_bundle(expressions: Iterable[ExpressionNode]) -> bytes:
+    encoder = _Encoder()
+    codes = [encoder.encode(expression) for expression in expressions]
+    strings = [string.encode("utf-8") for string in encoder.strings]
+
+    start = _HEADER.size + _OFFSET.size * (len(codes) + 1 + len(strings) + 1) + _NUMBER.size * len(encoder.numbers)
+    string_offsets = _offsets(start, strings)
+    code_offsets = _offsets(string_offsets[-1], codes)
+    if code_offsets[-1] > 0xFFFFFFFF:
+        raise ValueError("Too much data for one bundle.")
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, 0, len(codes), len(strings), len(encoder.numbers)))
+    for offset in code_offsets:
+        out += _OFFSET.pack(offset)
+    for offset in string_offsets:
+        out += _OFFSET.pack(offset)
+    for number in encoder.numbers:
+        out += _NUMBER.pack(number)
+    for string in strings:
+        out += string
+    for code in codes:
+        out += code
+    return bytes(out)
+
+
+def dump_bundle(expressions: Iterable[ExpressionNode], path: str) -> None:
+    with open(path, "wb") as file:
+        file.write(dumps_bundle(expressions))
+
+
+# Opens a bundle file with mmap, so that only the expressions which are used get read and
+# decoded. Close the bundle (or use it in a with block) when done.
+def load_bundle(path: str) -> "Bundle":
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return Bundle(data)
+
+
+# The expressions in a bundle, as a read-only sequence. Each is decoded on first access and
+# then kept.
+class Bundle:
+    def __init__(self, data: Any) -> None:
+        if len(data) < _HEADER.size:
+            raise ValueError("Not an expression bundle.")
+        magic, version, _, count, string_count, number_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an expression bundle.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported expression bundle version {version}.")
+
+        self._data = data
+        self._count = count
+        self._index = _HEADER.size
+        self._string_index = self._index + _OFFSET.size * (count + 1)
+        self._number_index = self._string_index + _OFFSET.size * (string_count + 1)
+        self._string_count = string_count
+        self._number_count = number_count
+        self._strings: List[Optional[str]] = [None] * string_count
+        self._expressions: List[Optional[ExpressionNode]] = [None] * count
+        self._leaves: Dict[Tuple[int, int], ExpressionNode] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> ExpressionNode:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Bundle index out of range.")
+        expression = self._expressions[index]
+        if expression is None:
+            expression = self._decode(index)
+            self._expressions[index] = expression
+        return expression
+
+    def __iter__(self) -> Iterator[ExpressionNode]:
+        for index in range(self._count):
+            yield self[index]
+
+    # Number of expressions decoded so far.
+    @property
+    def decoded(self) -> int:
+        return sum(1 for expression in self._expressions if expression is not None)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _string(self, index: int) -> str:
+        if index >= self._string_count:
+            raise ValueError("Invalid string index in expression data.")
+        string = self._strings[index]
+        if string is None:
+            start, end = self._span(self._string_index, index)
+            string = str(self._data[start:end], "utf-8")
+            self._strings[index] = string
+        return string
+
+    def _number(self, index: int) -> float:
+        if index >= self._number_count:
+            raise ValueError("Invalid number index in expression data.")
+        return _NUMBER.unpack_from(self._data, self._number_index + _NUMBER.size * index)[0]
+
+    def _span(self, table: int, index: int) -> Tuple[int, int]:
+        position = table + _OFFSET.size * index
+        start = _OFFSET.unpack_from(self._data, position)[0]
+        end = _OFFSET.unpack_from(self._data, position + _OFFSET.size)[0]
+        if not start <= end <= len(self._data):
+            raise ValueError("Invalid offset in expression data.")
+        return start, end
+
+    def _decode(self, index: int) -> ExpressionNode:
+        start, end = self._span(self._index, index)
+        code = self._data[start:end]
+        size = len(code)
+        binary_ops = _BINARY_OPS
+        leaves = self._leaves
+        stack: List[ExpressionNode] = []
+        pos = 0
+        try:
+            while pos < size:
+                op = code[pos]
+                pos += 1
+                if op < _NEGATIVE:
+                    right = stack.pop()
+                    stack[-1] = binary_ops[op](stack[-1], right)
+                    continue
+                if op == _NOT:
+                    stack[-1] = OpNot(stack[-1])
+                    continue
+                if op == _NEGATIVE:
+                    stack[-1] = OpNegative(stack[-1])
+                    continue
+                if op == _TRUE or op == _FALSE:
+                    stack.append(LiteralBoolean(op == _TRUE))
+                    continue
+                if op > _CALL:
+                    raise ValueError(f"Invalid opcode {op} in expression data.")
+
+                value = code[pos]
+                pos += 1
+                if value >= 0x80:
+                    value, pos = _read_varint(code, pos - 1)
+
+                if op == _CALL:
+                    arg_count = code[pos]
+                    pos += 1
+                    if arg_count >= 0x80:
+                        arg_count, pos = _read_varint(code, pos - 1)
+                    if arg_count > len(stack):
+                        raise IndexError()
+                    args = stack[len(stack) - arg_count:]
+                    del stack[len(stack) - arg_count:]
+                    stack.append(FunctionCall(self._string(value), args))
+                    continue
+
+                # Variables and literals are the same wherever they appear, and nodes are
+                # never modified, so each is only made once per bundle.
+                key = (op, value)
+                leaf = leaves.get(key)
+                if leaf is None:
+                    if op == _VARIABLE:
+                        leaf = Variable(self._string(value))
+                    elif op == _NUMBER_LITERAL:
+                        leaf = LiteralNumber(self._number(value))
+                    else:
+                        leaf = LiteralString(self._string(value))
+                    leaves[key] = leaf
+                stack.append(leaf)
+        except IndexError:
+            raise ValueError("Invalid expression data.") from None
+        if len(stack) != 1:
+            raise ValueError("Invalid expression data.")
+        return stack[0]
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self.numbers: List[float] = []
+        self._string_ids: Dict[str, int] = {}
+        self._number_ids: Dict[str, int] = {}
+
+    def encode(self, root: ExpressionNode) -> bytes:
+        out = bytearray()
+        stack: List[Tuple[ExpressionNode, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            children = node._children()
+            if children and not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+
+            code = _BINARY_CODES.get(type(node))
+            if code is not None:
+                out.append(code)
+            elif type(node) is Variable:
+                out.append(_VARIABLE)
+                _write_varint(out, self._string(node._name))
+            elif type(node) is LiteralNumber:
+                out.append(_NUMBER_LITERAL)
+                _write_varint(out, self._number(node._value))
+            elif type(node) is LiteralString:
+                out.append(_STRING_LITERAL)
+                _write_varint(out, self._string(node._value))
+            elif type(node) is LiteralBoolean:
+                out.append(_TRUE if node._value else _FALSE)
+            elif type(node) is OpNot:
+                out.append(_NOT)
+            elif type(node) is OpNegative:
+                out.append(_NEGATIVE)
+            elif type(node) is FunctionCall:
+                out.append(_CALL)
+                _write_varint(out, self._string(node._func_name))
+                _write_varint(out, len(node._args))
+            else:
+                raise TypeError(f"Can't serialize node of type '{type(node).__name__}'.")
+        return bytes(out)
+
+    def _string(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def _number(self, value: float) -> int:
+        key = value.hex()  # Keeps 0.0 and -0.0 apart.
+        index = self._number_ids.get(key)
+        if index is None:
+            index = self._number_ids[key] = len(self.numbers)
+            self.numbers.append(value)
+        return index
+
+
+def _offsets(start: int, blobs: List[bytes]) -> List[int]:
+    offsets = [start]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return offsets
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(code: bytes, pos: int) -> Tuple[int, int]:
+    byte = code[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = code[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
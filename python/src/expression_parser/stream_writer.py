@@ -0,0 +1,168 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .expression import (
+    BinaryOp,
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    UnaryOp,
+    Variable,
+    _QUOTES,
+    _format_numeric,
+)
+from .writer import STRING_FORMAT_SINGLEQUOTE
+
+# A stream is anything with a write(str) method, like an open file or io.StringIO, or a list,
+# which each expression's text is appended to as an item of its own, without a separator.
+Stream = Union[Any, List[str]]
+
+_BINARY = 0
+_UNARY = 1
+_CALL = 2
+_VARIABLE = 3
+_NUMBER = 4
+_STRING = 5
+_BOOLEAN = 6
+
+_KINDS = [(BinaryOp, _BINARY), (UnaryOp, _UNARY), (FunctionCall, _CALL), (Variable, _VARIABLE),
+          (LiteralNumber, _NUMBER), (LiteralString, _STRING), (LiteralBoolean, _BOOLEAN)]
+
+
+# Writes expressions as text, the same as write() does, but with its own string format rather
+# than the global Writer.string_format, so writers with different formats can be used at once
+# from different threads. write_many() streams any number of expressions out in batches.
+#
+# A list stream gets the same items from write() and write_many(): each expression's bare text.
+#
+# Expressions are written recursively by the nodes' own _write(), which is quickest in CPython
+# for the shallow trees most rules are. Any too deep for that, like long generated 'or' chains,
+# are walked with a stack instead, into a list of pieces which is joined once.
+class StreamWriter:
+    def __init__(self, string_format: int = STRING_FORMAT_SINGLEQUOTE) -> None:
+        self._string_format = string_format
+        self._quote = _QUOTES.get(string_format, "\"")
+
+    @property
+    def string_format(self) -> int:
+        return self._string_format
+
+    # Returns the expression's text, or if a stream is given, writes it there and returns None.
+    def write(self, expression: ExpressionNode, stream: Optional[Stream] = None) -> Optional[str]:
+        text = self._write(expression)
+        if stream is None:
+            return text
+        if isinstance(stream, list):
+            stream.append(text)
+        else:
+            stream.write(text)
+        return None
+
+    # Writes each expression to the stream followed by `separator`, and returns how many there
+    # were. Text is passed to the stream in batches of `batch_size` expressions. A list is given
+    # each expression's text on its own, as write() gives it, with no separator.
+    def write_many(self, expressions: Iterable[ExpressionNode], stream: Stream, separator: str = "\n", batch_size: int = 256) -> int:
+        if isinstance(stream, list):
+            count = len(stream)
+            stream.extend(self._write(expression) for expression in expressions)
+            return len(stream) - count
+
+        write = stream.write
+        pieces: List[str] = []
+        append = pieces.append
+        count = 0
+        for expression in expressions:
+            append(self._write(expression))
+            append(separator)
+            count += 1
+            if count % batch_size == 0:
+                write("".join(pieces))
+                pieces.clear()
+        if pieces:
+            write("".join(pieces))
+        return count
+
+    def _write(self, expression: ExpressionNode) -> str:
+        try:
+            return expression._write(self._quote)
+        except RecursionError:
+            pieces: List[str] = []
+            self._walk(expression, pieces.append)
+            return "".join(pieces)
+
+    def _walk(self, root: ExpressionNode, out: Callable[[str], None]) -> None:
+        quote = self._quote
+        stack: List[Any] = [root]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            item = pop()
+            if type(item) is str:
+                out(item)
+                continue
+
+            kind = _kind(item)
+            if kind == _BINARY:
+                precedence = item._precedence
+                if item._right._precedence < precedence:
+                    push(")")
+                    push(item._right)
+                    push(f" {item._op} (")
+                else:
+                    push(item._right)
+                    push(f" {item._op} ")
+                if item._left._precedence < precedence:
+                    push(")")
+                    push(item._left)
+                    out("(")
+                else:
+                    push(item._left)
+            elif kind == _UNARY:
+                if item._operand._precedence < item._precedence:
+                    push(")")
+                    push(item._operand)
+                    out(f"{item._op} (")
+                else:
+                    push(item._operand)
+                    out(f"{item._op} ")
+            elif kind == _CALL:
+                args = item._args
+                out(f"{item._func_name}(")
+                push(")")
+                for index in range(len(args) - 1, -1, -1):
+                    push(args[index])
+                    if index:
+                        push(", ")
+            elif kind == _VARIABLE:
+                out(item._name)
+            elif kind == _NUMBER:
+                out(_format_numeric(item._value))
+            elif kind == _STRING:
+                out(f"{quote}{item._value}{quote}")
+            else:
+                out("true" if item._value else "false")
+
+
+# The kind of each node class seen so far, including subclasses of the built-in ones.
+_kinds: Dict[type, int] = {}
+
+
+def _kind(node: ExpressionNode) -> int:
+    kind = _kinds.get(type(node))
+    if kind is not None:
+        return kind
+    for cls, kind in _KINDS:
+        if isinstance(node, cls):
+            _kinds[type(node)] = kind
+            return kind
+    raise TypeError(f"Can't write node of type '{type(node).__name__}'.")
+
+
+# Writes each expression to the stream on its own line. See StreamWriter.write_many().
+def write_many(expressions: Iterable[ExpressionNode], stream: Stream, string_format: int = STRING_FORMAT_SINGLEQUOTE, separator: str = "\n") -> int:
+    return StreamWriter(string_format).write_many(expressions, stream, separator)
+
@@ -0,0 +1,64 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .expression import ExpressionNode
+
+# (node, value, value, result, short-circuited), as passed to the node's _describe().
+Entry = Tuple["ExpressionNode", Any, Any, Any, bool]
+
+# An Entry with the number of the evaluation it was recorded in.
+_Step = Tuple["ExpressionNode", Any, Any, Any, bool, int]
+
+
+# Passed to evaluate() in place of a dump_eval list, records the steps of evaluations into a
+# ring which keeps the most recent `capacity` of them. Each step is a tuple of the node and its
+# values; nothing is formatted until render(), which gives the same lines as dump_eval.
+#
+# The ring is a deque with a maximum length, so recording a step is one append in C, with the
+# oldest step dropped once it's full. Each node's step is recorded once it's done, with the
+# number of the evaluation it belongs to, so every step held is a whole one and nothing else
+# takes up room in the ring.
+#
+# Strings are rendered with Writer.string_format as it is at the time of rendering.
+class Trace:
+    def __init__(self, capacity: int = 1024) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self._steps: Deque[_Step] = deque(maxlen=capacity)
+        self._evaluation = 0
+
+    # Evaluates the expression, numbering its steps so render() can pick them out. Steps from
+    # evaluating with the Trace as dump_eval count as part of the last evaluation started here.
+    def evaluate(self, expression: "ExpressionNode", context: Dict[str, Any]) -> Any:
+        self._evaluation += 1
+        return expression.evaluate(context, self)
+
+    # The steps still held, oldest first. If `evaluations` is given, only those of that many of
+    # the most recent evaluations started with Trace.evaluate(), as far as they're still held.
+    def entries(self, evaluations: Optional[int] = None) -> List[Entry]:
+        if evaluations is None:
+            first = 0
+        elif evaluations <= 0:
+            return []
+        else:
+            first = self._evaluation - evaluations + 1
+        return [step[:5] for step in self._steps if step[5] >= first]
+
+    # The steps as the lines dump_eval would have been given.
+    def render(self, evaluations: Optional[int] = None) -> List[str]:
+        return [node._describe(a, b, result, short_circuited)
+                for node, a, b, result, short_circuited in self.entries(evaluations)]
+
+    def clear(self) -> None:
+        self._steps.clear()
+
+    @property
+    def capacity(self) -> int:
+        return self._steps.maxlen
+
+    def __len__(self) -> int:
+        return len(self._steps)
@@ -0,0 +1,224 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from .expression import (
+    BinaryOp,
+    ExpressionNode,
+    FunctionCall,
+    LiteralBoolean,
+    LiteralNumber,
+    LiteralString,
+    OpAnd,
+    OpOr,
+    UnaryOp,
+    Variable,
+    _call_function,
+    _format_value,
+    _make_bool,
+)
+
+# Instructions are (opcode, a, b) tuples.
+LOAD_CONST = 0      # push a
+LOAD_VAR = 1        # push the variable named a
+LOAD_FUNC = 2       # push the function named a
+CALL = 3            # call the function below the top a values with them as arguments
+BINARY = 4          # replace the top two values with a(left, right)
+UNARY = 5           # replace the top value with a(value)
+AND_TEST = 6        # pop; if it's false, push false and jump to b
+OR_TEST = 7         # pop; if it's true, push true and jump to b
+TO_BOOL = 8         # replace the top value with it as a bool
+TEST = 9            # if a(top) short-circuits, replace top with the result and jump to b
+COMPARE_VAR = 10    # push b(variable named a[0], a[1]); LOAD_VAR, LOAD_CONST and BINARY in one
+
+_NAMES = ["LOAD_CONST", "LOAD_VAR", "LOAD_FUNC", "CALL", "BINARY", "UNARY", "AND_TEST", "OR_TEST", "TO_BOOL", "TEST", "COMPARE_VAR"]
+
+Instruction = Tuple[int, Any, Any]
+
+_LITERALS = (LiteralBoolean, LiteralNumber, LiteralString)
+
+
+# An expression compiled to a flat list of instructions for a stack machine, so evaluating it
+# needs no recursion and no Python call per node. This handles expressions of any depth, like
+# long generated 'or' chains, which are too deep for evaluate() or compile().
+#
+# Results and errors are the same as evaluate(): the operators run the nodes' own _do_eval
+# and _short_circuit, and 'and' and 'or' skip their right-hand side in the same way.
+class Program:
+    def __init__(self, expression: ExpressionNode) -> None:
+        self._code = _compile(expression)
+
+    def run(self, context: Dict[str, Any]) -> Any:
+        code = self._code
+        size = len(code)
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        while pc < size:
+            op, a, b = code[pc]
+            pc += 1
+            if op == COMPARE_VAR:
+                name, constant = a
+                value = context.get(name)
+                if value is None:
+                    raise RuntimeError(f"Variable '{name}' not found in context.")
+                if not isinstance(value, (int, float, bool, str)):
+                    raise TypeError(f"Variable '{name}' must return bool, string, or numeric.")
+                push(b(value, constant))
+            elif op == LOAD_VAR:
+                value = context.get(a)
+                if value is None:
+                    raise RuntimeError(f"Variable '{a}' not found in context.")
+                if not isinstance(value, (int, float, bool, str)):
+                    raise TypeError(f"Variable '{a}' must return bool, string, or numeric.")
+                push(value)
+            elif op == LOAD_CONST:
+                push(a)
+            elif op == BINARY:
+                right = pop()
+                stack[-1] = a(stack[-1], right)
+            elif op == AND_TEST:
+                if not _make_bool(pop()):
+                    push(False)
+                    pc = b
+            elif op == OR_TEST:
+                if _make_bool(pop()):
+                    push(True)
+                    pc = b
+            elif op == TO_BOOL:
+                stack[-1] = _make_bool(stack[-1])
+            elif op == UNARY:
+                stack[-1] = a(stack[-1])
+            elif op == LOAD_FUNC:
+                func = context.get(a)
+                if func is None:
+                    raise RuntimeError(f"Function '{a}' not found in context.")
+                push(func)
+            elif op == CALL:
+                if a:
+                    args = stack[-a:]
+                    del stack[-a:]
+                else:
+                    args = []
+                stack[-1] = _call_function(b, stack[-1], args)
+            else:
+                done, result = a(stack[-1])
+                if done:
+                    stack[-1] = result
+                    pc = b
+        return stack[-1]
+
+    __call__ = run
+
+    def __len__(self) -> int:
+        return len(self._code)
+
+    # A readable listing of the instructions, one per line.
+    def disassemble(self) -> str:
+        lines = []
+        for index, (op, a, b) in enumerate(self._code):
+            if op in (LOAD_VAR, LOAD_FUNC):
+                operand = a
+            elif op == LOAD_CONST:
+                operand = _format_value(a)
+            elif op in (BINARY, UNARY, TEST):
+                operand = a.__self__._name
+            elif op == CALL:
+                operand = f"{b} {a}"
+            elif op == COMPARE_VAR:
+                operand = f"{a[0]} {b.__self__._name} {_format_value(a[1])}"
+            else:
+                operand = ""
+            if op in (AND_TEST, OR_TEST, TEST):
+                operand = f"{operand} -> {b}".strip()
+            lines.append(f"{index:4} {_NAMES[op]:<10} {operand}".rstrip())
+        return "\n".join(lines)
+
+
+def _compile(root: ExpressionNode) -> List[Instruction]:
+    code: List[Instruction] = []
+    # Work items: (node, None) to compile a node, or (node, action) to emit the part of a
+    # node which comes after its children. Jumps are patched once their target is known.
+    work: List[Tuple[ExpressionNode, Any]] = [(root, None)]
+    while work:
+        node, action = work.pop()
+        if action is not None:
+            action(code)
+            continue
+
+        if isinstance(node, Variable):
+            code.append((LOAD_VAR, node._name, None))
+        elif isinstance(node, _LITERALS):
+            code.append((LOAD_CONST, node._value, None))
+        elif isinstance(node, FunctionCall):
+            code.append((LOAD_FUNC, node._func_name, None))
+            work.append((node, _emitter((CALL, len(node._args), node._func_name))))
+            work.extend((arg, None) for arg in reversed(node._args))
+        elif isinstance(node, UnaryOp):
+            work.append((node, _emitter((UNARY, node._do_eval, None))))
+            work.append((node._operand, None))
+        elif isinstance(node, BinaryOp):
+            jump = _Jump()
+            if type(node) is OpAnd or type(node) is OpOr:
+                work.append((node, jump.land))
+                work.append((node, _emitter((TO_BOOL, None, None))))
+                work.append((node._right, None))
+                work.append((node, jump.emitter(AND_TEST if type(node) is OpAnd else OR_TEST, None)))
+            elif type(node)._short_circuit is not BinaryOp._short_circuit:
+                work.append((node, jump.land))
+                work.append((node, _emitter((BINARY, node._do_eval, None))))
+                work.append((node._right, None))
+                work.append((node, jump.emitter(TEST, node._short_circuit)))
+            else:
+                work.append((node, _binary_emitter(node._do_eval)))
+                work.append((node._right, None))
+            work.append((node._left, None))
+        else:
+            raise TypeError(f"Can't compile node of type '{type(node).__name__}'.")
+
+    _thread_jumps(code)
+    return code
+
+
+def _emitter(instruction: Instruction) -> Callable[[List[Instruction]], None]:
+    return lambda code: code.append(instruction)
+
+
+# Emits BINARY, or folds it into the two instructions before it when they load a variable
+# and a constant, as in level>5, the most common clause. No jump ever lands between them.
+def _binary_emitter(do_eval: Callable[[Any, Any], Any]) -> Callable[[List[Instruction]], None]:
+    def emit(code: List[Instruction]) -> None:
+        if len(code) >= 2 and code[-2][0] == LOAD_VAR and code[-1][0] == LOAD_CONST:
+            constant = code.pop()[1]
+            name = code.pop()[1]
+            code.append((COMPARE_VAR, (name, constant), do_eval))
+        else:
+            code.append((BINARY, do_eval, None))
+    return emit
+
+
+# A forward jump, emitted before its target is known.
+class _Jump:
+    def __init__(self) -> None:
+        self._index = -1
+
+    def emitter(self, op: int, a: Any) -> Callable[[List[Instruction]], None]:
+        def emit(code: List[Instruction]) -> None:
+            self._index = len(code)
+            code.append((op, a, None))
+        return emit
+
+    def land(self, code: List[Instruction]) -> None:
+        op, a, _ = code[self._index]
+        code[self._index] = (op, a, len(code))
+
+
+# In a chain like a or b or c, once a is true each enclosing 'or' would test true again and
+# jump straight on, so jump to where the last of them lands instead. Same for 'and' and false.
+def _thread_jumps(code: List[Instruction]) -> None:
+    for index in range(len(code) - 1, -1, -1):
+        op, a, target = code[index]
+        if op in (AND_TEST, OR_TEST) and target < len(code) and code[target][0] == op:
+            code[index] = (op, a, code[target][2])
@@ -0,0 +1,169 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import asyncio
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.async_eval import evaluate_many_async
+
+class TestAsync(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _run(self, func, context):
+        try:
+            result = func(context)
+            if asyncio.iscoroutine(result):
+                result = asyncio.run(result)
+            return (type(result), result)
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_simple(self):
+
+        async def get_name():
+            await asyncio.sleep(0)
+            return "fred"
+
+        parser = Parser()
+        expression = parser.parse("get_name()=='fred' and counter>0 and 5/5.0!=0")
+        context = {"get_name": get_name, "counter": 1}
+
+        self.assertEqual(asyncio.run(expression.evaluate_async(context)), True)
+        context["counter"] = 0
+        self.assertEqual(asyncio.run(expression.evaluate_async(context)), False)
+
+    def test_short_circuit(self):
+
+        called = []
+
+        async def fail():
+            called.append(True)
+            return 1/0
+
+        parser = Parser()
+        context = {"fail": fail}
+
+        self.assertEqual(asyncio.run(parser.parse("false and fail()").evaluate_async(context)), False)
+        self.assertEqual(asyncio.run(parser.parse("true or fail()").evaluate_async(context)), True)
+        self.assertEqual(asyncio.run(parser.parse("0 * fail()").evaluate_async(context)), 0)
+        self.assertEqual(called, [])
+
+    def test_concurrent_arguments(self):
+
+        async def slow(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        parser = Parser()
+        context = {"slow": slow, "add": lambda a, b: a + b}
+        expression = parser.parse("add(slow(1), slow(2))")
+
+        start = time.perf_counter()
+        self.assertEqual(asyncio.run(expression.evaluate_async(context)), 3)
+        self.assertLess(time.perf_counter() - start, 0.19, "Arguments should be awaited together.")
+
+    def test_many(self):
+
+        async def slow(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        parser = Parser()
+        expressions = [parser.parse(f"slow({i})>2") for i in range(5)] + [parser.parse("1/0")]
+        context = {"slow": slow}
+
+        start = time.perf_counter()
+        results = asyncio.run(evaluate_many_async(expressions, context, return_exceptions=True))
+        self.assertLess(time.perf_counter() - start, 0.3, "Expressions should be evaluated together.")
+        self.assertEqual(results[:5], [False, False, False, True, True])
+        self.assertIsInstance(results[5], ZeroDivisionError)
+
+        with self.assertRaises(ZeroDivisionError):
+            asyncio.run(evaluate_many_async(expressions, context))
+
+    def test_errors(self):
+
+        async def get_object():
+            return []
+
+        parser = Parser()
+        context = {"get_object": get_object}
+        with self.assertRaisesRegex(TypeError, "Function 'get_object' must return bool, string, or numeric."):
+            asyncio.run(parser.parse("get_object()").evaluate_async(context))
+        with self.assertRaisesRegex(RuntimeError, "Function 'missing' not found in context."):
+            asyncio.run(parser.parse("missing()").evaluate_async(context))
+
+    def test_argument_errors(self):
+
+        # The first argument to fail gives the error, as with evaluate(), and the others stop.
+        finished = []
+
+        async def fail(delay, message):
+            await asyncio.sleep(delay)
+            raise RuntimeError(message)
+
+        async def slow(value):
+            await asyncio.sleep(0.2)
+            finished.append(value)
+            return value
+
+        async def evaluate(source, context):
+            try:
+                return await parser.parse(source).evaluate_async(context)
+            finally:
+                await asyncio.sleep(0.3)
+
+        parser = Parser()
+        context = {"fail": fail, "slow": slow, "f": lambda *args: 0}
+        for source in ["f(fail(0.1, 'first'), fail(0, 'second'))", "f(fail(0.1, 'first'), 1/0, slow(1))", "f(1, fail(0, 'first'), slow(2))"]:
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(RuntimeError, "first"):
+                    asyncio.run(evaluate(source, context))
+        self.assertEqual(finished, [])
+
+        with self.assertRaises(ZeroDivisionError):
+            asyncio.run(parser.parse("f(1/0, fail(0, 'second'))").evaluate_async(context))
+
+    def test_conformance(self):
+
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+
+        for line in source.splitlines():
+            if (line.startswith("//")):
+                continue
+
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                expected = self._run(node.evaluate, context)
+                actual = self._run(node.evaluate_async, context)
+                self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
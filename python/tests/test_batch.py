@@ -0,0 +1,135 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.functions import vectorized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestBatch(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _run(self, func):
+        try:
+            result = func()
+            if isinstance(result, np.ndarray):
+                return [(isinstance(val, bool), val) for val in result.tolist()]
+            return [(isinstance(result, bool), result)] * 3
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_simple(self):
+
+        parser = Parser()
+        expression = parser.parse("spell_power>12 and location==\"spain\"")
+
+        columns = {
+            "spell_power": np.array([5, 13, 20, 13]),
+            "location": np.array(["spain", "spain", "france", "SPAIN"]),
+        }
+
+        result = expression.evaluate_batch(columns)
+        self.assertEqual(result.tolist(), [False, True, False, False])
+
+        # The result is never one of the columns, so changing it leaves them alone.
+        result = parser.parse("spell_power").evaluate_batch(columns)
+        self.assertIsNot(result, columns["spell_power"])
+        result[0] = 99
+        self.assertEqual(columns["spell_power"].tolist(), [5, 13, 20, 13])
+
+    def test_coercion(self):
+
+        parser = Parser()
+        columns = {
+            "name": ["1", "true", "no", "5.0"],
+            "mixed": [True, 2, "3", 0.0],
+        }
+
+        self.assertEqual(parser.parse("not not name").evaluate_batch(columns).tolist(), [True, True, False, False])
+        self.assertEqual(parser.parse("mixed == 2").evaluate_batch(columns).tolist(), [True, True, False, False])
+        self.assertEqual(parser.parse("mixed * 2").evaluate_batch(columns).tolist(), [2, 4, 6, 0])
+        with self.assertRaisesRegex(TypeError, "Expecting number but got 'true'"):
+            parser.parse("name + 1").evaluate_batch(columns)
+
+    def test_short_circuit(self):
+
+        parser = Parser()
+        columns = {"d": np.array([0, 2, 0, 4])}
+
+        result = parser.parse("d != 0 and 8 / d > 2").evaluate_batch(columns)
+        self.assertEqual(result.tolist(), [False, True, False, False])
+        result = parser.parse("d * (8 / d)").evaluate_batch(columns)
+        self.assertEqual(result.tolist(), [0, 8, 0, 8])
+        with self.assertRaises(ZeroDivisionError):
+            parser.parse("8 / d").evaluate_batch(columns)
+
+    def test_functions(self):
+
+        parser = Parser()
+        calls = []
+
+        def per_row(name):
+            calls.append(name)
+            return len(name)
+
+        @vectorized
+        def power(names):
+            return np.char.str_len(names) * 2
+
+        columns = {
+            "who": np.array(["jamie", "al", "bob"]),
+            "per_row": per_row,
+            "power": power,
+        }
+
+        self.assertEqual(parser.parse("per_row(who) > 2").evaluate_batch(columns).tolist(), [True, False, True])
+        self.assertEqual(calls, ["jamie", "al", "bob"])
+        self.assertEqual(parser.parse("power(who)").evaluate_batch(columns).tolist(), [10, 4, 6])
+
+    def test_conformance(self):
+
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+
+        for line in source.splitlines():
+            if (line.startswith("//")):
+                continue
+
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                expected = self._run(lambda: node.evaluate(context))
+                actual = self._run(lambda: node.evaluate_batch(context, size=3))
+                self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.cache import ParseCache
+
+class TestParseCache(unittest.TestCase):
+
+    def test_shared(self):
+
+        cache = ParseCache()
+        first = cache.parse("character==\"dave\"")
+        second = cache.parse("character==\"dave\"")
+
+        self.assertIs(first, second, "Identical source should share one tree.")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(first.evaluate({"character": "dave"}), True)
+
+    def test_eviction(self):
+
+        cache = ParseCache(max_size=2)
+        a = cache.parse("a")
+        cache.parse("b")
+        cache.parse("a")  # a is now most recently used
+        cache.parse("c")  # evicts b
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertNotIn("b", cache)
+        self.assertIs(cache.parse("a"), a)
+
+        cache.max_size = 1
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 2)
+
+    def test_errors_not_cached(self):
+
+        cache = ParseCache()
+        with self.assertRaises(SyntaxError):
+            cache.parse("(buck")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.misses, 1)
+
+    def test_threads(self):
+
+        cache = ParseCache(max_size=8)
+        sources = [f"counter>{i % 4}" for i in range(200)]
+        results = []
+
+        def work():
+            results.append([cache.parse(source) for source in sources])
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for nodes in results:
+            for source, node in zip(sources, nodes):
+                self.assertIs(node, cache.parse(source))
+        self.assertEqual(len(cache), 4)
+
+if __name__ == "__main__":
+    unittest.main()
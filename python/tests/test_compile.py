@@ -0,0 +1,85 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+
+class TestCompile(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _run(self, func, context):
+        try:
+            result = func(context)
+            return (type(result), result)
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_simple(self):
+
+        parser = Parser()
+        expression = parser.parse("get_name()=='fred' and counter>0 and 5/5.0!=0")
+
+        context = {
+            "get_name":lambda: "fred",
+            "counter": 1
+        }
+
+        compiled = expression.compile()
+
+        self.assertEqual(compiled(context), True, "Expression should return True")
+        context["counter"] = 0
+        self.assertEqual(compiled(context), False, "Expression should return False")
+
+    def test_short_circuit(self):
+
+        parser = Parser()
+        context = {
+            "fail":lambda: 1/0
+        }
+
+        self.assertEqual(parser.parse("false and fail()").compile()(context), False)
+        self.assertEqual(parser.parse("true or fail()").compile()(context), True)
+        self.assertEqual(parser.parse("0 * fail()").compile()(context), 0)
+
+    def test_conformance(self):
+
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+
+        for line in source.splitlines():
+            if (line.startswith("//")):
+                continue
+
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                expected = self._run(node.evaluate, context)
+                actual = self._run(node.compile(), context)
+                self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()
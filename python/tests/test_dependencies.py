@@ -0,0 +1,137 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.dependencies import ReactiveEvaluator, find_dependencies
+from expression_parser.functions import volatile
+
+class TestDependencies(unittest.TestCase):
+
+    def test_find_dependencies(self):
+
+        parser = Parser()
+        dependencies = parser.parse("spell_power(\"jamie\", level)>12 and not is_day_time or 5==3").dependencies()
+        self.assertEqual(dependencies.variables, {"level", "is_day_time"})
+        self.assertEqual(dependencies.functions, {"spell_power"})
+        self.assertEqual(dependencies.names, {"level", "is_day_time", "spell_power"})
+
+        self.assertEqual(find_dependencies(parser.parse("1+2")).names, set())
+
+    def test_update(self):
+
+        evaluator = ReactiveEvaluator([
+            ("night", "not is_day_time"),
+            ("strong", "spell_power(character)>12"),
+            ("old", "time_elapsed>5"),
+        ])
+        context = {"is_day_time": True, "character": "jamie", "spell_power": lambda name: len(name) * 3, "time_elapsed": 1}
+
+        self.assertEqual(evaluator.update(context), {"night": False, "strong": True, "old": False})
+
+        context["time_elapsed"] = 7
+        self.assertEqual(evaluator.update(context, ["time_elapsed"]), {"old": True})
+        self.assertEqual(evaluator.stats.evaluations, 4)
+        self.assertEqual(evaluator.stats.skipped, 2)
+
+        # Nothing reads it, so nothing is evaluated.
+        context["level"] = 3
+        self.assertEqual(evaluator.update(context, ["level"]), {})
+        self.assertEqual(evaluator.stats.evaluations, 4)
+
+        # Re-evaluated, but the result is the same.
+        context["character"] = "gordon"
+        self.assertEqual(evaluator.update(context, ["character"]), {})
+        self.assertEqual(evaluator.stats.evaluations, 5)
+
+        # A function replaced in the context is a changed key too.
+        context["spell_power"] = lambda name: 0
+        self.assertEqual(evaluator.update(context, ["spell_power"]), {"strong": False})
+        self.assertEqual(evaluator.results, {"night": False, "strong": False, "old": True})
+        self.assertEqual(evaluator.dependents("character"), ["strong"])
+
+    def test_add_remove(self):
+
+        evaluator = ReactiveEvaluator()
+        evaluator.add("a", "x>1")
+        context = {"x": 2, "y": 0}
+        self.assertEqual(evaluator.update(context), {"a": True})
+
+        evaluator.add("a", "y>1")
+        self.assertEqual(evaluator.update(context, []), {"a": False})
+        self.assertEqual(evaluator.dependents("x"), [])
+
+        evaluator.remove("a")
+        self.assertEqual(len(evaluator), 0)
+        self.assertEqual(evaluator.update(context, ["y"]), {})
+
+        # Only expressions which are there can be invalidated, and a bad key doesn't stop updates.
+        with self.assertRaises(KeyError):
+            evaluator.invalidate("a")
+        evaluator.add("b", "x>1")
+        self.assertEqual(evaluator.update(context), {"b": True})
+        evaluator.invalidate("b")
+        self.assertEqual(evaluator.update(context, []), {})
+        self.assertEqual(evaluator.stats.evaluations, 4)
+
+    def test_volatile(self):
+
+        rolls = iter([1, 6, 6])
+
+        @volatile
+        def roll():
+            return next(rolls)
+
+        evaluator = ReactiveEvaluator([("six", "roll()==6"), ("x", "x")])
+        context = {"roll": roll, "x": 1}
+        self.assertEqual(evaluator.update(context), {"six": False, "x": 1})
+        self.assertEqual(evaluator.update(context, []), {"six": True})
+        self.assertEqual(evaluator.update(context, []), {})
+
+        clock = iter([1, 2])
+        evaluator = ReactiveEvaluator([("now", "now()")], volatile=["now"])
+        context = {"now": lambda: next(clock)}
+        self.assertEqual(evaluator.update(context), {"now": 1})
+        self.assertEqual(evaluator.update(context, []), {"now": 2})
+
+    def test_errors(self):
+
+        evaluator = ReactiveEvaluator([("a", "10/x")])
+        context = {"x": 0}
+        self.assertEqual(evaluator.update(context), {})
+        self.assertIn("a", evaluator.errors)
+        with self.assertRaises(ZeroDivisionError):
+            evaluator["a"]
+
+        context["x"] = 5
+        self.assertEqual(evaluator.update(context, ["x"]), {"a": 2})
+        self.assertEqual(evaluator["a"], 2)
+        self.assertEqual(evaluator.errors, {})
+
+    def test_matches_full_evaluation(self):
+
+        rng = random.Random(10)
+        names = ["a", "b", "c", "d", "e"]
+        ops = ["+", "-", "*", "==", "!=", "<", ">", "and", "or"]
+        sources = [f"{rng.choice(names)} {rng.choice(ops)} {rng.choice(names)} {rng.choice(ops)} {rng.choice(names)}" for _ in range(50)]
+
+        parser = Parser()
+        context = {name: rng.randint(0, 3) for name in names}
+        evaluator = ReactiveEvaluator(enumerate(sources))
+        evaluator.update(context)
+        for _ in range(20):
+            changed = rng.sample(names, 2)
+            for name in changed:
+                context[name] = rng.randint(0, 3)
+            evaluator.update(context, changed)
+            for key, source in enumerate(sources):
+                self.assertEqual(evaluator[key], parser.parse(source).evaluate(context), source)
+
+if __name__ == "__main__":
+    unittest.main()
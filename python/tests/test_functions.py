@@ -0,0 +1,71 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import gc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser import functions
+from expression_parser.functions import arity, register_functions
+
+class TestFunctions(unittest.TestCase):
+
+    def test_arity(self):
+
+        def defaults(a, b=1, *, c=2):
+            return a
+
+        def keyword_only(a, *, c):
+            return a
+
+        self.assertEqual(arity(lambda: 1), (0, 0))
+        self.assertEqual(arity(defaults), (1, 2))
+        self.assertEqual(arity(lambda *args: 1), (0, float("inf")))
+        self.assertEqual(arity(keyword_only), (float("inf"), 0))
+        self.assertEqual(arity(max), None)
+
+    def test_errors(self):
+
+        parser = Parser()
+        expression = parser.parse("get_name(\"jim\")")
+        context = {"get_name": lambda: "fred"}
+
+        for run in (expression.evaluate, expression.compile()):
+            with self.assertRaisesRegex(RuntimeError, r"Function 'get_name' does not support the provided arguments \('jim'\)."):
+                run(context)
+
+        # Replacing a function re-checks it, even though the name is the same.
+        context["get_name"] = lambda name: name
+        self.assertEqual(expression.evaluate(context), "jim")
+
+    def test_builtins(self):
+
+        parser = Parser()
+        context = {"max": max, "abs": abs}
+        register_functions(context)
+        self.assertEqual(parser.parse("max(1, 5, 3) + abs(-2)").evaluate(context), 7)
+
+    def test_forget(self):
+
+        func = lambda a: a
+        arity(func)
+        key = id(func)
+        self.assertIn(key, functions._arities)
+        del func
+        gc.collect()
+        self.assertNotIn(key, functions._arities)
+
+        # Those that can't be weakly referenced are held, but only so many of them.
+        methods = [(1000 + i).__add__ for i in range(functions.MAX_HELD_ARITIES + 10)]
+        for method in methods:
+            self.assertEqual(arity(method), (1, 1))
+        self.assertEqual(len(functions._held_arities), functions.MAX_HELD_ARITIES)
+        self.assertNotIn(id(methods[0]), functions._held_arities)
+        self.assertIn(id(methods[-1]), functions._held_arities)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.index import RuleIndex
+
+class TestRuleIndex(unittest.TestCase):
+
+    def test_match(self):
+
+        index = RuleIndex([
+            ("location==\"spain\" and is_day_time", "spain"),
+            ("\"france\"==location", "france"),
+            ("level>=10 and level<20", "mid"),
+            ("30<level", "high"),
+            ("is_day_time", "day"),
+        ])
+        context = {"location": "spain", "is_day_time": True, "level": 12}
+
+        self.assertEqual(index.match(context), ["spain", "mid", "day"])
+        self.assertEqual(index.candidates(context), [0, 2, 4])
+        self.assertEqual(index.stats.pruned, 2)
+
+        context = {"location": "france", "is_day_time": False, "level": 31}
+        self.assertEqual(index.match(context), ["france", "high"])
+
+    def test_coercion(self):
+
+        index = RuleIndex([
+            ("flag==\"true\"", "flag"),
+            ("count==\"5\"", "count"),
+            ("name==5", "name"),
+            ("5==name", "name5"),
+        ])
+
+        self.assertEqual(index.match({"flag": True, "count": 5, "name": "7"}), ["flag", "count"])
+        self.assertEqual(index.match({"flag": False, "count": 4, "name": "5.0"}), ["name", "name5"])
+        self.assertEqual(index.candidates({"flag": True, "count": 1, "name": "5"}), [0, 3])
+        with self.assertRaises(TypeError):
+            index.match({"flag": False, "count": 4, "name": "x"})
+
+    def test_random(self):
+
+        rng = random.Random(42)
+        values = [True, False, 0, 1, 2.5, 5, "a", "b", "1", "true", "5"]
+        literals = ["true", "false", "0", "1", "2.5", "5", "'a'", "'b'", "'1'", "'true'", "'5'"]
+        names = ["x", "y", "z"]
+        ops = ["==", ">", "<", ">=", "<="]
+
+        def clause():
+            name, op, literal = rng.choice(names), rng.choice(ops), rng.choice(literals)
+            return f"{name}{op}{literal}" if rng.random() < 0.5 else f"{literal}{op}{name}"
+
+        index = RuleIndex((" and ".join(clause() for _ in range(rng.randint(1, 3))), i) for i in range(300))
+
+        for _ in range(200):
+            context = {name: rng.choice(values) for name in names}
+            candidates = set(index.candidates(context))
+            for rule_id, (expression, _) in enumerate(index.rules):
+                try:
+                    matched = bool(expression.evaluate(context))
+                except Exception:
+                    continue
+                if matched:
+                    self.assertIn(rule_id, candidates, expression.write())
+
+if __name__ == "__main__":
+    unittest.main()
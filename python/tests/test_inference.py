@@ -0,0 +1,166 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.inference import BOOL, NUMBER, STRING, infer
+from expression_parser.schema import BindError, Schema
+
+def count(name: str) -> int:
+    return len(name)
+
+class TestInference(unittest.TestCase):
+
+    def _result(self, run, *args):
+        try:
+            return run(*args)
+        except Exception as e:
+            return type(e), str(e)
+
+    def test_types(self):
+
+        parser = Parser()
+        schema = Schema({"level": int, "name": str, "awake": bool}, {"count": count, "upper": str.upper}, {"upper": str})
+        self.assertEqual(schema.return_type("count"), int)
+
+        for source, without, with_schema in [
+            ("1 + level", NUMBER, NUMBER),
+            ("-level * 2", NUMBER, NUMBER),
+            ("'a'", STRING, STRING),
+            ("name", None, STRING),
+            ("upper(name)", None, STRING),
+            ("count(name)", None, NUMBER),
+            ("awake", None, BOOL),
+            ("not name", BOOL, BOOL),
+            ("level > 3 or name", BOOL, BOOL),
+        ]:
+            with self.subTest(source=source):
+                self.assertEqual(infer(parser.parse(source)).type, without)
+                self.assertEqual(parser.parse(source).infer(schema).type, with_schema)
+
+        node = parser.parse("count(name) >= level and awake")
+        inference = infer(node, schema)
+        self.assertEqual(inference.type_of(node._left._left), NUMBER)
+        self.assertTrue(inference.numeric(node._left))
+        self.assertTrue(inference.boolean(node))
+        self.assertTrue(inference.matching(node))
+        node = parser.parse("'a' == 1")
+        self.assertFalse(infer(node).matching(node))
+        with self.assertRaises(KeyError):
+            inference.type_of(parser.parse("x"))
+
+    def test_errors(self):
+
+        # Each error found is the one evaluating the node always raises.
+        parser = Parser()
+        schema = Schema({"level": float, "name": str}, {"count": count})
+        context = {"level": 4, "name": "dave", "count": count}
+        for source, found in [
+            ("'abc' > 1", 1),
+            ("level <= 'x' + 1", 1),
+            ("-'x'", 1),
+            ("level / 0", 1),
+            ("level == 'x'", 1),
+            ("2 * 'x'", 1),
+            ("count(name, 2) > 1", 1),
+            ("'5' > 1", 0),
+            ("name == 5", 0),
+            ("0 * 'x'", 0),
+            ("level * 'x'", 0),
+            ("name > 1", 0),
+        ]:
+            with self.subTest(source=source):
+                node = parser.parse(source)
+                errors = infer(node, schema).errors
+                self.assertEqual(len(errors), found)
+                if errors:
+                    raised = self._result(errors[0].node.evaluate, context)
+                    self.assertTrue(raised[1].startswith(errors[0].message[:-1]), raised[1])
+                    with self.assertRaises(BindError) as bind_error:
+                        schema.bind(node, strict=True)
+                    self.assertEqual(str(bind_error.exception), str(errors[0]))
+
+        self.assertEqual(str(infer(parser.parse("1 < 'abc'")).errors[0]), "1 < 'abc': Type mismatch: Expecting number but got 'abc'")
+
+        # Errors in parts which can be skipped aren't certain, so binding strictly allows them.
+        schema = Schema({"on": bool, "level": float})
+        for source, found, possible in [
+            ("on or 'abc' > 1", 0, 1),
+            ("on and -'x' < 1", 0, 1),
+            ("level * ('x' + 1) > 1", 0, 1),
+            ("2 * ('x' + 1) > 1", 1, 0),
+            ("('abc' > 1) or on", 1, 0),
+            ("not (on or (level / 0 > 1 and 'x' < 2))", 0, 2),
+        ]:
+            with self.subTest(source=source):
+                node = parser.parse(source)
+                inference = infer(node, schema)
+                self.assertEqual((len(inference.errors), len(inference.possible_errors)), (found, possible))
+                if not found:
+                    run = schema.bind(node, strict=True)
+                    for on, level in [(True, 0), (False, 0), (True, 2)]:
+                        self.assertEqual(self._result(run, [on, level]), self._result(node.evaluate, {"on": on, "level": level}))
+        with self.assertRaises(TypeError):
+            parser.parse("on or 'abc' > 1").evaluate({"on": False})
+        self.assertEqual(infer(parser.parse("f(1) + x")).errors, [])
+
+    def test_fast_paths(self):
+
+        # Bound with known types, every operator gives the same results and errors as evaluate().
+        parser = Parser()
+        schema = Schema({"n": float, "m": int, "b": bool, "s": str}, {"count": count, "half": lambda x: x / 2}, {"half": float})
+        operands = ["n", "m", "b", "s", "count(s)", "half(m)", "0", "2.5", "'3'", "'x'", "true"]
+        operators = ["and", "or", "==", "!=", "+", "-", "*", "/", ">", "<", ">=", "<="]
+        contexts = [
+            {"n": 2.5, "m": 0, "b": True, "s": "3"},
+            {"n": 0.0, "m": 7, "b": False, "s": "true"},
+            {"n": -1, "m": 2, "b": True, "s": "x"},
+        ]
+        for context in contexts:
+            context.update(count=count, half=lambda x: x / 2)
+
+        checked = 0
+        for op in operators:
+            for left in operands:
+                for right in operands:
+                    node = parser.parse(f"{left} {op} {right}")
+                    run = schema.bind(node)
+                    for context in contexts:
+                        expected = self._result(node.evaluate, context)
+                        self.assertEqual(self._result(run, schema.values(context)), expected, node.write())
+                        checked += 1
+            for operand in operands:
+                for source in [f"-{operand}", f"not {operand}"]:
+                    node = parser.parse(source)
+                    run = schema.bind(node)
+                    for context in contexts:
+                        self.assertEqual(self._result(run, schema.values(context)), self._result(node.evaluate, context), source)
+        self.assertGreater(checked, 4000)
+
+        self.assertEqual(schema.bind(parser.parse("n + m")).__name__, "op_plus_numbers")
+        self.assertEqual(schema.bind(parser.parse("n + s")).__name__, "op_plus")
+        self.assertEqual(schema.bind(parser.parse("b and not b")).__name__, "op_and_bools")
+        self.assertEqual(schema.bind(parser.parse("s == 'x'")).__name__, "op_equals_same")
+
+    def test_returns(self):
+
+        # A function with a declared return type must keep to it.
+        parser = Parser()
+        schema = Schema({"s": str}, {"f": lambda s: len(s) * 1.5, "g": lambda s: s}, {"f": float, "g": float})
+        self.assertTrue(schema.bind(parser.parse("f(s) > 4"))(["dave"]))
+        with self.assertRaises(TypeError) as raised:
+            schema.bind(parser.parse("g(s) > 4"))(["10"])
+        self.assertEqual(str(raised.exception), "Function 'g' must return numeric, but returned '10'.")
+
+        with self.assertRaises(ValueError):
+            Schema({}, {"f": count}, {"g": int})
+        with self.assertRaises(ValueError):
+            Schema({}, {"f": count}, {"f": list})
+
+if __name__ == "__main__":
+    unittest.main()
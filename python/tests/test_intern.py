@@ -0,0 +1,68 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.intern import Interner, SharedEvaluator
+
+class TestIntern(unittest.TestCase):
+
+    def test_sharing(self):
+
+        interner = Interner()
+        parser = Parser(interner=interner)
+        first = parser.parse("is_day_time and spell_power(\"jamie\")>12")
+        second = parser.parse("spell_power(\"jamie\")>12 or is_day_time")
+        third = parser.parse("is_day_time and spell_power(\"jamie\")>12")
+
+        self.assertIs(first, third)
+        self.assertIs(first._left, second._right)
+        self.assertIs(first._right, second._left)
+        self.assertEqual(second.write(), "spell_power('jamie') > 12 or is_day_time")
+        self.assertEqual(interner.unique, 7)
+        self.assertGreater(interner.bytes_saved, 0)
+
+    def test_distinct(self):
+
+        parser = Parser(interner=Interner())
+        self.assertIsNot(parser.parse("1"), parser.parse("true"))
+        self.assertIsNot(parser.parse("'1'"), parser.parse("1"))
+        self.assertIsNot(parser.parse("a == b"), parser.parse("a = b and c"))
+
+    def test_shared_evaluation(self):
+
+        calls = []
+        context = {
+            "is_day_time": True,
+            "spell_power": lambda name: calls.append(name) or 13
+        }
+
+        parser = Parser(interner=Interner())
+        expressions = [
+            parser.parse("is_day_time and spell_power(\"jamie\")>12"),
+            parser.parse("spell_power(\"jamie\")>12 or is_day_time"),
+            parser.parse("not (is_day_time and spell_power(\"jamie\")>12)"),
+            parser.parse("missing or spell_power(\"jamie\")>12"),
+            parser.parse("missing"),
+        ]
+
+        evaluator = SharedEvaluator(context)
+        self.assertEqual(evaluator.evaluate_all(expressions[:3]), [True, True, False])
+        self.assertEqual(calls, ["jamie"])
+        self.assertGreater(evaluator.reused, 0)
+        with self.assertRaisesRegex(RuntimeError, "Variable 'missing' not found in context."):
+            evaluator.evaluate(expressions[3])
+        raised = []
+        for _ in range(2):
+            with self.assertRaisesRegex(RuntimeError, "Variable 'missing' not found in context.") as error:
+                evaluator.evaluate(expressions[4])
+            raised.append(error.exception)
+        self.assertIsNot(raised[0], raised[1])
+
+if __name__ == "__main__":
+    unittest.main()
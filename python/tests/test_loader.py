@@ -0,0 +1,102 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import io
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.loader import load, load_parallel
+
+class TestLoader(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _expected(self, source):
+        parser = Parser()
+        expected = []
+        for line_no, line in enumerate(source.splitlines(), 1):
+            if not line or line.startswith("//"):
+                continue
+            try:
+                expected.append((line_no, parser.parse(line).dump_structure()))
+            except SyntaxError as e:
+                expected.append((line_no, str(e)))
+        return expected
+
+    def _results(self, loaded):
+        return [(line_no, str(result) if isinstance(result, SyntaxError) else result.dump_structure()) for line_no, result in loaded]
+
+    def test_parse_file(self):
+
+        # Every line of Parse.txt, with the bad ones giving their errors in place.
+        expected = self._expected(self._load_file("Parse.txt"))
+        loaded = list(load("../tests/Parse.txt"))
+        self.assertEqual(self._results(loaded), expected)
+        self.assertTrue(any(isinstance(result, SyntaxError) for line_no, result in loaded))
+
+    def test_stream(self):
+
+        source = "// Comment\r\na > 1\r\n\r\nand and\r\nf(b, 'c')\r\n)\nnot d"
+        loaded = load(io.StringIO(source, newline=""))
+        self.assertEqual(next(loaded)[0], 2)
+        self.assertEqual(self._results(loaded), self._expected(source.replace("\r", ""))[1:])
+
+        loaded = list(load(["x == 1\n", "y ==\n", "z\n"]))
+        self.assertEqual([line_no for line_no, result in loaded], [1, 2, 3])
+        self.assertIsInstance(loaded[1][1], SyntaxError)
+
+    def test_deep(self):
+
+        # A line too deep to parse is an error for that line only.
+        lines = ["a > 1", "(" * 5000 + "b" + ")" * 5000, "not c"]
+        loaded = list(load(line + "\n" for line in lines))
+        self.assertEqual([line_no for line_no, result in loaded], [1, 2, 3])
+        self.assertIsInstance(loaded[1][1], SyntaxError)
+        self.assertEqual(str(loaded[1][1]), "Expression is nested too deeply to parse")
+        self.assertEqual(loaded[2][1].write(), "not c")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rules.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines))
+            for workers in (1, 2):
+                with self.subTest(workers=workers):
+                    self.assertEqual(self._results(load_parallel(path, workers, 10)), self._results(loaded))
+
+    def test_parallel(self):
+
+        lines = ["// Generated"]
+        for i in range(400):
+            lines.append(f"level{i} > {i} and name == 'n{i}'" if i % 37 else f"broken {i} (")
+            if i % 50 == 0:
+                lines.append("")
+        source = "\r\n".join(lines)
+        expected = self._expected(source)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rules.txt")
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write(source)
+
+            self.assertEqual(self._results(load(path)), expected)
+            for workers, chunk_bytes in [(1, 1), (1, 300), (2, 1000), (3, 1 << 20)]:
+                with self.subTest(workers=workers, chunk_bytes=chunk_bytes):
+                    self.assertEqual(self._results(load_parallel(path, workers, chunk_bytes)), expected)
+
+            with self.assertRaises(ValueError):
+                list(load_parallel(path, chunk_bytes=0))
+            with self.assertRaises(ValueError):
+                list(load_parallel(path, workers=0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.functions import pure
+from expression_parser.memo import FunctionMemo
+
+class TestFunctionMemo(unittest.TestCase):
+
+    def test_memoized(self):
+
+        calls = []
+
+        @pure
+        def spell_power(name):
+            calls.append(name)
+            return len(name) * 3
+
+        def get_name():
+            calls.append("get_name")
+            return "jamie"
+
+        parser = Parser()
+        memo = FunctionMemo()
+        context = memo.bind({"spell_power": spell_power, "get_name": get_name, "level": 2})
+
+        expressions = [parser.parse(source) for source in [
+            "spell_power(\"jamie\")>12",
+            "spell_power(get_name())>level",
+            "spell_power(\"dave\")>12",
+        ]]
+        for _ in range(2):
+            self.assertEqual([expression.evaluate(context) for expression in expressions], [True, True, False])
+
+        # get_name isn't pure, so it's called every time.
+        self.assertEqual(calls, ["jamie", "get_name", "dave", "get_name"])
+        self.assertEqual(memo.hits, 4)
+        self.assertEqual(memo.misses, 2)
+
+        memo.invalidate("spell_power")
+        expressions[0].evaluate(context)
+        self.assertEqual(calls[-1], "jamie")
+
+    def test_argument_types(self):
+
+        memo = FunctionMemo()
+        context = memo.bind({"kind": lambda value: type(value).__name__}, pure=["kind"])
+        parser = Parser()
+
+        self.assertEqual(parser.parse("kind(1)").evaluate(context), "float")
+        self.assertEqual(parser.parse("kind(\"1\")").evaluate(context), "str")
+        self.assertEqual(parser.parse("kind(true)").evaluate(context), "bool")
+        self.assertEqual(memo.misses, 3)
+
+        # A number is the same argument whether it's an int or a float.
+        context["three"] = lambda: 3
+        self.assertEqual(parser.parse("kind(3)").evaluate(context), "float")
+        self.assertEqual(parser.parse("kind(three())").evaluate(context), "float")
+        self.assertEqual((memo.hits, memo.misses), (1, 4))
+
+    def test_unusual_numbers(self):
+
+        # An int too big for a float is still remembered; NaN never is, as it equals nothing.
+        calls = []
+        def kind(value):
+            calls.append(value)
+            return type(value).__name__
+
+        memo = FunctionMemo()
+        context = memo.bind({"kind": kind, "big": 10 ** 400, "nan": float("nan")}, pure=["kind"])
+        parser = Parser()
+        for _ in range(2):
+            self.assertEqual(parser.parse("kind(big)").evaluate(context), "int")
+            self.assertEqual(parser.parse("kind(nan)").evaluate(context), "float")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual((memo.hits, memo.misses, len(memo)), (1, 1, 1))
+
+    def test_arguments_checked(self):
+
+        memo = FunctionMemo()
+        context = memo.bind({"get_name": pure(lambda: "fred")})
+        with self.assertRaisesRegex(RuntimeError, "does not support the provided arguments"):
+            Parser().parse("get_name(1)").evaluate(context)
+
+    def test_evaluation_pass(self):
+
+        counter = [0]
+
+        @pure
+        def count():
+            counter[0] += 1
+            return counter[0]
+
+        memo = FunctionMemo()
+        context = memo.bind({"count": count})
+        expression = Parser().parse("count()")
+
+        with memo.evaluation_pass():
+            self.assertEqual(expression.evaluate(context), 1)
+            self.assertEqual(expression.evaluate(context), 1)
+        with memo.evaluation_pass():
+            self.assertEqual(expression.evaluate(context), 2)
+        self.assertEqual(len(memo), 0)
+
+    def test_rebind(self):
+
+        memo = FunctionMemo()
+        first = memo.bind({"f": pure(lambda: 1)})
+        self.assertIs(memo.bind(first)["f"], first["f"], "Binding a bound context should change nothing.")
+
+        Parser().parse("f()").evaluate(first)
+        second = memo.bind({"f": pure(lambda: 2)})
+        self.assertEqual(Parser().parse("f()").evaluate(second), 2)
+
+    def test_eviction(self):
+
+        memo = FunctionMemo(max_size=2)
+        context = memo.bind({"double": pure(lambda x: x * 2)})
+        parser = Parser()
+        for source in ["double(1)", "double(2)", "double(3)", "double(1)"]:
+            parser.parse(source).evaluate(context)
+        self.assertEqual(memo.evictions, 2)
+        self.assertEqual(memo.hits, 0)
+
+        with self.assertRaises(ValueError):
+            FunctionMemo(max_size=0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import pickle
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser import expression
+from expression_parser.expression import ExpressionNode, LiteralBoolean, LiteralNumber, Variable
+from expression_parser.parser import Parser
+
+class TestNodes(unittest.TestCase):
+
+    def _node_classes(self):
+        found = []
+        work = [ExpressionNode]
+        while work:
+            cls = work.pop()
+            found.append(cls)
+            work.extend(cls.__subclasses__())
+        return [cls for cls in found if cls.__module__ == expression.__name__]
+
+    def test_slots(self):
+
+        for cls in self._node_classes():
+            with self.subTest(cls=cls.__name__):
+                self.assertIn("__slots__", cls.__dict__)
+
+        node = Parser().parse("not f(a, 'x') or -b * 2.5 >= c")
+        work = [node]
+        while work:
+            current = work.pop()
+            self.assertFalse(hasattr(current, "__dict__"), type(current).__name__)
+            work.extend(current._children())
+
+        self.assertEqual((node._name, node._op, node._precedence, node.specificity), ("Or", "or", 40, 1))
+        self.assertEqual(node._left._name, "Not")
+        self.assertEqual(node._right._left._left._operand._name, "b")
+
+    def test_shared_literals(self):
+
+        parser = Parser()
+        first = parser.parse("a == true and b > 5")
+        second = parser.parse("c == true or d > 5.0")
+        self.assertIs(first._left._right, second._left._right)
+        self.assertIs(first._right._right, second._right._right)
+        self.assertIs(LiteralBoolean(False), LiteralBoolean(False))
+        self.assertIs(pickle.loads(pickle.dumps(LiteralNumber("255"))), LiteralNumber("255"))
+
+        # Only values which are exactly the same are shared.
+        self.assertIsNot(LiteralNumber("2.5"), LiteralNumber("2.5"))
+        self.assertIsNot(LiteralNumber("256"), LiteralNumber("256"))
+        self.assertIsNot(LiteralNumber("-0"), LiteralNumber("0"))
+        self.assertEqual(LiteralNumber("-0").write(), "0")
+        self.assertIs(LiteralBoolean(1)._value, 1)
+        self.assertIs(LiteralBoolean(True)._value, True)
+
+        self.assertIs(Variable("".join(["le", "vel"]))._name, Variable("level")._name)
+
+if __name__ == "__main__":
+    unittest.main()
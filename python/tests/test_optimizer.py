@@ -0,0 +1,129 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+
+class TestOptimizer(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _run(self, node, context):
+        try:
+            result = node.evaluate(context)
+            return (isinstance(result, bool), result)
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_simple(self):
+
+        parser = Parser()
+        cases = [
+            ("true and x", "true and x"),
+            ("true and x>1", "x > 1"),
+            ("x>1 and true", "x > 1"),
+            ("x>1 or false", "x > 1"),
+            ("false and get_cost()", "false"),
+            ("true or get_cost()", "true"),
+            ("5/5.0!=0", "true"),
+            ("get_name()=='fred' and counter>0 and 5/5.0!=0", "get_name() == 'fred' and counter > 0"),
+            ("not not flag", "not not flag"),
+            ("not not (flag==1)", "flag == 1"),
+            ("0 * get_cost()", "0"),
+            ("get_cost() * 0", "get_cost() * 0"),
+            ("(2 - 7) * x", "- 5 * x"),
+            ("x - (2 - 7)", "x - - 5"),
+            ("-(2 + 3)", "- 5"),
+            ("-(1 * 1) + x", "- 1 + x"),
+            ("1 / 0 or x", "1 / 0 or x"),
+            ("f(1 + 2, not true)", "f(3, false)"),
+            ("'a' + 1", "'a' + 1"),
+            ("1 / 3", "0.3333333333333333"),
+            ("1 / 10000000", "1 / 10000000"),
+        ]
+        for source, expected in cases:
+            with self.subTest(source=source):
+                self.assertEqual(parser.parse(source).optimize().write(), expected)
+
+    def test_specificity(self):
+
+        parser = Parser()
+        expression = parser.parse("get_name()=='fred' and counter>0 and (5/5.0!=0 or true)")
+        optimized = expression.optimize()
+
+        self.assertEqual(expression.specificity, 3)
+        self.assertEqual(expression.write(), "get_name() == 'fred' and counter > 0 and (5 / 5 != 0 or true)")
+        self.assertEqual(optimized.write(), "get_name() == 'fred' and counter > 0")
+
+    def test_conformance(self):
+
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+
+        for line in source.splitlines():
+            if (line.startswith("//")):
+                continue
+
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                optimized = node.optimize()
+                self.assertEqual(self._run(node, context), self._run(optimized, context))
+                self.assertEqual(self._run(node, context), self._run(parser.parse(optimized.write()), context))
+
+    def test_random(self):
+
+        rng = random.Random(7)
+        parser = Parser()
+        atoms = ["true", "false", "0", "1", "2.5", "'a'", "'1'", "x", "y", "f(x)"]
+        ops = ["and", "or", "==", "!=", ">", "<", ">=", "<=", "+", "-", "*", "/"]
+
+        def make(depth):
+            if depth == 0 or rng.random() < 0.3:
+                return rng.choice(atoms)
+            if rng.random() < 0.2:
+                return f"{rng.choice(['not ', '-'])}({make(depth - 1)})"
+            return f"({make(depth - 1)} {rng.choice(ops)} {make(depth - 1)})"
+
+        contexts = [{"x": x, "y": y, "f": lambda v: v} for x in (0, 3, "1", True) for y in (False, 2.5, "a")]
+
+        for _ in range(500):
+            node = parser.parse(make(4))
+            optimized = node.optimize()
+            rewritten = parser.parse(optimized.write())
+            # write() doesn't bracket a right operand of equal precedence (1 == (x <= 0)),
+            # so only compare the rewritten source where the original survives a round trip.
+            original = parser.parse(node.write())
+            for context in contexts:
+                with self.subTest(source=node.write(), context=context):
+                    expected = self._run(node, context)
+                    self.assertEqual(expected, self._run(optimized, context))
+                    if self._run(original, context) == expected:
+                        self.assertEqual(expected, self._run(rewritten, context))
+
+if __name__ == "__main__":
+    unittest.main()
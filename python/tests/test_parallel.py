@@ -0,0 +1,70 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import pickle
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.parallel import evaluate_many, iter_evaluate_many
+
+def spell_power(name):
+    return len(name) * 3
+
+class TestParallel(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def test_pickle(self):
+
+        parser = Parser()
+        for line in self._load_file("Parse.txt").splitlines():
+            if (line.startswith("//")):
+                continue
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                copy = pickle.loads(pickle.dumps(node))
+                self.assertEqual(copy.dump_structure(), node.dump_structure())
+                self.assertEqual(copy.specificity, node.specificity)
+
+    def test_evaluate_many(self):
+
+        expressions = ["spell_power(name)>level", "add(level, 1)", "name==\"dave\""]
+        contexts = [{"name": name, "level": level} for level in range(10) for name in ["dave", "jamie", "gordon"]]
+        functions = {"spell_power": spell_power, "add": "operator:add"}
+        expected = [[spell_power(c["name"]) > c["level"], c["level"] + 1, c["name"] == "dave"] for c in contexts]
+
+        self.assertEqual(evaluate_many(expressions, contexts, workers=1, functions=functions), expected)
+        self.assertEqual(evaluate_many(expressions, iter(contexts), workers=2, chunksize=4, functions=functions), expected)
+
+    def test_errors(self):
+
+        parser = Parser()
+        expressions = [parser.parse("10/x")]
+        contexts = [{"x": 5}, {"x": 0}]
+
+        results = evaluate_many(expressions, contexts, workers=2, return_exceptions=True)
+        self.assertEqual(results[0], [2])
+        self.assertIsInstance(results[1][0], ZeroDivisionError)
+
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_many(expressions, contexts, workers=2)
+        with self.assertRaises(ValueError):
+            list(iter_evaluate_many(expressions, contexts, chunksize=0))
+        with self.assertRaises(ValueError):
+            evaluate_many(expressions, contexts, workers=1, functions={"f": "operator"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,8 @@
 import unittest
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
@@ -45,6 +47,20 @@ class TestParser(unittest.TestCase):
         expression = parser.parse("true")
         self.assertEqual(expression.specificity, 0, "Specificity mismatch.")
 
+    def test_scan(self):
+
+        parser = Parser()
+        tokens = parser.scan(" spell_power('jamie')>=12.5 and not flag")
+
+        self.assertEqual([token.kind for token in tokens], ["identifier", "operator", "string", "operator", "operator", "number", "keyword", "keyword", "identifier"])
+        self.assertEqual([token.text for token in tokens], ["spell_power", "(", "'jamie'", ")", ">=", "12.5", "and", "not", "flag"])
+        self.assertEqual([token.pos for token in tokens], [1, 12, 13, 20, 21, 23, 28, 32, 36])
+
+        with self.assertRaisesRegex(SyntaxError, "Unexpected token 'b' at position 3"):
+            parser.parse("a  b")
+        with self.assertRaisesRegex(SyntaxError, "Unrecognized token at position 1: '.b'"):
+            parser.parse("a.b")
+
     def test_parse(self):
 
         source = self._load_file("Parse.txt")
@@ -89,5 +105,76 @@ class TestParser(unittest.TestCase):
         match = self._load_file("Parse-Output.txt")
         self.assertMultiLineEqual(match, output)
 
+    def _lines(self):
+        return [line for line in self._load_file("Parse.txt").splitlines() if not line.startswith("//")]
+
+    def _structure(self, parser, line):
+        try:
+            return parser.parse(line).dump_structure()
+        except SyntaxError as e:
+            return str(e)
+
+    def test_threads(self):
+
+        # One Parser shared by several threads at once gives the same trees and errors as
+        # parsing on one thread.
+        parser = Parser()
+        lines = self._lines()
+        expected = [self._structure(parser, line) for line in lines]
+        failures = []
+
+        def parse_all(offset):
+            for _ in range(20):
+                for index in range(len(lines)):
+                    index = (index + offset) % len(lines)
+                    if self._structure(parser, lines[index]) != expected[index]:
+                        failures.append(lines[index])
+
+        threads = [threading.Thread(target=parse_all, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+
+    def test_parse_many(self):
+
+        parser = Parser()
+        lines = self._lines() * 5
+        expected = [self._structure(parser, line) for line in lines]
+
+        with ThreadPoolExecutor(4) as executor:
+            results = parser.parse_many(lines, executor, chunksize=7, return_exceptions=True)
+        self.assertEqual([str(result) if isinstance(result, SyntaxError) else result.dump_structure() for result in results], expected)
+        self.assertEqual(parser.parse_many(iter(["a", "b>1"]))[1].write(), "b > 1")
+
+        with ThreadPoolExecutor(2) as executor:
+            with self.assertRaisesRegex(SyntaxError, "Unexpected token"):
+                parser.parse_many(["a", "a b"] * 10, executor, chunksize=3)
+
+    def test_shared_trees(self):
+
+        # Trees are evaluated from many threads at once without interfering.
+        parser = Parser()
+        expressions = parser.parse_many([f"level > {i} and f(name, {i}) == name and -level < -{i}" for i in range(50)])
+        failures = []
+
+        def evaluate_all(level):
+            context = {"level": level, "name": f"n{level}", "f": lambda name, i: name}
+            for _ in range(50):
+                try:
+                    results = [expression.evaluate(context) for expression in expressions]
+                except Exception as e:
+                    results = e
+                if results != [level > i for i in range(50)]:
+                    failures.append((level, results))
+
+        threads = [threading.Thread(target=evaluate_all, args=(level,)) for level in (0, 10, 25, 60)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
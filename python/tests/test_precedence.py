@@ -0,0 +1,81 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.precedence import PrecedenceParser
+from expression_parser.intern import Interner
+from expression_parser.vm import Program
+
+class TestPrecedenceParser(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _parse(self, parser, source):
+        try:
+            return parser.parse(source).dump_structure()
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_conformance(self):
+
+        parser = Parser()
+        precedence = PrecedenceParser()
+        for line in self._load_file("Parse.txt").splitlines():
+            if (line.startswith("//")):
+                continue
+            with self.subTest(line=line):
+                self.assertEqual(self._parse(precedence, line), self._parse(parser, line))
+
+    def test_random(self):
+
+        # Random token soup, so that most of these are syntax errors of one kind or another.
+        tokens = ["a", "f", "(", ")", ",", "not", "!", "-", "+", "*", "/", "==", "=", "!=", ">", "<=",
+                  "and", "or", "&&", "||", "1", "2.5", "'s'", "true", "False", "g("]
+        rng = random.Random(4)
+        parser = Parser()
+        precedence = PrecedenceParser()
+        for _ in range(5000):
+            source = " ".join(rng.choice(tokens) for _ in range(rng.randint(0, 10)))
+            self.assertEqual(self._parse(precedence, source), self._parse(parser, source), source)
+
+    def test_deep(self):
+
+        parser = PrecedenceParser()
+        depth = 100000
+
+        node = parser.parse("(" * depth + "x" + ")" * depth)
+        self.assertEqual(node.evaluate({"x": 3}), 3)
+
+        node = parser.parse("not " * depth + "true")
+        program = Program(node)
+        self.assertEqual(len(program), depth + 1)
+        self.assertEqual(program.run({}), True)
+
+        node = parser.parse("f(" * depth + "1" + ")" * depth)
+        self.assertEqual(Program(node).run({"f": lambda value: value + 1}), depth + 1)
+
+        with self.assertRaisesRegex(SyntaxError, r"Expected '\)' but expression ended."):
+            parser.parse("(" * depth + "x")
+
+    def test_interner(self):
+
+        interner = Interner()
+        parser = PrecedenceParser(interner=interner)
+        first = parser.parse("level>5 and x")
+        second = parser.parse("level>5 or y")
+        self.assertIs(first._left, second._left)
+
+if __name__ == "__main__":
+    unittest.main()
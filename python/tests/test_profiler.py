@@ -0,0 +1,136 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.profiler import Profiler
+
+class TestProfiler(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _run(self, func, context):
+        try:
+            result = func(context)
+            return (type(result), result)
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_conformance(self):
+
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+        profiler = Profiler()
+
+        for index, line in enumerate(source.splitlines()):
+            if (line.startswith("//")):
+                continue
+
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                expected = self._run(node.evaluate, context)
+                self.assertEqual(self._run(lambda c: profiler.evaluate(str(index), node, c), context), expected)
+
+    def test_sampling(self):
+
+        parser = Parser()
+        profiler = Profiler(sample_rate=10)
+        run = profiler.wrap("level", parser.parse("level > 5 and ready()"))
+        context = {"level": 7, "ready": lambda: True}
+
+        for _ in range(95):
+            self.assertEqual(run(context), True)
+
+        rule = profiler.rules()[0]
+        self.assertEqual(rule.calls, 95)
+        self.assertEqual(rule.sampled, 10)
+        self.assertGreater(rule.time, 0)
+        self.assertAlmostEqual(rule.estimated_time, rule.mean * 95)
+        self.assertEqual(profiler.functions()[0].calls, 10)
+
+        profiler.sample_rate = 0
+        run(context)
+        self.assertEqual(rule.calls, 96)
+        self.assertEqual(rule.sampled, 10)
+
+        profiler.reset()
+        self.assertEqual(rule.calls, 0)
+        self.assertEqual(profiler.functions(), [])
+
+    def test_short_circuits(self):
+
+        parser = Parser()
+        profiler = Profiler()
+        run = profiler.wrap("rule", parser.parse("a and b"))
+
+        for a in [True, False, False, False]:
+            run({"a": a, "b": True})
+
+        nodes = [node for node in profiler.nodes() if node.can_short_circuit]
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(nodes[0].calls, 4)
+        self.assertEqual(nodes[0].short_circuit_rate, 0.75)
+        self.assertEqual(profiler.as_dict()["short_circuits"], [
+            {"rule": "rule", "expression": "a and b", "calls": 4, "rate": 0.75}])
+
+    def test_functions(self):
+
+        parser = Parser()
+        profiler = Profiler()
+        context = {"slow": lambda: sum(range(20000)) > 0, "fast": lambda: True, "fail": lambda: 1 / 0}
+
+        profiler.evaluate("slow", parser.parse("slow() and fast()"), context)
+        profiler.evaluate("fast", parser.parse("fast()"), context)
+        with self.assertRaises(ZeroDivisionError):
+            profiler.evaluate("fail", parser.parse("fail()"), context)
+
+        functions = profiler.functions()
+        self.assertEqual(functions[0].name, "slow")
+        self.assertEqual({function.name: function.calls for function in functions}, {"slow": 1, "fast": 2, "fail": 1})
+        self.assertEqual({function.name: function.errors for function in functions}, {"slow": 0, "fast": 0, "fail": 1})
+        self.assertEqual({rule.name: rule.errors for rule in profiler.rules()}, {"slow": 0, "fast": 0, "fail": 1})
+        self.assertEqual(profiler.rules()[0].name, "slow")
+
+    def test_report(self):
+
+        parser = Parser()
+        profiler = Profiler(sample_rate=2)
+        profiler.evaluate("ready", parser.parse("ready() or x * 2"), {"ready": lambda: False, "x": 3})
+
+        report = profiler.report()
+        self.assertIn("Slowest rules (1 in 2 evaluations sampled):", report)
+        self.assertIn("Slowest functions:", report)
+        self.assertIn("ready()", report)
+        self.assertIn("ready() or x * 2", report)
+
+        # Swapping the expression for a name starts its figures again.
+        profiler.evaluate("ready", parser.parse("true"), {})
+        self.assertEqual(profiler.rules()[0].expression.write(), "true")
+        self.assertEqual(profiler.rules()[0].calls, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.ruleset import RuleSet
+
+class TestRuleSet(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleSet([
+            ("day==\"saturday\"", "saturday"),
+            ("day==\"saturday\" and character==\"dave\"", "dave"),
+            ("day==\"saturday\" and (character==\"dave\" or relationships_stats(\"orcs\")>1)", "orcs"),
+            ("day==\"sunday\" and character==\"dave\"", "sunday"),
+            ("true", "fallback"),
+        ])
+
+    def test_match(self):
+
+        context = {
+            "day": "saturday",
+            "character": "dave",
+            "relationships_stats": lambda group: 0
+        }
+
+        self.assertEqual(self.rules.match(context), ["orcs", "dave", "saturday", "fallback"])
+        context["character"] = "jim"
+        self.assertEqual(self.rules.match(context), ["saturday", "fallback"])
+
+    def test_best(self):
+
+        context = {
+            "day": "saturday",
+            "character": "jim",
+            "relationships_stats": lambda group: 2
+        }
+
+        self.assertEqual(self.rules.best(context), "orcs")
+        self.assertEqual(self.rules.stats.evaluations, 1)
+        self.assertEqual(self.rules.stats.skipped, 4)
+
+        context["day"] = "monday"
+        self.assertEqual(self.rules.best(context), "fallback")
+        self.assertEqual(RuleSet().best(context, "none"), "none")
+
+    def test_ties(self):
+
+        rules = RuleSet([("a", "first"), ("b", "second")])
+        self.assertEqual(rules.best({"a": True, "b": True}), "first")
+        self.assertEqual(rules.match({"a": True, "b": True}), ["first", "second"])
+        self.assertEqual(rules.stats.queries, 2)
+        rules.stats.reset()
+        self.assertEqual(rules.stats.queries, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.schema import BindError, Schema
+
+class TestSchema(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _result(self, run, *args):
+        try:
+            return run(*args)
+        except Exception as e:
+            return type(e), str(e)
+
+    def test_parse(self):
+
+        # Every line of Parse.txt gives the same result bound as evaluated, except that names
+        # missing from the context are found when binding.
+        context = {
+            "C": 15,
+            "D": False,
+            "get_name": lambda: "fred",
+            "end_func": lambda: True,
+            "whisky": lambda id, n: str(int(n)) + "whisky_" + id,
+        }
+        schema = Schema({"C": float, "D": bool}, {name: context[name] for name in ["get_name", "end_func", "whisky"]})
+        values = schema.values(context)
+
+        parser = Parser()
+        bound = 0
+        for line in self._load_file("Parse.txt").splitlines():
+            if line.startswith("//"):
+                continue
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                expected = self._result(node.evaluate, context)
+                try:
+                    run = node.bind(schema)
+                except BindError:
+                    self.assertEqual(expected[0], RuntimeError)
+                    self.assertTrue("not found" in expected[1] or "does not support" in expected[1])
+                    continue
+                self.assertEqual(self._result(run, values), expected)
+                self.assertEqual(self._result(run, tuple(values)), expected)
+                bound += 1
+        self.assertGreater(bound, 30)
+
+    def test_bind_errors(self):
+
+        parser = Parser()
+        schema = Schema({"level": int}, {"power": lambda name, scale=1: len(name) * scale})
+        self.assertEqual(schema.bind(parser.parse("power('dave', level) > 3"))([2]), True)
+
+        with self.assertRaises(BindError) as raised:
+            schema.bind(parser.parse("level > lvl and f(name) or power(g())"))
+        self.assertEqual(str(raised.exception), "Not in the schema: variable 'lvl', variable 'name', function 'f', function 'g'.")
+
+        with self.assertRaises(BindError) as raised:
+            schema.bind(parser.parse("power('a', 2, 3)"))
+        self.assertEqual(str(raised.exception), "Function 'power' does not take 3 arguments.")
+        with self.assertRaises(ValueError):
+            schema.bind(parser.parse("power()"))
+
+        with self.assertRaises(ValueError):
+            Schema({"level": list})
+        with self.assertRaises(ValueError):
+            Schema({"level": int}, {"level": len})
+
+    def test_values(self):
+
+        schema = Schema({"level": float, "name": str, "awake": bool}, {"upper": str.upper})
+        self.assertEqual(schema.variables, ["level", "name", "awake"])
+        self.assertEqual(schema.functions, ["upper"])
+        self.assertEqual((len(schema), "upper" in schema, "x" in schema), (3, True, False))
+        self.assertEqual(schema.slot("name"), 1)
+
+        run = Parser().parse("awake and upper(name) == 'DAVE' and level >= 2").bind(schema)
+        values = schema.values({"level": 2, "name": "dave", "awake": True, "other": [1]})
+        self.assertEqual(values, [2, "dave", True])
+        self.assertTrue(run(values))
+        values[schema.slot("level")] = 1.5
+        self.assertFalse(run(values))
+
+        with self.assertRaises(RuntimeError):
+            schema.values({"level": 2, "name": "dave"})
+        with self.assertRaises(TypeError) as raised:
+            schema.values({"level": True, "name": "dave", "awake": True})
+        self.assertEqual(str(raised.exception), "Variable 'level' must be numeric, but got 'True'.")
+        with self.assertRaises(TypeError):
+            schema.values({"level": 2, "name": "dave", "awake": 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.serialize import Bundle, dump_bundle, dumps, dumps_bundle, load_bundle, loads
+from expression_parser import serialize
+
+class TestSerialize(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _corpus(self):
+        parser = Parser()
+        nodes = []
+        for line in self._load_file("Parse.txt").splitlines():
+            if (line.startswith("//")):
+                continue
+            try:
+                nodes.append(parser.parse(line))
+            except SyntaxError:
+                continue
+        return nodes
+
+    def test_round_trip(self):
+
+        for node in self._corpus():
+            with self.subTest(line=node.write()):
+                copy = loads(dumps(node))
+                self.assertEqual(copy.write(), node.write())
+                self.assertEqual(copy.dump_structure(), node.dump_structure())
+                self.assertEqual(copy.specificity, node.specificity)
+
+    def test_shared_tables(self):
+
+        parser = Parser()
+        data = dumps_bundle([parser.parse("name==\"dave\" and level>1.5"), parser.parse("name==\"fred\" or level>1.5")])
+        bundle = Bundle(data)
+        self.assertEqual(bundle._string_count, 4)  # name, dave, level, fred
+        self.assertEqual(bundle._number_count, 1)
+        self.assertEqual([node.write() for node in bundle], ["name == 'dave' and level > 1.5", "name == 'fred' or level > 1.5"])
+
+    def test_lazy_file(self):
+
+        nodes = self._corpus()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "conditions.bin")
+            dump_bundle(nodes, path)
+
+            with load_bundle(path) as bundle:
+                self.assertEqual(len(bundle), len(nodes))
+                self.assertEqual(bundle.decoded, 0)
+                self.assertEqual(bundle[-1].write(), nodes[-1].write())
+                self.assertIs(bundle[-1], bundle[len(nodes) - 1])
+                self.assertEqual(bundle.decoded, 1)
+                with self.assertRaises(IndexError):
+                    bundle[len(nodes)]
+
+    def test_deep(self):
+
+        source = " + ".join(["x"] * 50000)
+        node = Parser().parse(source)
+        data = dumps(node)
+        self.assertEqual(dumps(loads(data)), data)
+
+    def test_invalid(self):
+
+        data = dumps(Parser().parse("a and b"))
+        with self.assertRaisesRegex(ValueError, "Not an expression bundle."):
+            loads(b"nope" + data[4:])
+        with self.assertRaisesRegex(ValueError, "Unsupported expression bundle version 99."):
+            loads(data[:4] + bytes([99, 0]) + data[6:])
+        with self.assertRaisesRegex(ValueError, "Invalid offset in expression data."):
+            loads(data[:-1])
+        with self.assertRaisesRegex(ValueError, "Invalid opcode 255 in expression data."):
+            loads(data[:-1] + bytes([255]))
+        with self.assertRaisesRegex(ValueError, "Invalid expression data."):
+            loads(data[:-1] + bytes([serialize._NOT - 1]))
+        with self.assertRaisesRegex(ValueError, "Expected one expression"):
+            loads(dumps_bundle([]))
+        self.assertEqual(serialize.VERSION, 1)
+
+if __name__ == "__main__":
+    unittest.main()
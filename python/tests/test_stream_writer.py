@@ -0,0 +1,108 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+import io
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.precedence import PrecedenceParser
+from expression_parser.stream_writer import StreamWriter, write_many
+from expression_parser.writer import Writer, STRING_FORMAT_SINGLEQUOTE, STRING_FORMAT_ESCAPED_SINGLEQUOTE, STRING_FORMAT_DOUBLEQUOTE, STRING_FORMAT_ESCAPED_DOUBLEQUOTE
+
+FORMATS = [STRING_FORMAT_SINGLEQUOTE, STRING_FORMAT_ESCAPED_SINGLEQUOTE, STRING_FORMAT_DOUBLEQUOTE, STRING_FORMAT_ESCAPED_DOUBLEQUOTE]
+
+class TestStreamWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None  # Allow full diff output for every test case
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _expressions(self):
+        parser = Parser()
+        return [parser.parse(line) for line in self._load_file("Writer.txt").splitlines() if not line.startswith("//")]
+
+    def test_writer(self):
+
+        # Writer-Output.txt again, for the lines which aren't comments.
+        expected = [line for line in self._load_file("Writer-Output.txt").splitlines()[1::3] if line]
+        stream = io.StringIO()
+        self.assertEqual(write_many(self._expressions(), stream), len(expected))
+        self.assertEqual(stream.getvalue(), "".join(line + "\n" for line in expected))
+
+    def test_formats(self):
+
+        expressions = self._expressions()
+        for string_format in FORMATS:
+            with self.subTest(string_format=string_format):
+                try:
+                    Writer.string_format = string_format
+                    expected = [expression.write() for expression in expressions]
+                finally:
+                    Writer.string_format = STRING_FORMAT_SINGLEQUOTE
+                writer = StreamWriter(string_format)
+                self.assertEqual(writer.string_format, string_format)
+                self.assertEqual([writer.write(expression) for expression in expressions], expected)
+
+    def test_threads(self):
+
+        # Each writer keeps to its own format, with the others writing at the same time.
+        expression = Parser().parse("name == 'fred' or title(name) != 'Dave'")
+        errors = []
+
+        def write(string_format):
+            writer = StreamWriter(string_format)
+            expected = writer.write(expression)
+            for _ in range(2000):
+                if writer.write(expression) != expected:
+                    errors.append(string_format)
+
+        threads = [threading.Thread(target=write, args=(string_format,)) for string_format in FORMATS]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_streams(self):
+
+        parser = Parser()
+        expressions = [parser.parse(f"a{i} > {i}") for i in range(600)]
+
+        # A list gets the bare text of each expression, from write_many() as from write().
+        buffer = ["header"]
+        self.assertEqual(StreamWriter().write_many(expressions, buffer, separator=";\n"), 600)
+        self.assertEqual(buffer[:3], ["header", "a0 > 0", "a1 > 1"])
+        StreamWriter().write(expressions[2], buffer)
+        self.assertEqual(buffer[-2:], ["a599 > 599", "a2 > 2"])
+
+        stream = io.StringIO()
+        self.assertEqual(StreamWriter(STRING_FORMAT_DOUBLEQUOTE).write_many(expressions, stream, batch_size=7), 600)
+        self.assertEqual(stream.getvalue(), "".join(text + "\n" for text in buffer[1:-1]))
+
+        self.assertIsNone(StreamWriter().write(parser.parse("x=='y'"), stream))
+        self.assertTrue(stream.getvalue().endswith("a599 > 599\nx == 'y'"))
+        self.assertEqual(write_many([], stream), 0)
+
+    def test_deep(self):
+
+        # Far too deep for write(), which recurses.
+        parser = PrecedenceParser()
+        source = " or ".join(f"f{i % 3}(a, -(b + {i}), 'c')" for i in range(20000))
+        self.assertEqual(StreamWriter().write(parser.parse(source)), source.replace("-(", "- ("))
+
+        source = "not (" * 5000 + "x" + ")" * 5000
+        self.assertEqual(StreamWriter().write(parser.parse(source)), "not " * 5000 + "x")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.trace import Trace
+from expression_parser.writer import Writer, STRING_FORMAT_DOUBLEQUOTE, STRING_FORMAT_SINGLEQUOTE
+
+class TestTrace(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def test_parse_output(self):
+
+        # The same as TestParser.test_parse, but tracing into one small Trace, rendering only
+        # each line's own evaluation.
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+        trace = Trace(64)
+
+        processed_lines = []
+        for line in source.splitlines():
+            if (line.startswith("//")):
+                processed_lines.append(line)
+                continue
+
+            processed_lines.append(f'"{line}"')
+            try:
+                node = parser.parse(line)
+                processed_lines.append(node.dump_structure())
+                trace.evaluate(node, context)
+                processed_lines.append("\n".join(trace.render(evaluations=1)))
+
+            except Exception as e:
+                processed_lines.append(str(e))
+
+            processed_lines.append("")
+
+        self.assertMultiLineEqual(self._load_file("Parse-Output.txt"), "\n".join(processed_lines))
+
+    def test_failure(self):
+
+        # The steps up to an error are kept, for looking at afterwards.
+        parser = Parser()
+        trace = Trace()
+        with self.assertRaises(RuntimeError):
+            trace.evaluate(parser.parse("a > 1 and f(a)"), {"a": 2})
+
+        dump_eval = []
+        with self.assertRaises(RuntimeError):
+            parser.parse("a > 1 and f(a)").evaluate({"a": 2}, dump_eval)
+
+        self.assertEqual(trace.render(), dump_eval)
+        self.assertEqual(trace.render(), ["Fetching variable: a -> 2", "Number: 1", "Evaluated: 2 > 1 = true"])
+
+    def test_ring(self):
+
+        parser = Parser()
+        trace = Trace(5)
+        node = parser.parse("a or b")
+        self.assertEqual(trace.capacity, 5)
+
+        trace.evaluate(node, {"a": False, "b": True})
+        trace.evaluate(node, {"a": True, "b": True})
+        self.assertEqual(len(trace), 5)
+        self.assertEqual(trace.render(), [
+            "Fetching variable: a -> false",
+            "Fetching variable: b -> true",
+            "Evaluated: false or true = true",
+            "Fetching variable: a -> true",
+            "Evaluated: true or (ignore) = true",
+        ])
+        self.assertEqual(trace.render(evaluations=1), [
+            "Fetching variable: a -> true",
+            "Evaluated: true or (ignore) = true",
+        ])
+        self.assertEqual(trace.render(evaluations=0), [])
+
+        # Without Trace.evaluate() the steps count as part of the last evaluation.
+        node.evaluate({"a": 0, "b": 0}, trace)
+        self.assertEqual(trace.render(evaluations=1), [
+            "Fetching variable: a -> true",
+            "Evaluated: true or (ignore) = true",
+            "Fetching variable: a -> 0",
+            "Fetching variable: b -> 0",
+            "Evaluated: 0 or 0 = false",
+        ])
+
+        # Once the ring is full, only whole steps are held, even of evaluations partly dropped.
+        trace.evaluate(node, {"a": False, "b": False})
+        self.assertEqual(len(trace), 5)
+        self.assertEqual(trace.render(evaluations=2), [
+            "Fetching variable: b -> 0",
+            "Evaluated: 0 or 0 = false",
+            "Fetching variable: a -> false",
+            "Fetching variable: b -> false",
+            "Evaluated: false or false = false",
+        ])
+
+        trace.clear()
+        self.assertEqual(len(trace), 0)
+
+        with self.assertRaises(ValueError):
+            Trace(0)
+
+    def test_lazy(self):
+
+        # Values are kept, so strings come out in the format set when rendering.
+        trace = Trace()
+        trace.evaluate(Parser().parse("title(name) == 'Dave'"), {"title": str.title, "name": "dave"})
+        self.assertEqual(trace.render()[-1], "Evaluated: 'Dave' == 'Dave' = true")
+        try:
+            Writer.string_format = STRING_FORMAT_DOUBLEQUOTE
+            self.assertEqual(trace.render()[-1], "Evaluated: \"Dave\" == \"Dave\" = true")
+        finally:
+            Writer.string_format = STRING_FORMAT_SINGLEQUOTE
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# This file is part of an MIT-licensed project: see LICENSE file or README.md for details.
+# Copyright (c) 2025 Ian Thomas
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from expression_parser.parser import Parser
+from expression_parser.expression import OpNot, Variable
+from expression_parser.vm import Program
+
+class TestVM(unittest.TestCase):
+
+    def _load_file(self, file_name):
+        try:
+            with open(f"../tests/{file_name}", "r", encoding="utf-8") as file:
+                return file.read()
+        except Exception as e:
+            self.fail(f"Error loading {file_name}: {e}")
+
+    def _run(self, func, context):
+        try:
+            result = func(context)
+            return (type(result), result)
+        except Exception as e:
+            return (type(e), str(e))
+
+    def test_simple(self):
+
+        parser = Parser()
+        program = Program(parser.parse("get_name()=='fred' and counter>0 and 5/5.0!=0"))
+        context = {"get_name": lambda: "fred", "counter": 1}
+
+        self.assertEqual(program.run(context), True)
+        context["counter"] = 0
+        self.assertEqual(program(context), False)
+
+    def test_short_circuit(self):
+
+        parser = Parser()
+        context = {"fail": lambda: 1/0}
+
+        self.assertEqual(Program(parser.parse("false and fail()")).run(context), False)
+        self.assertEqual(Program(parser.parse("true or fail()")).run(context), True)
+        self.assertEqual(Program(parser.parse("0 * fail()")).run(context), 0)
+        self.assertEqual(Program(parser.parse("a or b or c")).run({"a": 0, "b": "true", "c": 1}), True)
+        self.assertEqual(Program(parser.parse("(a or b) and c")).run({"a": 1, "b": 0, "c": 0}), False)
+
+    def test_disassemble(self):
+
+        # Once a is true, the jump goes straight past the outer 'or' as well.
+        program = Program(Parser().parse("a or b or f(1)"))
+        self.assertEqual(program.disassemble().splitlines(), [
+            "   0 LOAD_VAR   a",
+            "   1 OR_TEST    -> 9",
+            "   2 LOAD_VAR   b",
+            "   3 TO_BOOL",
+            "   4 OR_TEST    -> 9",
+            "   5 LOAD_FUNC  f",
+            "   6 LOAD_CONST 1",
+            "   7 CALL       f 1",
+            "   8 TO_BOOL",
+        ])
+        self.assertEqual(len(program), 9)
+
+    def test_deep(self):
+
+        parser = Parser()
+        terms = 100000
+        program = Program(parser.parse(" or ".join(f"x{i}" for i in range(terms))))
+        context = {f"x{i}": False for i in range(terms)}
+        self.assertEqual(program.run(context), False)
+        context["x99999"] = True
+        self.assertEqual(program.run(context), True)
+
+        node = Variable("x")
+        for _ in range(100000):
+            node = OpNot(node)
+        self.assertEqual(Program(node).run({"x": True}), True)
+
+        program = Program(parser.parse(" + ".join(["1"] * terms)))
+        self.assertEqual(program.run({}), terms)
+
+    def test_conformance(self):
+
+        source = self._load_file("Parse.txt")
+
+        context = {
+            "C":15,
+            "D":False,
+            "get_name":lambda: "fred",
+            "end_func":lambda: True,
+            "whisky": lambda id, n: str(int(n))+"whisky_"+id,
+            "counter":1
+        }
+
+        parser = Parser()
+
+        for line in source.splitlines():
+            if (line.startswith("//")):
+                continue
+
+            try:
+                node = parser.parse(line)
+            except SyntaxError:
+                continue
+
+            with self.subTest(line=line):
+                expected = self._run(node.evaluate, context)
+                actual = self._run(Program(node).run, context)
+                self.assertEqual(expected, actual)
+
+if __name__ == "__main__":
+    unittest.main()